@@ -1,6 +1,7 @@
 import os
 
 import typer
+from agentkit.infra.tracing import span
 from dotenv import load_dotenv
 from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
@@ -11,6 +12,7 @@ from rich.prompt import Prompt
 from foundermode.domain.schema import InvestmentMemo
 from foundermode.domain.state import GraphState
 from foundermode.graph.workflow import create_workflow
+from foundermode.memory.embeddings import warm_up_embeddings
 from foundermode.tools.reporter import render_memo
 from foundermode.utils.logging import setup_logging
 
@@ -44,6 +46,9 @@ def run_command(
         style="blue",
     )
 
+    # Load the local embedding model while the planner thinks
+    warm_up_embeddings()
+
     # 1. Initialize Graph with Checkpointer
     memory = MemorySaver()
     workflow = create_workflow(checkpointer=memory)
@@ -68,7 +73,7 @@ def run_command(
     input_to_graph: GraphState | None = initial_state
 
     while True:
-        with console.status("[bold green]Agent Thinking...") as _:
+        with console.status("[bold green]Agent Thinking...") as _, span("graph.run", query=query):
             # stream returns events, we'll log them to see progress
             for event in workflow.stream(input_to_graph, config=config, stream_mode="updates"):
                 for node_name, output in event.items():
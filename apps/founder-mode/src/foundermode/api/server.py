@@ -1,7 +1,12 @@
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
+from agentkit.infra.metrics import get_metrics
+from agentkit.infra.tracing import span
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
 from pydantic import BaseModel
@@ -9,8 +14,16 @@ from pydantic import BaseModel
 from foundermode.domain.schema import InvestmentMemo
 from foundermode.domain.state import FounderState
 from foundermode.graph.workflow import create_workflow
+from foundermode.memory.embeddings import warm_up_embeddings
 
-app = FastAPI(title="FounderMode API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    warm_up_embeddings()
+    yield
+
+
+app = FastAPI(title="FounderMode API", version="0.1.0", lifespan=lifespan)
 
 
 # For the prototype, we use an in-memory checkpointer.
@@ -44,6 +57,12 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)  # type: ignore
+async def metrics() -> str:
+    """Call counts, errors and latency histograms in the Prometheus text format."""
+    return get_metrics().to_prometheus()
+
+
 @app.post("/run", response_model=RunResponse)  # type: ignore
 async def create_run(request: RunRequest) -> RunResponse:
     run_id = str(uuid.uuid4())
@@ -65,7 +84,8 @@ async def create_run(request: RunRequest) -> RunResponse:
     }
 
     try:
-        workflow.invoke(initial_state, config=config)
+        with span("graph.run", run_id=run_id):
+            workflow.invoke(initial_state, config=config)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -93,7 +113,8 @@ async def resume_run(run_id: str) -> dict[str, str]:
 
     try:
         # Passing None to invoke resumes the graph from the last checkpoint
-        workflow.invoke(None, config=config)
+        with span("graph.run", run_id=run_id, resumed=True):
+            workflow.invoke(None, config=config)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
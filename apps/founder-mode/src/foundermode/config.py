@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,9 +25,51 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", alias="FM_LOG_LEVEL")
     """Logging level."""
 
+    log_json: bool = Field(default=False, alias="FM_LOG_JSON")
+    """Write `.out/app.log` as JSON lines."""
+
+    log_max_bytes: int = Field(default=10_000_000, alias="FM_LOG_MAX_BYTES")
+    """Size at which `.out/app.log` is rotated."""
+
+    log_backup_count: int = Field(default=5, alias="FM_LOG_BACKUP_COUNT")
+    """Number of rotated log files to keep."""
+
+    log_debug_sample_rate: float = Field(default=1.0, alias="FM_LOG_DEBUG_SAMPLE_RATE")
+    """Fraction of DEBUG records written to the log file."""
+
     chroma_db_path: str = Field(default=".chroma_db", alias="FM_CHROMA_DB_PATH")
     """Path to ChromaDB storage."""
 
+    embedding_cache_dir: str | None = Field(default=".cache/embeddings", alias="FM_EMBEDDING_CACHE_DIR")
+    """Directory of the persistent embedding cache (unset to disable)."""
+
+    embedding_batch_tokens: int = Field(default=50_000, alias="FM_EMBEDDING_BATCH_TOKENS")
+    """Approximate token budget of one OpenAI embeddings request."""
+
+    embedding_batch_size: int = Field(default=256, alias="FM_EMBEDDING_BATCH_SIZE")
+    """Maximum number of texts in one OpenAI embeddings request."""
+
+    embedding_max_concurrency: int = Field(default=4, alias="FM_EMBEDDING_MAX_CONCURRENCY")
+    """Embeddings requests sent in parallel for one batch of documents."""
+
+    onnx_threads: int | None = Field(default=None, alias="FM_ONNX_THREADS")
+    """ONNX Runtime threads for the local embedding model (default: one per core)."""
+
+    onnx_batch_size: int = Field(default=32, alias="FM_ONNX_BATCH_SIZE")
+    """Texts per inference batch of the local embedding model."""
+
+    embedding_warmup: bool = Field(default=True, alias="FM_EMBEDDING_WARMUP")
+    """Load the local embedding model in the background when the CLI or API starts."""
+
+    retrieval_mode: Literal["hybrid", "dense"] = Field(default="dense", alias="FM_RETRIEVAL_MODE")
+    """Memory retrieval: dense only, or BM25 + dense rank fusion over an in-memory BM25 copy of the collection."""
+
+    retrieval_candidates_multiplier: int = Field(default=4, alias="FM_RETRIEVAL_CANDIDATES_MULTIPLIER")
+    """Hybrid retrieval fetches this many times `k` candidates from each ranking before fusing."""
+
+    retrieval_mmr_lambda: float | None = Field(default=None, alias="FM_RETRIEVAL_MMR_LAMBDA")
+    """Diversify hybrid results with MMR at this relevance weight (0-1); unset to disable."""
+
     @property
     def is_live_mode_capable(self) -> bool:
         """Check if both required API keys are present."""
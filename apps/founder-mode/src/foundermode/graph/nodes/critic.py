@@ -1,6 +1,7 @@
 import logging
 from typing import Any
 
+from agentkit.infra.tracing import traced
 from agentkit.services.llm import create_llm
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -47,16 +48,17 @@ def get_critic_chain() -> Any:
     if not settings.openai_api_key:
         return None
 
-    llm = create_llm(model=settings.model_name)
+    llm = create_llm(model=settings.model_name, cache_namespace="critic")
     return critic_prompt | llm.with_structured_output(CriticVerdict)
 
 
+@traced("node.critic")
 def critic_node(state: FounderState) -> dict[str, Any]:
     """
     Analyzes the investment memo and provides a verdict.
     """
     logger.info("Critic Node: Starting analysis.")
-    logger.debug(f"Revision count: {state.get('revision_count', 0)}")
+    logger.debug("Revision count: %s", state.get("revision_count", 0))
 
     # 1. Attempt Live Logic
     chain = get_critic_chain()
@@ -81,7 +83,7 @@ def critic_node(state: FounderState) -> dict[str, Any]:
             verdict = chain.invoke({"research_facts": facts_str, "memo_draft": memo_str})
 
             logger.info(f"Critic Verdict: {verdict.action}")
-            logger.debug(f"Critic Feedback: {verdict.feedback}")
+            logger.debug("Critic Feedback: %s", verdict.feedback)
 
             # Update state: Append feedback to history and increment revision count
             return {
@@ -1,6 +1,7 @@
 import logging
 from typing import Any, Literal, TypedDict
 
+from agentkit.infra.tracing import traced
 from agentkit.services.llm import create_llm
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -60,7 +61,7 @@ def get_planner_chain() -> Any:
     if not settings.openai_api_key:
         return None
 
-    llm = create_llm(model=settings.model_name)
+    llm = create_llm(model=settings.model_name, cache_namespace="planner")
     return planner_prompt | llm.with_structured_output(PlannerOutput)
 
 
@@ -68,6 +69,7 @@ def get_planner_chain() -> Any:
 planner_chain = get_planner_chain()
 
 
+@traced("node.planner")
 def planner_node(state: FounderState) -> dict[str, Any]:
     """
     Decides the next step based on the current state.
@@ -75,9 +77,10 @@ def planner_node(state: FounderState) -> dict[str, Any]:
     """
     logger.info("Planner Node: Starting execution.")
     logger.debug(
-        f"Planner Input State: facts_count={len(state['research_facts'])}, "
-        f"topic={state.get('research_topic')}, "
-        f"revision={state.get('revision_count', 0)}"
+        "Planner Input State: facts_count=%d, topic=%s, revision=%s",
+        len(state["research_facts"]),
+        state.get("research_topic"),
+        state.get("revision_count", 0),
     )
 
     # 1. Attempt Live Logic
@@ -111,8 +114,9 @@ def planner_node(state: FounderState) -> dict[str, Any]:
             )
 
             logger.debug(
-                f"Invoking Planner LLM with {len(state['research_facts'])} facts "
-                f"and {len(state.get('critique_history', []))} critiques."
+                "Invoking Planner LLM with %d facts and %d critiques.",
+                len(state["research_facts"]),
+                len(state.get("critique_history", [])),
             )
             result = chain.invoke(
                 {
@@ -123,7 +127,7 @@ def planner_node(state: FounderState) -> dict[str, Any]:
                 }
             )
             logger.info(f"Planner Decision: {result['action']} (Topic: {result.get('research_topic')})")
-            logger.debug(f"Planner Reasoning: {result.get('reason')}")
+            logger.debug("Planner Reasoning: %s", result.get("reason"))
 
             updates: dict[str, Any] = {"next_step": result["action"], "research_topic": result.get("research_topic")}
             if result["action"] == "research" and result.get("research_topic"):
@@ -2,6 +2,9 @@ import asyncio
 import logging
 from typing import Any
 
+from agentkit.infra.tracing import traced
+from agentkit.services.browser import get_browser_pool
+from agentkit.services.http import get_http_pool
 from agentkit.services.llm import create_llm
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
@@ -72,17 +75,28 @@ class FactList(BaseModel):
 def get_selector_chain() -> Any:
     if not settings.openai_api_key:
         return None
-    llm = create_llm(model=settings.model_name)
+    llm = create_llm(model=settings.model_name, cache_namespace="researcher.selector")
     return selector_prompt | llm.with_structured_output(URLSelection)
 
 
 def get_extractor_chain() -> Any:
     if not settings.openai_api_key:
         return None
-    llm = create_llm(model=settings.model_name)
+    llm = create_llm(model=settings.model_name, cache_namespace="researcher.extractor")
     return extractor_prompt | llm.with_structured_output(FactList)
 
 
+async def _scrape_urls(urls: list[str]) -> list[Any]:
+    """Deep-scrapes URLs concurrently on one event loop so they share pooled connections and browsers."""
+    try:
+        # We don't use Playwright by default unless specifically needed
+        return await asyncio.gather(*(deep_scrape_url.ainvoke({"url": url}) for url in urls), return_exceptions=True)
+    finally:
+        await get_http_pool().aclose()
+        await get_browser_pool().aclose()
+
+
+@traced("node.researcher")
 def researcher_node(state: FounderState) -> dict[str, Any]:
     """
     Executes the research step with deep scraping capabilities.
@@ -132,16 +146,15 @@ def researcher_node(state: FounderState) -> dict[str, Any]:
 
     # Execute scraping
     scraped_contents = []
-    for url in scraped_urls:
-        try:
-            # We don't use Playwright by default unless specifically needed
-            content = asyncio.run(deep_scrape_url.ainvoke({"url": url}))
-            if content and "Error scraping" not in content:
-                scraped_contents.append({"url": url, "text": content})
-                # Add full text to memory with chunking
-                memory.add_scraped_text(url, content, title=f"Deep Scrape: {topic}")
-        except Exception as e:
-            logger.error(f"Scraping failed for {url}: {e}")
+    scrape_results = asyncio.run(_scrape_urls(scraped_urls)) if scraped_urls else []
+    for url, content in zip(scraped_urls, scrape_results, strict=True):
+        if isinstance(content, BaseException):
+            logger.error(f"Scraping failed for {url}: {content}")
+            continue
+        if content and "Error scraping" not in content:
+            scraped_contents.append({"url": url, "text": content})
+            # Add full text to memory with chunking
+            memory.add_scraped_text(url, content, title=f"Deep Scrape: {topic}")
 
     # 3. Extraction Stage
     extractor_chain = get_extractor_chain()
@@ -1,6 +1,7 @@
 import logging
 from typing import Any
 
+from agentkit.infra.tracing import traced
 from agentkit.services.llm import create_llm
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -43,7 +44,7 @@ def get_writer_chain() -> Any:
     if not settings.openai_api_key:
         return None
 
-    llm = create_llm(model=settings.model_name)
+    llm = create_llm(model=settings.model_name, cache_namespace="writer")
     return writer_prompt | llm.with_structured_output(InvestmentMemo)
 
 
@@ -51,13 +52,14 @@ def get_writer_chain() -> Any:
 writer_chain = get_writer_chain()
 
 
+@traced("node.writer")
 def writer_node(state: FounderState) -> dict[str, Any]:
     """
     Synthesizes the investment memo.
     Supports dynamic fallback to mock data if OpenAI key is missing.
     """
     logger.info("Writer Node: Starting memo synthesis.")
-    logger.debug(f"Writer Input: facts_count={len(state['research_facts'])}")
+    logger.debug("Writer Input: facts_count=%d", len(state["research_facts"]))
 
     # 1. Attempt Live Logic
     chain = get_writer_chain()
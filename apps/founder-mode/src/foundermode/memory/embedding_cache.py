@@ -0,0 +1,214 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+from agentkit.infra.cache import CacheStats
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: only writers within this process are serialised.
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk store of the embeddings produced by one model.
+
+    Vectors are appended as raw float32 rows to `vectors.f32` and read back through a memory map;
+    `index.tsv` maps each text's sha256 to its row. Index lines are only written after their
+    vectors, so a crash mid-write loses at most that batch. Appends hold an exclusive lock on
+    `lock` in the directory and take their row numbers from the size of `vectors.f32`, so several
+    stores (or processes) can write to the same directory. Use `get_embedding_store` to share one
+    instance per directory within a process.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self._vectors_path = self.directory / "vectors.f32"
+        self._index_path = self.directory / "index.tsv"
+        self._meta_path = self.directory / "meta.json"
+        self._lock_path = self.directory / "lock"
+        self._rows: dict[str, int] = {}
+        self._dim: int | None = None
+        self._n_rows = 0
+        self._mmap: Any = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, text_hash: object) -> bool:
+        return text_hash in self._rows
+
+    def _load(self) -> None:
+        if not self._meta_path.exists():
+            return
+        try:
+            self._dim = int(json.loads(self._meta_path.read_text())["dim"])
+            self._read_index(self._stored_rows())
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache at {self.directory}: {e}")
+            self._rows.clear()
+            self._dim = None
+            self._n_rows = 0
+
+    def _stored_rows(self) -> int:
+        """Number of complete vectors in `vectors.f32`; a partly written trailing row is not counted."""
+        if self._dim is None or not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (4 * self._dim)
+
+    def _read_index(self, n_rows: int) -> None:
+        """(Re)read the index, keeping only rows whose vectors are among the first `n_rows`."""
+        owners: dict[int, str] = {}
+        if self._index_path.exists():
+            with self._index_path.open(encoding="utf-8") as f:
+                for line in f:
+                    text_hash, _, row = line.rstrip("\n").partition("\t")
+                    if row.isdigit() and int(row) < n_rows:
+                        # A later line wins: an earlier one may be left over from a crashed write.
+                        owners[int(row)] = text_hash
+        self._rows = {text_hash: row for row, text_hash in owners.items()}
+        self._n_rows = n_rows
+        self._mmap = None
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock on the directory across processes (a no-op where fcntl is unavailable)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock_path.open("a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get_many(self, text_hashes: list[str]) -> dict[str, Any]:
+        """Cached vectors (float32 arrays) for the given hashes; missing hashes are left out."""
+        with self._lock:
+            found = [(h, self._rows[h]) for h in text_hashes if h in self._rows]
+            if not found:
+                return {}
+            if self._mmap is None:
+                shape = (self._n_rows, cast(int, self._dim))
+                self._mmap = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=shape)
+            vectors = np.asarray(self._mmap[[row for _, row in found]])
+        return {h: vectors[i] for i, (h, _) in enumerate(found)}
+
+    def put_many(self, text_hashes: list[str], vectors: Any) -> None:
+        """Append vectors for hashes that are not stored yet."""
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(text_hashes), -1)
+        with self._lock, self._file_lock():
+            if self._dim is None and self._meta_path.exists():
+                self._load()  # Another store created the cache since this one was opened.
+            if self._dim is None:
+                self._dim = matrix.shape[1]
+                self._meta_path.write_text(json.dumps({"dim": self._dim}))
+            elif matrix.shape[1] != self._dim:
+                raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match cached {self._dim}")
+
+            # Row numbers come from the file, not from this instance's count: other stores may have
+            # appended since. Their index lines are picked up so their texts are not stored twice.
+            n_rows = self._stored_rows()
+            if n_rows != self._n_rows:
+                self._read_index(n_rows)
+
+            new: dict[str, int] = {}
+            for i, text_hash in enumerate(text_hashes):
+                if text_hash not in self._rows and text_hash not in new:
+                    new[text_hash] = i
+            if not new:
+                return
+
+            with self._vectors_path.open("ab") as f:
+                # Drop a partly written row left by a crashed writer so the new rows line up.
+                f.truncate(n_rows * 4 * self._dim)
+                f.write(matrix[list(new.values())].tobytes())
+            rows = {h: n_rows + offset for offset, h in enumerate(new)}
+            with self._index_path.open("a", encoding="utf-8") as f:
+                f.writelines(f"{h}\t{row}\n" for h, row in rows.items())
+            self._rows.update(rows)
+            self._n_rows = n_rows + len(rows)
+            self._mmap = None  # Remapped on the next read to cover the new rows.
+
+
+_stores: dict[Path, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(directory: str | Path) -> EmbeddingStore:
+    """Get the process-wide EmbeddingStore for `directory`, opening it on first use."""
+    key = Path(directory).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = EmbeddingStore(key)
+        return store
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):  # type: ignore
+    """
+    Chroma embedding function that serves repeated texts from a persistent EmbeddingStore.
+
+    Entries are keyed by (model, sha256(text)): each model gets its own store under `cache_dir`.
+    Only texts missing from the store are sent to the wrapped function, in one batch.
+    """
+
+    def __init__(self, embedding_function: EmbeddingFunction[Any], model: str, cache_dir: str | Path) -> None:
+        self._embedding_function = embedding_function
+        self.model = model
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+        self.store = get_embedding_store(Path(cache_dir) / f"{slug}-{_text_hash(model)[:8]}")
+        self.stats = CacheStats()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        hashes = [_text_hash(text) for text in input]
+        vectors = self.store.get_many(hashes)
+
+        misses: dict[str, str] = {}
+        for text, text_hash in zip(input, hashes, strict=True):
+            if text_hash not in vectors:
+                misses.setdefault(text_hash, text)
+        self.stats.hits += len(hashes) - sum(1 for h in hashes if h in misses)
+        self.stats.misses += len(misses)
+
+        if misses:
+            embedded = np.asarray(self._embedding_function(list(misses.values())), dtype=np.float32)
+            try:
+                self.store.put_many(list(misses), embedded)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not write embedding cache: {e}")
+            vectors.update(zip(misses, embedded, strict=True))
+
+        return [vectors[h] for h in hashes]
+
+    # Chroma checks these against the collection's persisted configuration; the cache is
+    # transparent, so report the wrapped function's identity.
+    def name(self) -> Any:  # type: ignore[override]
+        return self._embedding_function.name()
+
+    def get_config(self) -> Any:
+        return self._embedding_function.get_config()
+
+    def default_space(self) -> Any:
+        return self._embedding_function.default_space()
+
+    def supported_spaces(self) -> Any:
+        return self._embedding_function.supported_spaces()
@@ -0,0 +1,154 @@
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from typing import Any, cast
+
+import numpy as np
+from agentkit.infra.decorators import with_rate_limit, with_retry
+from chromadb.api.types import Documents, Embeddings
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+from foundermode.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough English average; only used to size request batches, so it need not be exact.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def token_batches(texts: list[str], max_tokens: int, max_items: int) -> list[list[str]]:
+    """Split `texts`, in order, into batches of at most `max_items` texts and ~`max_tokens` tokens."""
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_items):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+@with_retry(max_attempts=3, wait_min=0.5, wait_max=8, budget="openai")
+@with_rate_limit("openai")
+def _embed_batch(langchain_embeddings: Any, texts: list[str]) -> list[list[float]]:
+    return cast(list[list[float]], langchain_embeddings.embed_documents(texts))
+
+
+def embed_in_batches(
+    langchain_embeddings: Any,
+    texts: list[str],
+    max_tokens: int,
+    max_items: int,
+    max_concurrency: int,
+) -> list[list[float]]:
+    """
+    Embed `texts` with a LangChain embeddings model, returning vectors in input order.
+
+    Batches run concurrently (up to `max_concurrency`) under the shared OpenAI rate limiter, and a
+    failed batch is retried on its own without resending the others.
+    """
+    batches = token_batches(texts, max_tokens, max_items)
+    if len(batches) <= 1:
+        return [vector for batch in batches for vector in _embed_batch(langchain_embeddings, batch)]
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, _embed_batch, langchain_embeddings, batch) for batch in batches
+        ]
+        return [vector for future in futures for vector in future.result()]
+
+
+class _TunedONNXMiniLM(ONNXMiniLM_L6_V2):  # type: ignore
+    """Chroma's MiniLM ONNX model with an explicit thread count and batch size."""
+
+    def __init__(self, threads: int | None, batch_size: int) -> None:
+        super().__init__()
+        self.threads = threads
+        self.batch_size = batch_size
+
+    @cached_property
+    def model(self) -> Any:
+        options = self.ort.SessionOptions()
+        options.log_severity_level = 3
+        options.graph_optimization_level = self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+            options.inter_op_num_threads = 1
+        # CoreML is slower than the CPU provider for this model (as in Chroma's own setup).
+        providers = [p for p in self.ort.get_available_providers() if p != "CoreMLExecutionProvider"]
+        return self.ort.InferenceSession(
+            os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, "model.onnx"),
+            providers=providers,
+            sess_options=options,
+        )
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self._download_model_if_not_exists()
+        embeddings = self._forward(list(input), batch_size=self.batch_size)
+        return [np.array(embedding, dtype=np.float32) for embedding in embeddings]
+
+
+class LocalEmbeddingFunction(DefaultEmbeddingFunction):  # type: ignore
+    """
+    Chroma's default embedding model, kept loaded between calls and tuned for throughput.
+
+    DefaultEmbeddingFunction builds a new ONNX session for every call; this one keeps a single
+    session with a configurable thread count and batch size. It presents itself as Chroma's
+    "default" function, so collections created with that function open unchanged.
+    """
+
+    def __init__(self, threads: int | None = None, batch_size: int = 32) -> None:
+        self._model = _TunedONNXMiniLM(threads, batch_size)
+        self._lock = threading.Lock()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        # The first call downloads the model and builds the session; later calls run in parallel.
+        if "model" not in self._model.__dict__:
+            with self._lock:
+                return self._model(input)  # type: ignore[no-any-return]
+        return self._model(input)  # type: ignore[no-any-return]
+
+    def warmup(self) -> None:
+        """Download the model if needed, load it and run one inference."""
+        self(["warmup"])
+
+
+@lru_cache
+def get_local_embedding_function() -> LocalEmbeddingFunction:
+    """Get the process-wide local embedding function, configured from settings."""
+    return LocalEmbeddingFunction(threads=settings.onnx_threads, batch_size=settings.onnx_batch_size)
+
+
+def warm_up_embeddings() -> threading.Thread | None:
+    """
+    Load the local embedding model in the background, if it is the one that will be used.
+
+    Returns the warmup thread, or None when warmup is disabled or OpenAI embeddings are configured.
+    """
+    api_key = settings.openai_api_key
+    if not settings.embedding_warmup or (api_key and not api_key.startswith("sk-dummy")):
+        return None
+
+    def warmup() -> None:
+        try:
+            get_local_embedding_function().warmup()
+            logger.info("Local embedding model warmed up.")
+        except Exception as e:
+            logger.warning(f"Local embedding warmup failed: {e}")
+
+    thread = threading.Thread(target=warmup, name="embedding-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,80 @@
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from agentkit.services.vector_store import InMemoryVectorStore
+
+# Rank offset of reciprocal rank fusion; 60 is the value from the original RRF paper.
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = RRF_K) -> list[str]:
+    """Merge ranked id lists: each id scores sum(1 / (k + rank)) over the lists it appears in."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda item_id: scores[item_id], reverse=True)
+
+
+def max_marginal_relevance(query_vector: Any, doc_vectors: Any, k: int, lambda_mult: float = 0.5) -> list[int]:
+    """
+    Greedily pick `k` documents that are relevant to the query but not to each other.
+
+    Each step takes the document maximising `lambda_mult * sim(query, d) - (1 - lambda_mult) *
+    max(sim(d, selected))` by cosine similarity. Returns row indices into `doc_vectors`.
+    """
+    docs = np.asarray(doc_vectors, dtype=np.float32)
+    if not len(docs) or k <= 0:
+        return []
+    docs = docs / np.maximum(np.linalg.norm(docs, axis=1, keepdims=True), 1e-12)
+    query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = docs @ query
+    redundancy = np.full(len(docs), -np.inf, dtype=np.float32)
+    selected: list[int] = []
+    for _ in range(min(k, len(docs))):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * np.where(np.isinf(redundancy), 0.0, redundancy)
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        redundancy = np.maximum(redundancy, docs @ docs[best])
+    return selected
+
+
+class LexicalIndex:
+    """
+    BM25 index mirroring one Chroma collection, for keyword matches that dense search misses.
+
+    It is filled from the collection on first query and kept up to date by the writes made
+    through ChromaManager in this process. The index is shared between threads, so `lock` guards
+    every read and write of `store`.
+    """
+
+    def __init__(self) -> None:
+        self.store = InMemoryVectorStore()
+        self.hydrated = False
+        self.lock = threading.Lock()
+
+    def add_texts(self, texts: list[str], metadatas: list[dict[str, Any]], ids: list[str]) -> None:
+        with self.lock:
+            self.store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+
+    def query(self, query: str, k: int) -> list[dict[str, Any]]:
+        with self.lock:
+            return self.store.query(query, k=k)
+
+
+_indexes: dict[tuple[str, str], LexicalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(persist_directory: str, collection_name: str) -> LexicalIndex:
+    """Get the process-wide lexical index of a Chroma collection."""
+    with _indexes_lock:
+        index = _indexes.get((persist_directory, collection_name))
+        if index is None:
+            index = _indexes[(persist_directory, collection_name)] = LexicalIndex()
+        return index
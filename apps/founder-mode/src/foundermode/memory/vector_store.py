@@ -2,24 +2,47 @@ import hashlib
 import logging
 from typing import Any, cast
 
+from agentkit.infra.decorators import singleflight
 from agentkit.services.vector_store import ChromaVectorStore
 from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
-from chromadb.utils import embedding_functions
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from foundermode.config import settings
 from foundermode.domain.schema import ResearchFact
+from foundermode.memory.embedding_cache import CachedEmbeddingFunction
+from foundermode.memory.embeddings import embed_in_batches, get_local_embedding_function
+from foundermode.memory.retrieval import LexicalIndex, get_lexical_index, max_marginal_relevance, reciprocal_rank_fusion
 
 logger = logging.getLogger(__name__)
 
 
+def _embedding_key(adapter: "ChromaLangChainAdapter", input: Documents) -> tuple[Any, ...]:
+    # Adapters are created per ChromaManager, so coalesce on the model rather than the instance.
+    return (getattr(adapter._langchain_embeddings, "model", id(adapter._langchain_embeddings)), *input)
+
+
 class ChromaLangChainAdapter(EmbeddingFunction[Documents]):  # type: ignore
-    def __init__(self, langchain_embeddings: Any) -> None:
+    """Chroma embedding function backed by a LangChain embeddings model, sent in parallel token-budgeted batches."""
+
+    def __init__(
+        self,
+        langchain_embeddings: Any,
+        max_batch_tokens: int | None = None,
+        max_batch_size: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
         self._langchain_embeddings = langchain_embeddings
+        self.max_batch_tokens = max_batch_tokens or settings.embedding_batch_tokens
+        self.max_batch_size = max_batch_size or settings.embedding_batch_size
+        self.max_concurrency = max_concurrency or settings.embedding_max_concurrency
 
+    @singleflight(key=_embedding_key)
     def __call__(self, input: Documents) -> Embeddings:
-        return cast(Embeddings, self._langchain_embeddings.embed_documents(input))
+        vectors = embed_in_batches(
+            self._langchain_embeddings, list(input), self.max_batch_tokens, self.max_batch_size, self.max_concurrency
+        )
+        return cast(Embeddings, vectors)
 
 
 class ChromaManager:
@@ -39,13 +62,37 @@ class ChromaManager:
             if api_key and not api_key.startswith("sk-dummy"):
                 langchain_emb = OpenAIEmbeddings(model="text-embedding-3-small", openai_api_key=api_key)
                 self.embedding_fn = ChromaLangChainAdapter(langchain_emb)
+                model = "openai/text-embedding-3-small"
             else:
                 # Fallback for tests if no key is present or it's a dummy key
-                self.embedding_fn = cast(EmbeddingFunction[Any], embedding_functions.DefaultEmbeddingFunction())
+                self.embedding_fn = get_local_embedding_function()
+                model = "onnx/all-MiniLM-L6-v2"
+            if settings.embedding_cache_dir:
+                self.embedding_fn = CachedEmbeddingFunction(self.embedding_fn, model, settings.embedding_cache_dir)
 
         self.store = ChromaVectorStore(
             persist_directory=path, collection_name=collection_name, embedding_function=self.embedding_fn
         )
+        self.lexical = get_lexical_index(path, collection_name)
+
+    def _lexical_store(self) -> LexicalIndex:
+        """The BM25 mirror of the collection, loaded from Chroma on first use."""
+        index = self.lexical
+        if not index.hydrated:
+            with index.lock:
+                if not index.hydrated:
+                    for page in self.store.iter_documents():
+                        index.store.add_texts(
+                            [item["content"] for item in page],
+                            metadatas=[item["metadata"] for item in page],
+                            ids=[item["id"] for item in page],
+                        )
+                    index.hydrated = True
+        return index
+
+    def _add_texts(self, texts: list[str], metadatas: list[dict[str, Any]], ids: list[str]) -> None:
+        if self.store.add_texts(texts=texts, metadatas=cast(Any, metadatas), ids=ids):
+            self.lexical.add_texts(texts=texts, metadatas=metadatas, ids=ids)
 
     def _generate_id(self, fact: ResearchFact) -> str:
         """Generate a deterministic ID for a fact to prevent duplicates."""
@@ -80,7 +127,7 @@ class ChromaManager:
 
         try:
             # Use upsert to handle existing IDs gracefully
-            self.store.add_texts(texts=documents, metadatas=cast(Any, metadatas), ids=ids)
+            self._add_texts(documents, metadatas, ids)
             return True
         except Exception as e:
             try:
@@ -110,14 +157,27 @@ class ChromaManager:
         ids = [f"{base_id}_{i}" for i in range(len(chunks))]
 
         try:
-            self.store.add_texts(texts=documents, metadatas=cast(Any, metadatas), ids=ids)
+            self._add_texts(documents, cast(list[dict[str, Any]], metadatas), ids)
             return True
         except Exception as e:
             logger.error(f"Error adding scraped text: {e}")
             return False
 
-    def query_similar(self, query: str, k: int = 3) -> list[ResearchFact]:
-        results = self.store.query(query, k=k)
+    def query_similar(self, query: str, k: int = 3, mode: str | None = None) -> list[ResearchFact]:
+        """
+        The `k` stored facts most relevant to `query`.
+
+        "dense" (the default, see FM_RETRIEVAL_MODE) uses Chroma alone. In "hybrid" mode Chroma's
+        dense ranking and a BM25 ranking, which catches exact names and numbers, are merged by
+        reciprocal rank fusion; with FM_RETRIEVAL_MMR_LAMBDA set the fused candidates are then
+        diversified with MMR. The BM25 index holds the whole collection in memory, loaded from
+        Chroma on the first hybrid query.
+        """
+        mode = mode or settings.retrieval_mode
+        if mode == "dense":
+            results = self.store.query(query, k=k)
+        else:
+            results = self._hybrid_query(query, k)
 
         facts = []
         for item in results:
@@ -135,3 +195,30 @@ class ChromaManager:
             )
 
         return facts
+
+    def _hybrid_query(self, query: str, k: int) -> list[dict[str, Any]]:
+        depth = max(k * settings.retrieval_candidates_multiplier, k)
+        dense = self.store.query(query, k=depth)
+        lexical = self._lexical_store().query(query, k=depth)
+
+        items = {_item_id(item): item for item in lexical}
+        items.update({_item_id(item): item for item in dense})
+        fused = reciprocal_rank_fusion([[_item_id(item) for item in dense], [_item_id(item) for item in lexical]])
+
+        mmr_lambda = settings.retrieval_mmr_lambda
+        if mmr_lambda is None or len(fused) <= k:
+            return [items[item_id] for item_id in fused[:k]]
+
+        # Candidates are scored with the vectors Chroma already stores; only the query is embedded.
+        candidates = [items[item_id] for item_id in fused]
+        stored = self.store.get_embeddings(fused)
+        missing = [item_id for item_id in fused if item_id not in stored]
+        embedded = self.embedding_fn([query] + [items[item_id]["content"] for item_id in missing])
+        stored.update(zip(missing, embedded[1:], strict=True))
+        doc_vectors = [stored[item_id] for item_id in fused]
+        selected = max_marginal_relevance(embedded[0], doc_vectors, k, mmr_lambda)
+        return [candidates[i] for i in selected]
+
+
+def _item_id(item: dict[str, Any]) -> str:
+    return str(item.get("id") or hashlib.md5(item["content"].encode()).hexdigest())
@@ -1,14 +1,22 @@
 import logging
 from typing import Any
 
-import httpx
-from bs4 import BeautifulSoup
+from agentkit.infra.decorators import singleflight
+from agentkit.infra.tracing import current_span, traced
+from agentkit.services.browser import get_browser_pool
+from agentkit.services.cleaning import get_cleaning_pool
+from agentkit.services.extraction import extract_text
+from agentkit.services.fetch import FetchedDocument, fetch_document
+from agentkit.services.http import get_http_pool
+from agentkit.services.page_cache import CachedPage, PageCache, canonical_url, fetch_page, get_page_cache
 from langchain_core.tools import tool
-from readability import Document
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
 
+# Identifies deep_scrape_logic's cleaned text in the shared page cache.
+_CLEANER = "foundermode.deep_scrape.lxml"
+
 
 class ScraperResult:
     """Container for scraper results."""
@@ -19,66 +27,56 @@ class ScraperResult:
         self.status = status
 
 
-async def scrape_with_readability(html: str) -> str:
-    """Extracts main content using Readability-lxml."""
-    doc = Document(html)
-    return str(doc.summary())
-
-
-async def scrape_with_bs4(html: str) -> str:
-    """Extracts text content using BeautifulSoup4 as a fallback or for metadata."""
-    soup = BeautifulSoup(html, "html.parser")
-
-    # Remove script and style tags
-    for script_or_style in soup(["script", "style"]):
-        script_or_style.decompose()
-
-    # Get text
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (line for line in lines if line)
-    return "\n".join(chunks)
+@retry(  # type: ignore
+    stop=stop_after_attempt(2),
+    wait=wait_exponential(multiplier=1, min=2, max=5),
+)
+async def fetch_html(url: str) -> FetchedDocument:
+    """
+    Streams a URL over the shared, keep-alive HTTP client pool, capped at FETCH_MAX_BYTES.
+    PDFs come back as extracted text and binary payloads are skipped after the first chunk.
+    """
+    return await fetch_document(url, get_http_pool())
 
 
 @retry(  # type: ignore
     stop=stop_after_attempt(2),
     wait=wait_exponential(multiplier=1, min=2, max=5),
 )
-async def fetch_html(url: str) -> str:
-    """Fetches raw HTML from a URL."""
-    async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-        response = await client.get(url)
-        response.raise_for_status()
-        return str(response.text)
+async def fetch_cached_page(url: str, cache: PageCache) -> CachedPage | FetchedDocument:
+    """
+    Fetches a page through the page cache, revalidating cached copies with a conditional GET.
+    Responses that are not HTML come back as the uncached FetchedDocument.
+    """
+    return await fetch_page(url, cache, get_http_pool())
 
 
 async def scrape_with_playwright(url: str) -> str:
     """
-    Scrapes a URL using Playwright for dynamic content.
+    Scrapes a URL using the shared warm Playwright browser pool for dynamic content.
     Note: Requires playwright to be installed and initialized.
     """
     try:
-        from playwright.async_api import async_playwright
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            content = await page.content()
-            await browser.close()
-            return str(content)
+        return await get_browser_pool().fetch(url)
     except Exception as e:
         logger.error(f"Playwright scraping failed for {url}: {e}")
         return ""
 
 
+@singleflight(key=lambda url, use_playwright=False: (canonical_url(url), use_playwright))
+@traced("scrape.deep")
 async def deep_scrape_logic(url: str, use_playwright: bool = False) -> str:
     """
     Core logic for deep scraping.
+    Concurrent scrapes of the same URL share a single fetch.
     """
     logger.info(f"Deep scraping URL: {url} (Playwright: {use_playwright})")
 
     html = ""
+    page_cache = get_page_cache()
+    cached_page: CachedPage | None = None
+    trace = current_span()
+    trace.set_attributes(url=url, use_playwright=use_playwright, cache_hit=False)
     try:
         if use_playwright:
             try:
@@ -87,24 +85,38 @@ async def deep_scrape_logic(url: str, use_playwright: bool = False) -> str:
                 logger.warning(f"Playwright execution failed, falling back: {e}")
                 html = ""
 
+        document: FetchedDocument | None = None
+        if not html and page_cache is not None:
+            page = await fetch_cached_page(url, page_cache)
+            if isinstance(page, FetchedDocument):
+                document = page
+            else:
+                cached_page = page
+                cached_text = page_cache.get_text(cached_page.content_hash, _CLEANER)
+                if cached_text is not None:
+                    logger.info(f"Page unchanged since last scrape, reusing cleaned text: {url}")
+                    trace.set_attribute("cache_hit", True)
+                    return cached_text
+                html = cached_page.html
+
         if not html:
-            html = await fetch_html(url)
+            if document is None:
+                document = await fetch_html(url)
+            if document.kind == "skipped":
+                return f"Skipped non-text content ({document.content_type or 'unknown type'}): {url}"
+            if document.kind != "html":
+                return document.text
+            html = document.text
 
         if not html:
             return "Failed to retrieve content."
 
-        # Stage 1: Readability
-        clean_html = await scrape_with_readability(html)
-        # Convert summary HTML to text
-        summary_soup = BeautifulSoup(clean_html, "html.parser")
-        text_content = summary_soup.get_text()
-
-        # Stage 2: Fallback to full BS4 if readability is too short
-        if len(text_content) < 500:
-            logger.info("Readability content too short, falling back to BS4.")
-            text_content = await scrape_with_bs4(html)
+        # Main content with a full-text fallback, from one lxml parse in the cleaning process pool
+        text_content = await get_cleaning_pool().run(extract_text, html)
 
-        return str(text_content)
+        if cached_page is not None and page_cache is not None:
+            page_cache.set_text(cached_page.content_hash, _CLEANER, text_content)
+        return text_content
 
     except Exception as e:
         logger.error(f"Deep scraping failed for {url}: {e}")
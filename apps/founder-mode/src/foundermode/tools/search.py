@@ -2,7 +2,7 @@ from typing import Any
 
 from agentkit.services.search import TavilySearchService
 from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from foundermode.config import settings
 from foundermode.domain.schema import ResearchFact
@@ -24,6 +24,7 @@ class TavilySearch(BaseTool):  # type: ignore
     args_schema: type[BaseModel] = TavilySearchInput
     api_key: str | None = None
     chroma: Any = Field(default_factory=ChromaManager)
+    _service: TavilySearchService | None = PrivateAttr(default=None)
 
     def __init__(self, **kwargs: Any) -> None:
         if "api_key" not in kwargs:
@@ -42,8 +43,9 @@ class TavilySearch(BaseTool):  # type: ignore
         if not self.api_key:
             raise ValueError("TAVILY_API_KEY must be set in environment or passed to the tool.")
 
-        service = TavilySearchService(api_key=self.api_key)
-        results = service.search(query=query, search_depth="advanced")
+        if self._service is None:
+            self._service = TavilySearchService(api_key=self.api_key)
+        results = self._service.search(query=query, search_depth="advanced")
 
         # 3. Automatic Upsert: Add new results to ChromaDB
         if self.chroma and results:
@@ -1,6 +1,7 @@
 from typing import Any, NamedTuple
 from unittest.mock import MagicMock, patch
 
+from agentkit.infra.metrics import get_metrics
 from fastapi.testclient import TestClient
 
 from foundermode.api.server import app
@@ -59,3 +60,14 @@ def test_resume_run(mock_workflow: MagicMock) -> None:
     data = response.json()
     assert data["status"] == "resumed"
     assert mock_workflow.invoke.called
+
+
+def test_metrics_endpoint() -> None:
+    """Test the Prometheus metrics export."""
+    get_metrics().inc("calls_total", "test_api_endpoints.fake")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'agentkit_calls_total{function="test_api_endpoints.fake"}' in response.text
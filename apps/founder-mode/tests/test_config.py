@@ -31,6 +31,7 @@ def test_settings_default_values() -> None:
         settings = Settings(_env_file=None)
         assert settings.log_level == "INFO"
         assert settings.model_name == "gpt-5.2"  # Default
+        assert settings.retrieval_mode == "dense"
 
 
 def test_settings_validation_optional_keys() -> None:
@@ -20,6 +20,10 @@ def test_e2e_graceful_fallback() -> None:
         mock_settings.tavily_api_key = None
         mock_settings.model_name = "gpt-4o"
         mock_settings.chroma_db_path = ".chroma_db_test"
+        mock_settings.embedding_cache_dir = None
+        mock_settings.retrieval_mode = "hybrid"
+        mock_settings.retrieval_candidates_multiplier = 4
+        mock_settings.retrieval_mmr_lambda = None
 
         # 2. Create the real workflow (it will use the mocked settings)
         with (
@@ -68,6 +72,10 @@ def test_e2e_live_smoke() -> None:
         mock_settings.tavily_api_key = "tvly-fake"
         mock_settings.model_name = "gpt-4o"
         mock_settings.chroma_db_path = ".chroma_db_test_live"
+        mock_settings.embedding_cache_dir = None
+        mock_settings.retrieval_mode = "hybrid"
+        mock_settings.retrieval_candidates_multiplier = 4
+        mock_settings.retrieval_mmr_lambda = None
 
         with (
             patch("foundermode.graph.nodes.planner.get_planner_chain") as mock_get_planner,
@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from foundermode.memory.embedding_cache import CachedEmbeddingFunction, EmbeddingStore, get_embedding_store
+
+
+class CountingEmbeddings(EmbeddingFunction[Documents]):  # type: ignore
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self.calls.append(list(input))
+        return [np.array([len(text), text.count("a"), 1.0], dtype=np.float32) for text in input]
+
+
+def test_only_misses_reach_the_model(tmp_path: Path) -> None:
+    model = CountingEmbeddings()
+    cached = CachedEmbeddingFunction(model, "test-model", tmp_path)
+
+    first = cached(["alpha", "beta"])
+    second = cached(["beta", "gamma", "gamma", "alpha"])
+
+    assert model.calls == [["alpha", "beta"], ["gamma"]]
+    np.testing.assert_array_equal(second[0], first[1])
+    np.testing.assert_array_equal(second[3], first[0])
+    assert cached.stats.hits == 2
+    assert cached.stats.misses == 3
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    CachedEmbeddingFunction(CountingEmbeddings(), "test-model", tmp_path)(["alpha", "beta"])
+
+    model = CountingEmbeddings()
+    reopened = CachedEmbeddingFunction(model, "test-model", tmp_path)
+    vectors = reopened(["beta", "alpha"])
+
+    assert model.calls == []
+    np.testing.assert_array_equal(vectors[0], [4, 1, 1])
+
+
+def test_models_do_not_share_entries(tmp_path: Path) -> None:
+    CachedEmbeddingFunction(CountingEmbeddings(), "model-a", tmp_path)(["alpha"])
+
+    model = CountingEmbeddings()
+    CachedEmbeddingFunction(model, "model-b", tmp_path)(["alpha"])
+
+    assert model.calls == [["alpha"]]
+
+
+def test_store_ignores_index_rows_without_vectors(tmp_path: Path) -> None:
+    store = EmbeddingStore(tmp_path)
+    store.put_many(["h1", "h2"], [[1.0, 2.0], [3.0, 4.0]])
+    # Simulate a crash that wrote an index line but not its vector.
+    with (tmp_path / "index.tsv").open("a") as f:
+        f.write("h3\t2\n")
+
+    reopened = EmbeddingStore(tmp_path)
+    assert len(reopened) == 2
+    assert set(reopened.get_many(["h1", "h3"])) == {"h1"}
+    with pytest.raises(ValueError):
+        reopened.put_many(["h4"], [[1.0, 2.0, 3.0]])
+
+
+def test_reports_the_wrapped_function_identity(tmp_path: Path) -> None:
+    class Named(CountingEmbeddings):
+        @staticmethod
+        def name() -> str:
+            return "named"
+
+        def get_config(self) -> dict[str, Any]:
+            return {"dim": 3}
+
+    cached = CachedEmbeddingFunction(Named(), "m", tmp_path)
+    assert cached.name() == "named"
+    assert cached.get_config() == {"dim": 3}
+
+
+def test_stores_on_the_same_directory_do_not_reuse_rows(tmp_path: Path) -> None:
+    first = EmbeddingStore(tmp_path)
+    second = EmbeddingStore(tmp_path)
+    first.put_many(["alpha"], [[1.0, 1.0, 1.0, 1.0]])
+    second.put_many(["beta"], [[2.0, 2.0, 2.0, 2.0]])
+    first.put_many(["gamma", "beta"], [[3.0, 3.0, 3.0, 3.0], [9.0, 9.0, 9.0, 9.0]])
+
+    for store in (first, second, EmbeddingStore(tmp_path)):
+        vectors = store.get_many(["alpha", "beta", "gamma"])
+        np.testing.assert_array_equal(vectors["alpha"], [1, 1, 1, 1])
+        np.testing.assert_array_equal(vectors["beta"], [2, 2, 2, 2])
+        if store is not second:
+            np.testing.assert_array_equal(vectors["gamma"], [3, 3, 3, 3])
+
+
+def test_embedding_functions_share_one_store_per_directory(tmp_path: Path) -> None:
+    a = CachedEmbeddingFunction(CountingEmbeddings(), "test-model", tmp_path)
+    b = CachedEmbeddingFunction(CountingEmbeddings(), "test-model", tmp_path / ".")
+
+    assert a.store is b.store
+    assert get_embedding_store(a.store.directory) is a.store
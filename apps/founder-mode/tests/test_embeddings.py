@@ -0,0 +1,125 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from agentkit.infra import rate_limit
+from agentkit.infra.rate_limit import AdaptiveRateLimiter
+
+from foundermode.memory.embeddings import (
+    LocalEmbeddingFunction,
+    _TunedONNXMiniLM,
+    embed_in_batches,
+    token_batches,
+    warm_up_embeddings,
+)
+from foundermode.memory.vector_store import ChromaLangChainAdapter
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_openai(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(rate_limit._limiters, "openai", AdaptiveRateLimiter(rate=1000, burst=100, max_concurrency=100))
+
+
+class FakeEmbeddings:
+    """Embeds each text as [len(text)]; fails the first request containing `fail_on`."""
+
+    def __init__(self, fail_on: str | None = None, delay: float = 0.0) -> None:
+        self.fail_on = fail_on
+        self.delay = delay
+        self.requests: list[list[str]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        with self._lock:
+            self.requests.append(texts)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if self.fail_on in texts:
+                self.fail_on = None
+                raise ConnectionError("transient")
+            return [[float(len(text))] for text in texts]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_token_batches_respect_both_limits_and_order() -> None:
+    texts = ["a" * 40, "b" * 40, "c" * 40, "d", "e", "f"]  # ~11 tokens each for the long ones
+
+    batches = token_batches(texts, max_tokens=25, max_items=2)
+
+    assert batches == [["a" * 40, "b" * 40], ["c" * 40, "d"], ["e", "f"]]
+    assert token_batches(["x" * 400], max_tokens=10, max_items=5) == [["x" * 400]]
+
+
+def test_batches_run_concurrently_and_keep_order() -> None:
+    model = FakeEmbeddings(delay=0.05)
+    texts = [f"text {i:02d}" + "!" * i for i in range(12)]
+
+    vectors = embed_in_batches(model, texts, max_tokens=1000, max_items=2, max_concurrency=3)
+
+    assert vectors == [[float(len(t))] for t in texts]
+    assert len(model.requests) == 6
+    assert model.peak == 3
+
+
+def test_only_the_failed_batch_is_retried() -> None:
+    model = FakeEmbeddings(fail_on="c")
+
+    vectors = embed_in_batches(model, ["a", "b", "c", "d"], max_tokens=1000, max_items=2, max_concurrency=1)
+
+    assert vectors == [[1.0]] * 4
+    assert model.requests == [["a", "b"], ["c", "d"], ["c", "d"]]
+
+
+def test_adapter_uses_the_pipeline() -> None:
+    model = FakeEmbeddings()
+    adapter = ChromaLangChainAdapter(model, max_batch_tokens=1000, max_batch_size=2, max_concurrency=2)
+
+    assert adapter(["one", "three", "fifteen"]) == [[3.0], [5.0], [7.0]]
+    assert len(model.requests) == 2
+
+
+def test_local_model_session_uses_configured_threads() -> None:
+    model = _TunedONNXMiniLM(threads=2, batch_size=8)
+    ort = MagicMock()
+    ort.get_available_providers.return_value = ["CoreMLExecutionProvider", "CPUExecutionProvider"]
+    model.__dict__["ort"] = ort
+
+    _ = model.model
+
+    options = ort.SessionOptions.return_value
+    assert options.intra_op_num_threads == 2
+    assert options.inter_op_num_threads == 1
+    assert ort.InferenceSession.call_args.kwargs["providers"] == ["CPUExecutionProvider"]
+
+
+def test_local_embedding_function_presents_as_chroma_default() -> None:
+    assert LocalEmbeddingFunction.name() == "default"
+    assert LocalEmbeddingFunction(threads=1).get_config() == {}
+
+
+def test_warmup_runs_in_the_background_only_for_local_embeddings() -> None:
+    local = MagicMock()
+    with (
+        patch("foundermode.memory.embeddings.settings") as mock_settings,
+        patch("foundermode.memory.embeddings.get_local_embedding_function", return_value=local),
+    ):
+        mock_settings.embedding_warmup = True
+        mock_settings.openai_api_key = None
+        thread = warm_up_embeddings()
+        assert thread is not None
+        thread.join(timeout=5)
+        local.warmup.assert_called_once()
+
+        mock_settings.openai_api_key = "sk-live"
+        assert warm_up_embeddings() is None
+
+        mock_settings.openai_api_key = None
+        mock_settings.embedding_warmup = False
+        assert warm_up_embeddings() is None
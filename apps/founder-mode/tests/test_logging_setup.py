@@ -0,0 +1,24 @@
+import logging
+import logging.handlers
+from pathlib import Path
+
+import pytest
+from agentkit.infra.logging import shutdown_logging
+
+from foundermode.utils.logging import setup_logging
+
+
+def test_setup_logging_does_not_duplicate_handlers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    logger = logging.getLogger("foundermode")
+    shutdown_logging("foundermode")
+    try:
+        setup_logging()
+        setup_logging()
+        assert sum(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers) == 1
+
+        logger.info("hello from the test")
+    finally:
+        shutdown_logging("foundermode")
+
+    assert "hello from the test" in (tmp_path / ".out" / "app.log").read_text()
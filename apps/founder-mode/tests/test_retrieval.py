@@ -0,0 +1,124 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from agentkit.services.semantic_cache import HashingEmbedder
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from foundermode.domain.schema import ResearchFact
+from foundermode.memory.retrieval import LexicalIndex, max_marginal_relevance, reciprocal_rank_fusion
+from foundermode.memory.vector_store import ChromaManager
+
+
+class HashingEmbeddingFunction(EmbeddingFunction[Documents]):  # type: ignore
+    def __init__(self) -> None:
+        self._embedder = HashingEmbedder(dim=256)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return list(self._embedder(list(input)))
+
+
+def test_rrf_rewards_agreement_between_rankings() -> None:
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]])
+
+    assert fused[0] == "b"  # Found by both rankings.
+    assert fused[1] == "a"
+    assert set(fused) == {"a", "b", "c", "d"}
+
+
+def test_mmr_skips_near_duplicates() -> None:
+    query = np.array([1.0, 0.0])
+    docs = np.array([[1.0, 0.05], [1.0, 0.06], [0.7, 0.7]])
+
+    assert max_marginal_relevance(query, docs, k=2, lambda_mult=1.0) == [0, 1]
+    assert max_marginal_relevance(query, docs, k=2, lambda_mult=0.3) == [0, 2]
+    assert max_marginal_relevance(query, docs[:0], k=2) == []
+
+
+@pytest.fixture
+def manager(tmp_path: Path) -> ChromaManager:
+    return ChromaManager(persist_directory=str(tmp_path / "chroma"), embedding_function=HashingEmbeddingFunction())
+
+
+def test_hybrid_query_finds_exact_terms(manager: ChromaManager) -> None:
+    manager.add_facts(
+        [
+            ResearchFact(content=f"Restaurant software vendors report steady growth in segment {i}.", source=f"s{i}")
+            for i in range(20)
+        ]
+        + [ResearchFact(content="Toast POS churn rate was 1.2% last quarter.", source="toast-10q")]
+    )
+
+    with patch("foundermode.memory.vector_store.settings.retrieval_mode", "hybrid"):
+        facts = manager.query_similar("Toast POS churn rate", k=3)
+
+    assert facts[0].source == "toast-10q"
+
+
+def test_lexical_index_is_rebuilt_from_chroma(manager: ChromaManager, tmp_path: Path) -> None:
+    manager.add_facts([ResearchFact(content="Zymurgy market is tiny.", source="zym")])
+
+    with patch("foundermode.memory.retrieval._indexes", {}):
+        fresh = ChromaManager(persist_directory=str(tmp_path / "chroma"), embedding_function=HashingEmbeddingFunction())
+        assert fresh._lexical_store().query("zymurgy", k=1)[0]["metadata"]["source"] == "zym"
+
+
+def test_hybrid_query_with_mmr(manager: ChromaManager) -> None:
+    manager.add_facts(
+        [
+            ResearchFact(content="Toast churn rate is low.", source="a"),
+            ResearchFact(content="Toast churn rate is low!", source="b"),
+            ResearchFact(content="Square churn among restaurants rose.", source="c"),
+        ]
+    )
+
+    with (
+        patch("foundermode.memory.vector_store.settings.retrieval_mode", "hybrid"),
+        patch("foundermode.memory.vector_store.settings.retrieval_mmr_lambda", 0.3),
+    ):
+        facts = manager.query_similar("Toast churn rate", k=2)
+
+    assert len(facts) == 2
+    assert {f.source for f in facts} & {"a", "b"}
+    assert "c" in {f.source for f in facts}
+
+
+def test_mmr_uses_stored_vectors_and_only_embeds_the_query(manager: ChromaManager) -> None:
+    manager.add_facts([ResearchFact(content=f"Toast churn note {i}.", source=f"s{i}") for i in range(4)])
+    embedded: list[list[str]] = []
+    embed = manager.embedding_fn
+
+    def counting_embed(input: Documents) -> Embeddings:
+        embedded.append(list(input))
+        return embed(input)
+
+    with (
+        patch("foundermode.memory.vector_store.settings.retrieval_mode", "hybrid"),
+        patch("foundermode.memory.vector_store.settings.retrieval_mmr_lambda", 0.5),
+        patch.object(manager, "embedding_fn", counting_embed),
+    ):
+        facts = manager.query_similar("Toast churn", k=2)
+
+    assert len(facts) == 2
+    assert embedded == [["Toast churn"]]
+
+
+def test_lexical_index_reads_and_writes_under_its_lock() -> None:
+    index = LexicalIndex()
+    held: list[bool] = []
+    add_texts, query = index.store.add_texts, index.store.query
+
+    def locked_add(*args: Any, **kwargs: Any) -> bool:
+        held.append(index.lock.locked())
+        return add_texts(*args, **kwargs)
+
+    def locked_query(*args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        held.append(index.lock.locked())
+        return query(*args, **kwargs)
+
+    with patch.object(index.store, "add_texts", locked_add), patch.object(index.store, "query", locked_query):
+        index.add_texts(["zymurgy is the study of fermentation"], metadatas=[{}], ids=["z"])
+        assert index.query("zymurgy", k=1)[0]["id"] == "z"
+    assert held == [True, True]
@@ -1,8 +1,10 @@
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
 import respx
+from agentkit.services.page_cache import PageCache
 
 from foundermode.tools.scrape import deep_scrape_url
 
@@ -56,7 +58,7 @@ async def test_deep_scrape_playwright() -> None:
         mock_pw.return_value = PLAYWRIGHT_HTML
 
         # We need to mock fetch_html as well if playwright fails, but here it succeeds.
-        # However, the tool calls scrape_with_readability on the result of playwright.
+        # However, the tool still cleans the playwright HTML in the cleaning pool.
 
         result = await deep_scrape_url.ainvoke({"url": url, "use_playwright": True})
 
@@ -93,3 +95,45 @@ async def test_deep_scrape_playwright_failure_fallback() -> None:
             mock_pw.assert_called_once()
             # Should have fallen back to SIMPLE_HTML content
             assert "Main content paragraph." in result
+
+
+@pytest.mark.asyncio  # type: ignore
+@respx.mock  # type: ignore
+async def test_deep_scrape_page_cache_revalidation(tmp_path: Path) -> None:
+    """Test that an unchanged page is revalidated with a 304 and its cleaned text reused."""
+    url = "https://example.com/pricing"
+    route = respx.get(url)
+    route.side_effect = [
+        httpx.Response(200, text=SIMPLE_HTML, headers={"ETag": '"abc"'}),
+        httpx.Response(304),
+    ]
+    cache = PageCache(tmp_path / "pages.sqlite")
+
+    with patch("foundermode.tools.scrape.get_page_cache", return_value=cache):
+        first = await deep_scrape_url.ainvoke({"url": url})
+        with patch("foundermode.tools.scrape.get_cleaning_pool") as mock_pool:
+            second = await deep_scrape_url.ainvoke({"url": url})
+            mock_pool.assert_not_called()
+
+    assert first == second
+    assert "Main content paragraph." in second
+    assert route.calls[1].request.headers["If-None-Match"] == '"abc"'
+
+
+@pytest.mark.asyncio  # type: ignore
+@respx.mock  # type: ignore
+async def test_deep_scrape_skips_binary_and_reads_pdfs() -> None:
+    """Test that binary downloads are skipped and PDFs bypass HTML cleaning."""
+    respx.get("https://example.com/logo.png").mock(
+        return_value=httpx.Response(200, headers={"Content-Type": "image/png"}, content=b"\x89PNG\r\n\x1a\n" * 100)
+    )
+    respx.get("https://example.com/deck.pdf").mock(
+        return_value=httpx.Response(200, headers={"Content-Type": "application/pdf"}, content=b"%PDF-1.7" * 100)
+    )
+
+    image = await deep_scrape_url.ainvoke({"url": "https://example.com/logo.png"})
+    with patch("agentkit.services.fetch.pdf_to_text", return_value="Deck text"):
+        pdf = await deep_scrape_url.ainvoke({"url": "https://example.com/deck.pdf"})
+
+    assert image == "Skipped non-text content (image/png): https://example.com/logo.png"
+    assert pdf == "Deck text"
@@ -1,9 +1,11 @@
+from pathlib import Path
 from typing import cast
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from foundermode.domain.schema import ResearchFact
+from foundermode.memory.embedding_cache import CachedEmbeddingFunction
 from foundermode.memory.vector_store import ChromaManager
 
 
@@ -92,3 +94,19 @@ def test_add_scraped_text(chroma_manager: ChromaManager) -> None:
     # Verify metadata contains source and chunk index
     assert metadatas[0]["source"] == url
     assert "chunk" in metadatas[0]
+
+
+def test_default_embeddings_go_through_the_cache(tmp_path: Path) -> None:
+    with (
+        patch("foundermode.memory.vector_store.ChromaVectorStore"),
+        patch("foundermode.memory.vector_store.settings.embedding_cache_dir", str(tmp_path)),
+    ):
+        manager = ChromaManager(persist_directory=".tmp_chroma")
+    assert isinstance(manager.embedding_fn, CachedEmbeddingFunction)
+
+    with (
+        patch("foundermode.memory.vector_store.ChromaVectorStore"),
+        patch("foundermode.memory.vector_store.settings.embedding_cache_dir", None),
+    ):
+        manager = ChromaManager(persist_directory=".tmp_chroma")
+    assert not isinstance(manager.embedding_fn, CachedEmbeddingFunction)
@@ -1,17 +1,55 @@
-from agentkit.infra.config import Settings, get_settings
-from agentkit.infra.decorators import logged, with_fallback, with_retry, with_timeout
-from agentkit.infra.logging import setup_logging
-from agentkit.services.extraction import ExtractionService
-from agentkit.services.llm import create_llm
-from agentkit.services.search import TavilySearchService
-from agentkit.services.vector_store import ChromaVectorStore, InMemoryVectorStore
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from agentkit.infra.config import Settings, get_settings
+    from agentkit.infra.decorators import (
+        logged,
+        singleflight,
+        with_circuit_breaker,
+        with_fallback,
+        with_hedging,
+        with_rate_limit,
+        with_retry,
+        with_timeout,
+    )
+    from agentkit.infra.logging import setup_logging
+    from agentkit.services.extraction import ExtractionService
+    from agentkit.services.llm import create_llm
+    from agentkit.services.search import TavilySearchService
+    from agentkit.services.vector_store import ChromaVectorStore, InMemoryVectorStore
+
+# Public name -> defining module. Resolved on first access so that importing any agentkit submodule
+# (e.g. agentkit.infra.config) doesn't pull in LangChain, Tavily or httpx.
+_LAZY_ATTRS = {
+    "get_settings": "agentkit.infra.config",
+    "Settings": "agentkit.infra.config",
+    "setup_logging": "agentkit.infra.logging",
+    "logged": "agentkit.infra.decorators",
+    "singleflight": "agentkit.infra.decorators",
+    "with_circuit_breaker": "agentkit.infra.decorators",
+    "with_fallback": "agentkit.infra.decorators",
+    "with_hedging": "agentkit.infra.decorators",
+    "with_rate_limit": "agentkit.infra.decorators",
+    "with_retry": "agentkit.infra.decorators",
+    "with_timeout": "agentkit.infra.decorators",
+    "create_llm": "agentkit.services.llm",
+    "TavilySearchService": "agentkit.services.search",
+    "ExtractionService": "agentkit.services.extraction",
+    "InMemoryVectorStore": "agentkit.services.vector_store",
+    "ChromaVectorStore": "agentkit.services.vector_store",
+}
 
 __all__ = [
     "get_settings",
     "Settings",
     "setup_logging",
     "logged",
+    "singleflight",
+    "with_circuit_breaker",
     "with_fallback",
+    "with_hedging",
+    "with_rate_limit",
     "with_retry",
     "with_timeout",
     "create_llm",
@@ -20,3 +58,16 @@ __all__ = [
     "InMemoryVectorStore",
     "ChromaVectorStore",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__.
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger("agentkit.circuit_breaker")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(f"Circuit '{name}' is open; failing fast (next probe in {retry_in:.1f}s).")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one dependency.
+
+    After `failure_threshold` consecutive failures the circuit opens and every call fails fast with
+    CircuitOpenError. Once `reset_timeout` has passed, a single probe call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless the call may go ahead (possibly as the half-open probe)."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.CLOSED:
+                return
+            # While open, wait out the reset timeout. While half-open, one probe is in flight; a probe
+            # that never reports back is replaced after another reset timeout.
+            since = self._opened_at if self.state == self.OPEN else self._probe_started
+            if now - since < self.reset_timeout:
+                raise CircuitOpenError(self.name, self.reset_timeout - (now - since))
+            if self.state == self.OPEN:
+                logger.info(f"Circuit '{self.name}' half-open; probing.")
+            self.state = self.HALF_OPEN
+            self._probe_started = now
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed.")
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened after {self._failures} consecutive failures.")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Token budget that caps retries relative to successful calls, shared by every caller.
+
+    Each retry spends one token and each success earns back `ratio` tokens (up to `max_tokens`), so
+    in steady state retries stay below `ratio` of traffic. During an outage the budget drains
+    quickly and further failures are raised at once instead of being retried.
+    """
+
+    def __init__(self, max_tokens: float = 10.0, ratio: float = 0.1) -> None:
+        self.max_tokens = max_tokens
+        self.ratio = ratio
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        """Take a token for one retry, or return False if the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_budgets: dict[str, RetryBudget] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> CircuitBreaker:
+    """Get the process-wide breaker for dependency `name`; the first caller's settings win."""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, failure_threshold, reset_timeout)
+        return breaker
+
+
+def get_retry_budget(name: str) -> RetryBudget:
+    """Get the process-wide retry budget for dependency `name`."""
+    with _registry_lock:
+        budget = _budgets.get(name)
+        if budget is None:
+            budget = _budgets[name] = RetryBudget()
+        return budget
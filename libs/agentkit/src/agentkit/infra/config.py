@@ -19,6 +19,56 @@ class Settings(BaseSettings):
     model_name: str = Field(default="gpt-4-turbo-preview", alias="MODEL_NAME")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
 
+    # Exact-match LLM response cache (disabled unless a path is set)
+    llm_cache_path: str | None = Field(default=None, alias="LLM_CACHE_PATH")
+    llm_cache_ttl: float = Field(default=7 * 86400.0, alias="LLM_CACHE_TTL")
+    llm_cache_max_bytes: int = Field(default=200_000_000, alias="LLM_CACHE_MAX_BYTES")
+
+    # Semantic (embedding-similarity) LLM cache (disabled unless a directory is set)
+    llm_semantic_cache_dir: str | None = Field(default=None, alias="LLM_SEMANTIC_CACHE_DIR")
+    llm_semantic_cache_threshold: float = Field(default=0.95, alias="LLM_SEMANTIC_CACHE_THRESHOLD")
+    llm_semantic_cache_max_entries: int = Field(default=10_000, alias="LLM_SEMANTIC_CACHE_MAX_ENTRIES")
+
+    # Provider rate limits, shared by every caller in the process
+    openai_requests_per_second: float = Field(default=5.0, alias="OPENAI_REQUESTS_PER_SECOND")
+    openai_max_concurrency: int = Field(default=8, alias="OPENAI_MAX_CONCURRENCY")
+    tavily_requests_per_second: float = Field(default=2.0, alias="TAVILY_REQUESTS_PER_SECOND")
+
+    # Tavily search and its persistent result cache (disabled unless a path is set)
+    tavily_max_concurrency: int = Field(default=5, alias="TAVILY_MAX_CONCURRENCY")
+    search_cache_path: str | None = Field(default=None, alias="SEARCH_CACHE_PATH")
+    search_cache_ttl: float = Field(default=86400.0, alias="SEARCH_CACHE_TTL")
+    search_cache_max_bytes: int = Field(default=50_000_000, alias="SEARCH_CACHE_MAX_BYTES")
+
+    # Shared HTTP client pool
+    http_timeout: float = Field(default=15.0, alias="HTTP_TIMEOUT")
+    http_connect_timeout: float = Field(default=5.0, alias="HTTP_CONNECT_TIMEOUT")
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(default=30.0, alias="HTTP_KEEPALIVE_EXPIRY")
+    http_max_connections_per_host: int = Field(default=6, alias="HTTP_MAX_CONNECTIONS_PER_HOST")
+    http2_enabled: bool = Field(default=False, alias="HTTP2_ENABLED")
+
+    # Streaming page fetch (reading stops past the byte cap)
+    fetch_max_bytes: int = Field(default=5_000_000, alias="FETCH_MAX_BYTES")
+
+    # Warm Playwright browser pool
+    browser_max_contexts: int = Field(default=4, alias="BROWSER_MAX_CONTEXTS")
+    browser_block_resources: bool = Field(default=True, alias="BROWSER_BLOCK_RESOURCES")
+    browser_wait_until: str = Field(default="domcontentloaded", alias="BROWSER_WAIT_UNTIL")
+    browser_timeout: float = Field(default=30.0, alias="BROWSER_TIMEOUT")
+
+    # Content-addressed page cache (disabled unless a path is set)
+    page_cache_path: str | None = Field(default=None, alias="PAGE_CACHE_PATH")
+    page_cache_max_bytes: int = Field(default=500_000_000, alias="PAGE_CACHE_MAX_BYTES")
+
+    # HTML cleaning process pool (0 workers cleans in a thread instead)
+    cleaning_workers: int = Field(default=2, alias="CLEANING_WORKERS")
+    cleaning_max_input_chars: int = Field(default=2_000_000, alias="CLEANING_MAX_INPUT_CHARS")
+
+    # Local span tracing (disabled unless a path is set)
+    trace_path: str | None = Field(default=None, alias="TRACE_PATH")
+
 
 @lru_cache
 def get_settings() -> Settings:
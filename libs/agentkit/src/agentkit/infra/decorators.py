@@ -1,53 +1,89 @@
 import asyncio
+import contextvars
 import functools
 import inspect
 import logging
+import queue
+import threading
 import time
-from collections.abc import Callable
+import weakref
+from collections import deque
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
 from typing import Any, TypeVar, cast
 
 from tenacity import (
     AsyncRetrying,
+    RetryCallState,
     Retrying,
     stop_after_attempt,
     wait_exponential,
 )
 
+from agentkit.infra.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker, get_retry_budget
+from agentkit.infra.metrics import get_metrics
+from agentkit.infra.rate_limit import get_rate_limiter, is_rate_limited, retry_after_seconds
+
 T = TypeVar("T", bound=Callable[..., Any])
 
 logger = logging.getLogger("agentkit.decorators")
 
+TIMEOUT_POOL_MAX_WORKERS = 32
+
 
 def logged() -> Callable[[T], T]:
-    """Decorator that logs function entry, exit, and execution time."""
+    """
+    Decorator that logs function entry, exit, and execution time.
+
+    Every call also feeds the metrics registry: `calls_total`, `errors_total` and the
+    `call_duration_seconds` latency histogram, labelled with the function's qualified name. Log
+    lines are only formatted when DEBUG is enabled.
+    """
 
     def decorator(func: T) -> T:
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        def enter() -> float:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Entering %s", func.__name__)
+            return time.perf_counter()
+
+        def record(start: float, failed: bool) -> None:
+            duration = time.perf_counter() - start
+            metrics = get_metrics()
+            metrics.inc("calls_total", name)
+            if failed:
+                metrics.inc("errors_total", name)
+            metrics.observe("call_duration_seconds", name, duration)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Exiting %s (duration: %.4fs)", func.__name__, duration)
+
         if inspect.iscoroutinefunction(func):
 
             @functools.wraps(func)
             async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-                start = time.perf_counter()
-                logger.debug(f"Entering {func.__name__}")
+                start = enter()
+                failed = True
                 try:
                     result = await func(*args, **kwargs)
+                    failed = False
                     return result
                 finally:
-                    duration = time.perf_counter() - start
-                    logger.debug(f"Exiting {func.__name__} (duration: {duration:.4f}s)")
+                    record(start, failed)
 
             return cast(T, async_wrapper)
         else:
 
             @functools.wraps(func)
             def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-                start = time.perf_counter()
-                logger.debug(f"Entering {func.__name__}")
+                start = enter()
+                failed = True
                 try:
                     result = func(*args, **kwargs)
+                    failed = False
                     return result
                 finally:
-                    duration = time.perf_counter() - start
-                    logger.debug(f"Exiting {func.__name__} (duration: {duration:.4f}s)")
+                    record(start, failed)
 
             return cast(T, sync_wrapper)
 
@@ -88,8 +124,27 @@ def with_retry(
     max_attempts: int = 3,
     wait_min: float = 1,
     wait_max: float = 10,
+    budget: str | None = None,
 ) -> Callable[[T], T]:
-    """Decorator that retries the function on failure using exponential backoff."""
+    """
+    Decorator that retries the function on failure using exponential backoff.
+
+    With `budget`, retries draw from that dependency's shared RetryBudget and stop as soon as it is
+    exhausted. An open circuit (CircuitOpenError) is never retried.
+    """
+
+    def should_retry(retry_state: RetryCallState) -> bool:
+        outcome = retry_state.outcome
+        # Check the attempt limit first so the last failure does not spend budget on a retry that never happens.
+        if outcome is None or not outcome.failed or retry_state.attempt_number >= max_attempts:
+            return False
+        if isinstance(outcome.exception(), CircuitOpenError):
+            return False
+        return budget is None or get_retry_budget(budget).try_spend()
+
+    def on_success() -> None:
+        if budget is not None:
+            get_retry_budget(budget).record_success()
 
     def decorator(func: T) -> T:
         if inspect.iscoroutinefunction(func):
@@ -99,10 +154,13 @@ def with_retry(
                 async for attempt in AsyncRetrying(
                     stop=stop_after_attempt(max_attempts),
                     wait=wait_exponential(min=wait_min, max=wait_max),
+                    retry=should_retry,
                     reraise=True,
                 ):
                     with attempt:
-                        return await func(*args, **kwargs)
+                        result = await func(*args, **kwargs)
+                        on_success()
+                        return result
 
             return cast(T, async_wrapper)
         else:
@@ -112,35 +170,386 @@ def with_retry(
                 for attempt in Retrying(
                     stop=stop_after_attempt(max_attempts),
                     wait=wait_exponential(min=wait_min, max=wait_max),
+                    retry=should_retry,
                     reraise=True,
                 ):
                     with attempt:
-                        return func(*args, **kwargs)
+                        result = func(*args, **kwargs)
+                        on_success()
+                        return result
+
+            return cast(T, sync_wrapper)
+
+    return decorator
+
+
+def with_circuit_breaker(
+    name: str,
+    failure_threshold: int = 5,
+    reset_timeout: float = 30.0,
+    ignore: tuple[type[BaseException], ...] = (),
+) -> Callable[[T], T]:
+    """
+    Decorator that guards the function with the shared CircuitBreaker for dependency `name`.
+
+    While the circuit is open calls raise CircuitOpenError immediately, which `with_retry` does not
+    retry and `with_fallback` turns into its fallback. Exceptions listed in `ignore` (caller
+    errors, not outages) do not count as failures.
+    """
+
+    def decorator(func: T) -> T:
+        def on_error(breaker: CircuitBreaker, e: Exception) -> None:
+            if isinstance(e, ignore):
+                breaker.record_success()
+            elif not isinstance(e, CircuitOpenError):
+                breaker.record_failure()
+
+        def before_call() -> CircuitBreaker:
+            breaker = get_circuit_breaker(name, failure_threshold, reset_timeout)
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                get_metrics().inc("circuit_rejected_total", name, label_name="dependency")
+                raise
+            return breaker
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                breaker = before_call()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    on_error(breaker, e)
+                    raise
+                breaker.record_success()
+                return result
+
+            return cast(T, async_wrapper)
+        else:
+
+            @functools.wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                breaker = before_call()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    on_error(breaker, e)
+                    raise
+                breaker.record_success()
+                return result
 
             return cast(T, sync_wrapper)
 
     return decorator
 
 
+def with_rate_limit(provider: str, max_retries: int = 3) -> Callable[[T], T]:
+    """
+    Decorator that runs the function under the provider's shared AdaptiveRateLimiter.
+
+    Callers queue for a token and a concurrency slot instead of failing. A rate-limited response
+    (HTTP 429) throttles the provider for every caller, honouring Retry-After, and the call is
+    queued again up to `max_retries` times before the error is raised.
+    """
+
+    def decorator(func: T) -> T:
+        def on_error(e: Exception, attempt: int) -> bool:
+            limiter = get_rate_limiter(provider)
+            if not is_rate_limited(e):
+                limiter.release(success=False)
+                return False
+            limiter.throttle(retry_after_seconds(e))
+            get_metrics().inc("rate_limited_total", provider, label_name="provider")
+            logger.warning(f"{func.__name__} was rate limited by {provider} (attempt {attempt + 1}).")
+            return attempt < max_retries
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                limiter = get_rate_limiter(provider)
+                for attempt in range(max_retries + 1):
+                    await limiter.aacquire()
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        if on_error(e, attempt):
+                            continue
+                        raise
+                    except BaseException:
+                        limiter.release(success=False)
+                        raise
+                    limiter.release()
+                    return result
+
+            return cast(T, async_wrapper)
+        else:
+
+            @functools.wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                limiter = get_rate_limiter(provider)
+                for attempt in range(max_retries + 1):
+                    limiter.acquire()
+                    try:
+                        result = func(*args, **kwargs)
+                    except Exception as e:
+                        if on_error(e, attempt):
+                            continue
+                        raise
+                    except BaseException:
+                        limiter.release(success=False)
+                        raise
+                    limiter.release()
+                    return result
+
+            return cast(T, sync_wrapper)
+
+    return decorator
+
+
+class _WorkerPool:
+    """
+    Small on-demand thread pool whose workers are daemon threads.
+
+    A call abandoned after its timeout keeps running in its worker; with
+    concurrent.futures.ThreadPoolExecutor that thread would also be joined (and hang) at interpreter
+    exit, so timed-out calls run here instead.
+    """
+
+    def __init__(self, max_workers: int, name: str) -> None:
+        self.max_workers = max_workers
+        self.name = name
+        self._queue: queue.SimpleQueue[tuple[Future[Any], Callable[[], Any]]] = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._workers = 0
+
+    def submit(self, fn: Callable[[], Any]) -> Future[Any]:
+        future: Future[Any] = Future()
+        self._queue.put((future, fn))
+        if self._idle.acquire(blocking=False):
+            return future
+        with self._lock:
+            if self._workers < self.max_workers:
+                self._workers += 1
+                threading.Thread(target=self._work, name=f"{self.name}-{self._workers}", daemon=True).start()
+        return future
+
+    def _work(self) -> None:
+        while True:
+            future, fn = self._queue.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn())
+                except BaseException as e:
+                    future.set_exception(e)
+            self._idle.release()
+
+
+@functools.lru_cache
+def _get_timeout_pool() -> _WorkerPool:
+    return _WorkerPool(TIMEOUT_POOL_MAX_WORKERS, "agentkit-timeout")
+
+
 def with_timeout(seconds: float) -> Callable[[T], T]:
-    """Decorator that raises a TimeoutError if the function takes too long."""
+    """
+    Decorator that raises a TimeoutError if the function takes too long.
+
+    Sync functions run on a shared worker pool so the caller is released at the deadline. Python
+    cannot kill a thread, so the abandoned call finishes in the background and its result is
+    discarded. Timeouts are counted in the `timeouts_total` metric.
+    """
 
     def decorator(func: T) -> T:
+        name = f"{func.__module__}.{func.__qualname__}"
+
         if inspect.iscoroutinefunction(func):
 
             @functools.wraps(func)
             async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-                return await asyncio.wait_for(func(*args, **kwargs), timeout=seconds)
+                try:
+                    return await asyncio.wait_for(func(*args, **kwargs), timeout=seconds)
+                except TimeoutError:
+                    get_metrics().inc("timeouts_total", name)
+                    raise
 
             return cast(T, async_wrapper)
         else:
-            # Sync timeout is complex to implement robustly without signals/threads.
-            # For now, we only support it for async functions or throw error if called on sync.
+
             @functools.wraps(func)
             def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-                # Basic implementation: just run it. Real sync timeout is hard.
-                # In a real library, we might use a thread with a join(timeout).
-                return func(*args, **kwargs)
+                context = contextvars.copy_context()
+                future = _get_timeout_pool().submit(functools.partial(context.run, func, *args, **kwargs))
+                try:
+                    return future.result(timeout=seconds)
+                except TimeoutError:
+                    if future.done():
+                        raise  # The function itself raised TimeoutError.
+                    # Still queued: drop it. Already running: it finishes unobserved.
+                    future.cancel()
+                    get_metrics().inc("timeouts_total", name)
+                    logger.warning(f"{func.__name__} timed out after {seconds}s")
+                    raise TimeoutError(f"{func.__name__} timed out after {seconds}s") from None
+
+            return cast(T, sync_wrapper)
+
+    return decorator
+
+
+class _LatencyWindow:
+    """Sliding window of recent call latencies for one function."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def with_hedging(percentile: float = 95, min_samples: int = 20, max_delay: float | None = None) -> Callable[[T], T]:
+    """
+    Decorator that hedges slow calls to an idempotent async function.
+
+    If the first attempt has not finished within the function's learned `percentile` latency
+    (capped at `max_delay`), one duplicate attempt is started; the first to succeed wins and the
+    other is cancelled. Until `min_samples` latencies are recorded, calls are not hedged. Hedges
+    and duplicate wins are counted in the `hedges_total` and `hedge_wins_total` metrics.
+    """
+
+    def decorator(func: T) -> T:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(f"with_hedging only supports async functions, got {func.__qualname__}.")
+
+        name = f"{func.__module__}.{func.__qualname__}"
+        window = _LatencyWindow()
+
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            result = await func(*args, **kwargs)
+            window.record(time.perf_counter() - start)
+            return result
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if len(window) < min_samples:
+                return await timed(*args, **kwargs)
+
+            delay = window.percentile(percentile)
+            if max_delay is not None:
+                delay = min(delay, max_delay)
+
+            first = asyncio.ensure_future(timed(*args, **kwargs))
+            attempts = {first}
+            try:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if done:
+                    return first.result()
+
+                get_metrics().inc("hedges_total", name)
+                attempts.add(asyncio.ensure_future(timed(*args, **kwargs)))
+                while attempts:
+                    done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                    winners = [task for task in done if task.exception() is None]
+                    if winners:
+                        if winners[0] is not first:
+                            get_metrics().inc("hedge_wins_total", name)
+                        return winners[0].result()
+                # Both attempts failed: surface the original attempt's error.
+                return first.result()
+            finally:
+                for task in attempts:
+                    task.cancel()
+
+        return cast(T, wrapper)
+
+    return decorator
+
+
+class _Flight:
+    """One in-progress synchronous call shared by every caller with the same key."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+def singleflight(key: Callable[..., Hashable] | None = None) -> Callable[[T], T]:
+    """
+    Decorator that coalesces concurrent calls with the same key into one execution.
+
+    Callers that arrive while a call with their key is in flight wait for it and share its result
+    (or exception) instead of repeating the work. `key` receives the call's arguments and defaults
+    to the (hashable) arguments themselves. Async calls are coalesced per event loop, and a waiter that is
+    cancelled does not cancel the shared call. Shared calls are counted in the
+    `singleflight_shared_total` metric.
+    """
+
+    def decorator(func: T) -> T:
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+            if key is not None:
+                return key(*args, **kwargs)
+            return (args, tuple(sorted(kwargs.items())))
+
+        if inspect.iscoroutinefunction(func):
+            tasks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Task[Any]]] = (
+                weakref.WeakKeyDictionary()
+            )
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                k = make_key(args, kwargs)
+                in_flight = tasks.setdefault(asyncio.get_running_loop(), {})
+                task = in_flight.get(k)
+                if task is None:
+                    task = in_flight[k] = asyncio.ensure_future(func(*args, **kwargs))
+                    task.add_done_callback(lambda _: in_flight.pop(k, None))
+                else:
+                    get_metrics().inc("singleflight_shared_total", name)
+                return await asyncio.shield(task)
+
+            return cast(T, async_wrapper)
+        else:
+            flights: dict[Hashable, _Flight] = {}
+            lock = threading.Lock()
+
+            @functools.wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                k = make_key(args, kwargs)
+                with lock:
+                    flight = flights.get(k)
+                    leader = flight is None
+                    if flight is None:
+                        flight = flights[k] = _Flight()
+
+                if not leader:
+                    get_metrics().inc("singleflight_shared_total", name)
+                    flight.done.wait()
+                    if flight.error is not None:
+                        raise flight.error
+                    return flight.result
+
+                try:
+                    flight.result = func(*args, **kwargs)
+                    return flight.result
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with lock:
+                        del flights[k]
+                    flight.done.set()
 
             return cast(T, sync_wrapper)
 
@@ -1,37 +1,168 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is emitted as a field.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listeners: dict[str, logging.handlers.QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+def _json_dumps() -> Callable[[dict[str, Any]], str]:
+    """Use orjson when it is installed (Lazy Import), the stdlib encoder otherwise."""
+    try:
+        import orjson
+    except ImportError:
+        return lambda payload: json.dumps(payload, default=str, ensure_ascii=False)
+    return lambda payload: orjson.dumps(payload, default=str).decode()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as a single-line JSON object, including any `extra=` fields."""
+
+    def __init__(self) -> None:
+        super().__init__(datefmt="%Y-%m-%dT%H:%M:%S")
+        self._dumps = _json_dumps()
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return self._dumps(payload)
+
+
+class DebugSampler(logging.Filter):
+    """Passes every record above DEBUG and an evenly spread `rate` fraction of DEBUG records."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        with self._lock:
+            self._credit += self.rate
+            if self._credit >= 1:
+                self._credit -= 1
+                return True
+            return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the listener thread, which does all formatting and I/O."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now (they may change after the call returns) but leave formatting to
+        # the listener; QueueHandler's default would run the whole formatter on the calling thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 def setup_logging(
     level: str = "INFO",
     name: str = "agentkit",
     json_format: bool = False,
+    log_file: str | Path | None = None,
+    max_bytes: int = 10_000_000,
+    backup_count: int = 5,
+    debug_sample_rate: float = 1.0,
+    console: bool = True,
+    propagate: bool = False,
 ) -> logging.Logger:
-    """Configures and returns a logger."""
+    """
+    Configures and returns a logger that never blocks on I/O.
+
+    Records go through a QueueHandler to a background QueueListener, which writes them to stdout
+    (`console`) and/or a size-rotated `log_file`. With `debug_sample_rate` below 1 only that
+    fraction of DEBUG records is kept. Records only also reach the root logger's handlers, which
+    run on the calling thread, with `propagate=True`. Calling it again for an already configured
+    logger is a no-op.
+    """
     logger = logging.getLogger(name)
-    logger.propagate = False
+    logger.propagate = propagate
 
     # Avoid duplicate handlers
-    if logger.handlers:
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
         return logger
 
     log_level = getattr(logging, level.upper(), logging.INFO)
     logger.setLevel(log_level)
 
-    handler = logging.StreamHandler(sys.stdout)
-
+    formatter: logging.Formatter
     if json_format:
-        # Simplified JSON-like format for now without extra deps
-        formatter = logging.Formatter(
-            '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "name": "%(name)s", "message": "%(message)s"}'
-        )
+        formatter = JsonFormatter()
     else:
         formatter = logging.Formatter(
             fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
         )
 
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    handlers: list[logging.Handler] = []
+    if console:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    if log_file is not None:
+        path = Path(log_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(
+            logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _QueueHandler(records)
+    if debug_sample_rate < 1:
+        queue_handler.addFilter(DebugSampler(debug_sample_rate))
+
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    with _listeners_lock:
+        _listeners[name] = listener
+    logger.addHandler(queue_handler)
 
     return logger
+
+
+def shutdown_logging(name: str | None = None) -> None:
+    """Flush and stop the background listener of `name` (default: all), detaching its handler."""
+    with _listeners_lock:
+        names = [name] if name is not None else list(_listeners)
+        stopped = [(n, _listeners.pop(n)) for n in names if n in _listeners]
+    for logger_name, listener in stopped:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        logger = logging.getLogger(logger_name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, _QueueHandler):
+                logger.removeHandler(handler)
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,139 @@
+import math
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are interpolated within the bucket they fall in."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate the `q` quantile (0-1) of the observed values."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= target:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                if math.isinf(upper):
+                    return lower
+                return lower + (upper - lower) * (target - cumulative) / count
+            cumulative += count
+        return self.buckets[-2]
+
+
+class MetricsRegistry:
+    """
+    Process-wide, thread-safe counters and latency histograms.
+
+    Values are addressed by a metric name plus a label value (usually the qualified name of the
+    decorated function), e.g. `registry.inc("timeouts_total", "agentkit.services.search.search")`.
+    The label's name in the Prometheus export defaults to `function`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: defaultdict[str, defaultdict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: defaultdict[str, dict[str, Histogram]] = defaultdict(dict)
+        self._label_names: dict[str, str] = {}
+
+    def inc(self, name: str, label: str, amount: float = 1.0, label_name: str = "function") -> None:
+        """Increment counter `name` for `label`."""
+        with self._lock:
+            self._counters[name][label] += amount
+            self._label_names.setdefault(name, label_name)
+
+    def observe(self, name: str, label: str, value: float, label_name: str = "function") -> None:
+        """Record `value` in histogram `name` for `label`."""
+        with self._lock:
+            histogram = self._histograms[name].get(label)
+            if histogram is None:
+                histogram = self._histograms[name][label] = Histogram()
+            histogram.observe(value)
+            self._label_names.setdefault(name, label_name)
+
+    def counter(self, name: str, label: str) -> float:
+        """Current value of counter `name` for `label`."""
+        with self._lock:
+            return self._counters[name].get(label, 0.0)
+
+    def counters(self, name: str) -> dict[str, float]:
+        """Snapshot of every label's value for counter `name`."""
+        with self._lock:
+            return dict(self._counters[name])
+
+    def percentiles(self, name: str, label: str) -> dict[str, float]:
+        """Count and estimated p50/p95/p99 of histogram `name` for `label`."""
+        with self._lock:
+            histogram = self._histograms[name].get(label)
+            if histogram is None:
+                return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+            return {
+                "count": histogram.count,
+                "p50": histogram.quantile(0.50),
+                "p95": histogram.quantile(0.95),
+                "p99": histogram.quantile(0.99),
+            }
+
+    def to_prometheus(self, prefix: str = "agentkit_") -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for name, values in sorted(self._counters.items()):
+                label_name = self._label_names.get(name, "function")
+                lines.append(f"# TYPE {prefix}{name} counter")
+                for label, value in sorted(values.items()):
+                    lines.append(f"{prefix}{name}{{{label_name}={_quote(label)}}} {_number(value)}")
+
+            for name, histograms in sorted(self._histograms.items()):
+                label_name = self._label_names.get(name, "function")
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for label, histogram in sorted(histograms.items()):
+                    labels = f"{label_name}={_quote(label)}"
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+                        cumulative += count
+                        le = "+Inf" if math.isinf(bound) else _number(bound)
+                        lines.append(f'{prefix}{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f"{prefix}{name}_sum{{{labels}}} {_number(histogram.sum)}")
+                    lines.append(f"{prefix}{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self) -> None:
+        """Drop every recorded value."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._label_names.clear()
+
+
+def _quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if value == int(value) else repr(value)
+
+
+@lru_cache
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return MetricsRegistry()
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from agentkit.infra.config import get_settings
+
+# How often a caller blocked on the concurrency limit re-checks for a free slot.
+_POLL_INTERVAL = 0.05
+# Pause applied after a 429 that carries no Retry-After header.
+_DEFAULT_BACKOFF = 1.0
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket plus an adaptive concurrency limit, shared by every caller of one provider.
+
+    Callers wait for a token (refilled at `rate` per second, up to `burst`) and a free concurrency
+    slot instead of failing. The concurrency limit follows AIMD: it grows by roughly one slot per
+    window of successful calls and halves on every rate-limited response, which also pauses the
+    whole provider for the server's Retry-After.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int | None = None,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(max_concurrency)
+        self.throttled_count = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def _try_acquire(self, slot: bool) -> float:
+        """Take a token (and a concurrency slot), or return how long to wait before trying again."""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if slot and self._in_flight >= int(self.concurrency):
+            return _POLL_INTERVAL
+
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+
+        self._tokens -= 1
+        if slot:
+            self._in_flight += 1
+        return 0.0
+
+    def acquire(self, slot: bool = True, blocking: bool = True) -> bool:
+        """
+        Wait for a token and, with `slot`, a concurrency slot that must later be released.
+
+        With `blocking=False` return immediately, reporting whether they were acquired.
+        """
+        with self._cond:
+            while (wait := self._try_acquire(slot)) > 0:
+                if not blocking:
+                    return False
+                self._cond.wait(wait)
+        return True
+
+    async def aacquire(self, slot: bool = True, blocking: bool = True) -> bool:
+        """Async version of `acquire`."""
+        while True:
+            with self._cond:
+                wait = self._try_acquire(slot)
+            if wait <= 0:
+                return True
+            if not blocking:
+                return False
+            await asyncio.sleep(wait)
+
+    def release(self, success: bool = True) -> None:
+        """Return a concurrency slot; successes let the limit creep back up."""
+        with self._cond:
+            self._in_flight -= 1
+            if success:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+            self._cond.notify_all()
+
+    def throttle(self, retry_after: float | None = None, slot: bool = True) -> None:
+        """Record a rate-limited response: halve concurrency, drain the bucket and pause."""
+        with self._cond:
+            if slot:
+                self._in_flight -= 1
+            self.throttled_count += 1
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            self._tokens = 0.0
+            pause = retry_after if retry_after is not None else _DEFAULT_BACKOFF
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._cond.notify_all()
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Whether `exc` reports an HTTP 429 / provider rate limit."""
+    response = getattr(exc, "response", None)
+    if getattr(exc, "status_code", None) == 429 or getattr(response, "status_code", None) == 429:
+        return True
+    # tavily-python raises UsageLimitExceededError for 429s and drops the response.
+    return type(exc).__name__ in {"RateLimitError", "UsageLimitExceededError"}
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Parse Retry-After (or OpenAI's retry-after-ms) from the response attached to `exc`."""
+    headers: Any = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if (value := headers.get("retry-after-ms")) is not None:
+            return float(value) / 1000
+        if (value := headers.get("retry-after")) is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, float(parsedate_to_datetime(value).timestamp()) - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_limiters: dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> AdaptiveRateLimiter:
+    """Get the process-wide limiter for `provider`, configured from settings for known providers."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            settings = get_settings()
+            if provider == "openai":
+                limiter = AdaptiveRateLimiter(
+                    settings.openai_requests_per_second, max_concurrency=settings.openai_max_concurrency
+                )
+            elif provider == "tavily":
+                limiter = AdaptiveRateLimiter(
+                    settings.tavily_requests_per_second, max_concurrency=settings.tavily_max_concurrency
+                )
+            else:
+                limiter = AdaptiveRateLimiter()
+            _limiters[provider] = limiter
+        return limiter
@@ -0,0 +1,170 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from agentkit.infra.config import get_settings
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+logger = logging.getLogger("agentkit.tracing")
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace, linked to the span that was active when it started."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start_time: float = field(default_factory=time.time)
+    end_time: float | None = None
+    duration_ms: float | None = None
+    status: str = "ok"
+    error: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self, error: BaseException | None = None) -> None:
+        """Finish the span and hand it to the exporter."""
+        self.end_time = time.time()
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+        exporter = get_span_exporter()
+        if exporter is not None:
+            exporter.export(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.pop("_start")
+        return data
+
+
+class _NoopSpan(Span):
+    """Stands in for a span when tracing is disabled, so callers never need to check."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def end(self, error: BaseException | None = None) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan(name="noop", trace_id="", span_id="")
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("agentkit_current_span", default=None)
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+@lru_cache
+def _exporter_for(path: str) -> JsonlSpanExporter:
+    return JsonlSpanExporter(path)
+
+
+def get_span_exporter() -> JsonlSpanExporter | None:
+    """The exporter configured by TRACE_PATH, or None when tracing is disabled."""
+    path = get_settings().trace_path
+    return _exporter_for(path) if path else None
+
+
+def current_span() -> Span:
+    """The active span (a no-op span outside any trace or when tracing is disabled)."""
+    return _current_span.get() or _NOOP_SPAN
+
+
+def start_span(name: str, parent: Span | None = None, **attributes: Any) -> Span:
+    """
+    Start a span without making it current; the caller must `end()` it.
+
+    It is parented to `parent`, or to the active span. Use `span()` for code blocks.
+    """
+    if get_span_exporter() is None:
+        return _NOOP_SPAN
+    parent = parent if parent is not None else _current_span.get()
+    return Span(
+        name=name,
+        trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Trace the enclosed block as a child of the active span."""
+    active = start_span(name, **attributes)
+    if active is _NOOP_SPAN:
+        yield active
+        return
+
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.end(error=e)
+        raise
+    else:
+        active.end()
+    finally:
+        _current_span.reset(token)
+
+
+def traced(name: str | None = None, **attributes: Any) -> Callable[[T], T]:
+    """Decorator that wraps every call of the function in a span (named after it by default)."""
+
+    def decorator(func: T) -> T:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+
+            return cast(T, async_wrapper)
+        else:
+
+            @functools.wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name, **attributes):
+                    return func(*args, **kwargs)
+
+            return cast(T, sync_wrapper)
+
+    return decorator
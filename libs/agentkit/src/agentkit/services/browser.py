@@ -0,0 +1,126 @@
+import asyncio
+import contextlib
+import logging
+import weakref
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from agentkit.infra.config import get_settings
+
+logger = logging.getLogger("agentkit.services.browser")
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+@dataclass
+class _BrowserState:
+    """The browser and idle contexts owned by a single event loop."""
+
+    playwright: Any
+    browser: Any
+    slots: asyncio.Semaphore
+    idle: list[tuple[Any, Any]] = field(default_factory=list)
+
+
+class BrowserPool:
+    """
+    Warm Playwright Chromium shared across page renders (Lazy Import).
+
+    The browser is launched once per event loop and kept running. Renders borrow one of at most
+    `max_contexts` browser contexts, each with a reusable page, and hand it back when done.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = 4,
+        block_resources: bool = True,
+        wait_until: str = "domcontentloaded",
+        timeout: float = 30.0,
+        headless: bool = True,
+    ) -> None:
+        self.max_contexts = max_contexts
+        self.block_resources = block_resources
+        self.wait_until = wait_until
+        self.timeout = timeout
+        self.headless = headless
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _BrowserState] = weakref.WeakKeyDictionary()
+        self._start_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def _state(self) -> _BrowserState:
+        loop = asyncio.get_running_loop()
+        lock = self._start_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            state = self._states.get(loop)
+            if state is not None and state.browser.is_connected():
+                return state
+            if state is not None:
+                # The browser went away; stop its driver process before starting a new one.
+                logger.warning("Pooled Chromium browser disconnected, relaunching.")
+                with contextlib.suppress(Exception):
+                    await state.playwright.stop()
+
+            from playwright.async_api import async_playwright
+
+            playwright = await async_playwright().start()
+            browser = await playwright.chromium.launch(headless=self.headless)
+            logger.info("Launched pooled Chromium browser.")
+            state = _BrowserState(playwright, browser, asyncio.Semaphore(self.max_contexts))
+            self._states[loop] = state
+            return state
+
+    async def _new_slot(self, browser: Any) -> tuple[Any, Any]:
+        context = await browser.new_context()
+        if self.block_resources:
+            await context.route("**/*", _block_heavy_resources)
+        page = await context.new_page()
+        return context, page
+
+    async def fetch(self, url: str) -> str:
+        """Render `url` in a pooled browser context and return the resulting HTML."""
+        state = await self._state()
+        async with state.slots:
+            context, page = state.idle.pop() if state.idle else await self._new_slot(state.browser)
+            reusable = False
+            try:
+                await page.goto(url, wait_until=self.wait_until, timeout=self.timeout * 1000)
+                content = str(await page.content())
+                reusable = True
+            finally:
+                # A failed or cancelled navigation can leave the page in a bad state; don't reuse it.
+                if reusable:
+                    state.idle.append((context, page))
+                else:
+                    await context.close()
+            return content
+
+    async def aclose(self) -> None:
+        """Close the browser bound to the running event loop, if any."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        for context, _ in state.idle:
+            await context.close()
+        await state.browser.close()
+        await state.playwright.stop()
+
+
+async def _block_heavy_resources(route: Any) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@lru_cache
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool configured from settings."""
+    settings = get_settings()
+    return BrowserPool(
+        max_contexts=settings.browser_max_contexts,
+        block_resources=settings.browser_block_resources,
+        wait_until=settings.browser_wait_until,
+        timeout=settings.browser_timeout,
+    )
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from agentkit.infra.config import get_settings
+from agentkit.infra.metrics import get_metrics
+
+logger = logging.getLogger("agentkit.services.cleaning")
+
+Cleaner = Callable[[str], str]
+
+
+def clean_html(html: str) -> str:
+    """Extract readable text with Readability, falling back to the full page via BS4 (Lazy Imports)."""
+    from bs4 import BeautifulSoup
+    from readability import Document
+
+    summary_html = Document(html).summary()
+    text = BeautifulSoup(summary_html, "html.parser").get_text()
+
+    # Fallback to full BS4 if readability result is too sparse
+    if len(text.strip()) < 500:
+        full_soup = BeautifulSoup(html, "html.parser")
+        for s in full_soup(["script", "style"]):
+            s.decompose()
+        text = full_soup.get_text()
+
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(chunk for chunk in lines if chunk)
+
+
+def _timed_clean(cleaner: Cleaner, html: str, submitted_at: float) -> tuple[str, float, float]:
+    """Runs in the worker: returns the text, the time spent queued and the time spent parsing."""
+    queue_wait = time.time() - submitted_at
+    start = time.perf_counter()
+    text = cleaner(html)
+    return text, queue_wait, time.perf_counter() - start
+
+
+class CleaningPool:
+    """
+    Runs CPU-bound HTML cleaning in worker processes so it never blocks the event loop.
+
+    `cleaner` must be a module-level function (it is pickled by reference). Input beyond
+    `max_input_chars` is cut off before it is sent across. With `max_workers=0` cleaning runs in
+    a thread instead. Queue wait and parse time are recorded per cleaner in the metrics registry
+    (`cleaning_queue_wait_seconds`, `cleaning_parse_seconds`).
+    """
+
+    def __init__(self, max_workers: int = 2, max_input_chars: int = 2_000_000) -> None:
+        self.max_workers = max_workers
+        self.max_input_chars = max_input_chars
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers start clean instead of inheriting this process's threads and locks.
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    async def run(self, cleaner: Cleaner, html: str) -> str:
+        """Clean `html` with `cleaner` in a worker and return the text."""
+        label = f"{cleaner.__module__}.{cleaner.__qualname__}"
+        metrics = get_metrics()
+        if len(html) > self.max_input_chars:
+            metrics.inc("cleaning_truncated_total", label, label_name="cleaner")
+            html = html[: self.max_input_chars]
+
+        submitted_at = time.time()
+        if self.max_workers <= 0:
+            text, queue_wait, parse_time = await asyncio.to_thread(_timed_clean, cleaner, html, submitted_at)
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                text, queue_wait, parse_time = await loop.run_in_executor(
+                    self._get_executor(), _timed_clean, cleaner, html, submitted_at
+                )
+            except BrokenProcessPool:
+                logger.warning("Cleaning worker died; restarting the pool and cleaning in a thread.")
+                self.shutdown(wait=False)
+                text, queue_wait, parse_time = await asyncio.to_thread(_timed_clean, cleaner, html, submitted_at)
+
+        metrics.observe("cleaning_queue_wait_seconds", label, max(0.0, queue_wait), label_name="cleaner")
+        metrics.observe("cleaning_parse_seconds", label, parse_time, label_name="cleaner")
+        return text
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes; the next call starts a new pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+@lru_cache
+def get_cleaning_pool() -> CleaningPool:
+    """Get the process-wide cleaning pool configured from settings."""
+    settings = get_settings()
+    return CleaningPool(max_workers=settings.cleaning_workers, max_input_chars=settings.cleaning_max_input_chars)
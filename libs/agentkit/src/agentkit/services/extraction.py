@@ -1,56 +1,260 @@
 import logging
+import re
+from dataclasses import dataclass
+from typing import Any
 
-import httpx
-
-from agentkit.infra.decorators import logged, with_fallback, with_retry
+from agentkit.infra.decorators import logged, with_fallback, with_hedging, with_retry
+from agentkit.infra.tracing import current_span, traced
+from agentkit.services.browser import BrowserPool, get_browser_pool
+from agentkit.services.cleaning import CleaningPool, get_cleaning_pool
+from agentkit.services.fetch import FetchedDocument, fetch_document
+from agentkit.services.http import HttpClientPool, get_http_pool
+from agentkit.services.page_cache import CachedPage, PageCache, fetch_page, get_page_cache
 
 logger = logging.getLogger("agentkit.services.extraction")
 
+# Identifies this service's cleaned text in the shared page cache.
+_CLEANER = "agentkit.extraction.lxml"
+
+# A summary shorter than this is treated as a failed extraction and the full page text is used.
+MIN_SUMMARY_CHARS = 500
+
+# Never text: removed before anything is rendered.
+_DROP_TAGS = ("head", "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object", "embed")
+# Page chrome: kept in the full text, excluded from the summary.
+_BOILERPLATE_TAGS = frozenset({"nav", "header", "footer", "aside", "form", "menu", "button", "select", "dialog"})
+_BLOCK_TAGS = frozenset(
+    {
+        *("address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure"),
+        *("footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre"),
+        *("section", "table", "td", "th", "tr", "ul"),
+    }
+)
+# Elements whose text counts as a paragraph when scoring content containers.
+_PARAGRAPH_TAGS = ("p", "pre", "td", "blockquote")
+# Matched against whole class/id tokens (split on whitespace, "-" and "_"), so "share" does not hit
+# "shareholder-letter", "ads" does not hit "downloads" and "nav" does not hit "navy".
+_UNLIKELY_ATTRS = re.compile(
+    r"(?<![a-z0-9])(?:ads?|advert|advertisement|banner|breadcrumbs?|comments?|cookies?|footer|header|menu|modal|"
+    r"nav|navbar|navigation|popup|promo|related|share|sharing|sidebar|social|sponsor|sponsored|subscribe|"
+    r"widgets?)(?![a-z0-9])",
+    re.IGNORECASE,
+)
+_LIKELY_ATTRS = re.compile(r"article|body|content|entry|main|page|post|story|text", re.IGNORECASE)
+_TAG_WEIGHTS = {"article": 10, "main": 10, "div": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3, "form": -3}
+
+
+@dataclass
+class ExtractedText:
+    """Text extracted from one parse of a page: the main content and the whole page as a fallback."""
+
+    title: str
+    summary: str
+    full_text: str
+
+    def text(self, min_summary_chars: int = MIN_SUMMARY_CHARS) -> str:
+        """The summary, or the full text when the summary is too short to trust."""
+        return self.summary if len(self.summary) >= min_summary_chars else self.full_text
+
+
+def extract_content(html: str) -> ExtractedText:
+    """
+    Extract the main content and the full text of a page from a single lxml parse (Lazy Import).
+
+    Scripts, styles and other non-text elements are removed, the full text is rendered, then page
+    chrome (nav, footer, sidebars, ...) is pruned and the remaining containers are scored
+    Readability-style: paragraph length and commas, weighted by tag, class/id and link density.
+    """
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    try:
+        try:
+            root = lxml_html.document_fromstring(html)
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration.
+            utf8_parser = lxml_html.HTMLParser(encoding="utf-8")
+            root = lxml_html.document_fromstring(html.encode("utf-8"), parser=utf8_parser)
+    except etree.ParserError:  # Empty document
+        return ExtractedText(title="", summary="", full_text="")
+
+    title = " ".join((root.findtext(".//title") or "").split())
+    etree.strip_elements(root, etree.Comment, etree.ProcessingInstruction, *_DROP_TAGS, with_tail=False)
+    full_text = _render(root)
+
+    for element in list(root.iter()):
+        if element.getparent() is not None and _is_boilerplate(element):
+            element.drop_tree()
+
+    nodes = _main_content(root)
+    summary = "\n".join(text for text in (_render(node) for node in nodes) if text)
+    return ExtractedText(title=title, summary=summary, full_text=full_text)
+
+
+def extract_text(html: str) -> str:
+    """Main text of a page, falling back to the full page text when too little is found."""
+    return extract_content(html).text()
+
+
+def _is_boilerplate(element: Any) -> bool:
+    if element.tag in _BOILERPLATE_TAGS:
+        return True
+    if element.tag in ("body", "article", "main"):
+        return False
+    attrs = f"{element.get('class', '')} {element.get('id', '')}"
+    return bool(_UNLIKELY_ATTRS.search(attrs)) and not _LIKELY_ATTRS.search(attrs)
+
+
+def _initial_score(element: Any) -> float:
+    score = float(_TAG_WEIGHTS.get(element.tag, 0))
+    attrs = f"{element.get('class', '')} {element.get('id', '')}"
+    if _LIKELY_ATTRS.search(attrs):
+        score += 25
+    return score
+
+
+def _link_density(element: Any, text_length: int) -> float:
+    link_length = sum(len(link.text_content()) for link in element.iter("a"))
+    return link_length / max(text_length, 1)
+
+
+def _main_content(root: Any) -> list[Any]:
+    """The best-scoring content container plus any siblings that look like part of it."""
+    scores: dict[Any, float] = {}
+    for paragraph in root.iter(*_PARAGRAPH_TAGS):
+        text = paragraph.text_content().strip()
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = paragraph.getparent()
+        for node, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+            if node is None:
+                continue
+            if node not in scores:
+                scores[node] = _initial_score(node)
+            scores[node] += score * share
+    if not scores:
+        return []
+
+    for node in scores:
+        scores[node] *= 1 - _link_density(node, len(node.text_content()))
+    best = max(scores, key=scores.__getitem__)
+    parent = best.getparent()
+    if parent is None:
+        return [best]
+
+    threshold = max(10.0, scores[best] * 0.2)
+    nodes = []
+    for sibling in parent:
+        if sibling is best or scores.get(sibling, 0.0) >= threshold:
+            nodes.append(sibling)
+        elif sibling.tag == "p":
+            text = sibling.text_content()
+            if len(text) > 80 and _link_density(sibling, len(text)) < 0.25:
+                nodes.append(sibling)
+    return nodes
+
+
+def _render(element: Any) -> str:
+    """Text of `element` with one line per block element and blank lines dropped."""
+    from lxml import etree
+
+    parts: list[str] = []
+    for event, node in etree.iterwalk(element, events=("start", "end")):
+        block = node.tag in _BLOCK_TAGS
+        if event == "start":
+            if block:
+                parts.append("\n")
+            if node.text:
+                parts.append(node.text)
+        else:
+            if block:
+                parts.append("\n")
+            if node is not element and node.tail:
+                parts.append(node.tail)
+    lines = (line.strip() for line in "".join(parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
 
 class ExtractionService:
     """Service for extracting clean text content from URLs."""
 
+    def __init__(
+        self,
+        http_pool: HttpClientPool | None = None,
+        page_cache: PageCache | None = None,
+        browser_pool: BrowserPool | None = None,
+        cleaning_pool: CleaningPool | None = None,
+    ) -> None:
+        self.http_pool = http_pool or get_http_pool()
+        self.browser_pool = browser_pool or get_browser_pool()
+        self.cleaning_pool = cleaning_pool or get_cleaning_pool()
+        self.page_cache = page_cache if page_cache is not None else get_page_cache()
+
     @logged()
     @with_fallback(fallback="Error: Could not extract content.")
+    @traced("extraction.extract")
     async def extract(self, url: str, use_playwright: bool = False) -> str:
         """
         Extract clean text from a URL using cascading logic.
         1. Playwright (optional/fallback)
-        2. HTTP (httpx)
-        3. Readability + BS4 cleaning
+        2. HTTP (httpx), streamed and size-capped; PDFs become text, binaries are skipped
+        3. Single-parse lxml extraction (main content, full-text fallback)
         """
+        current_span().set_attributes(url=url, use_playwright=use_playwright)
         html = ""
         if use_playwright:
             html = await self._scrape_with_playwright(url)
 
+        if not html and self.page_cache is not None:
+            return await self._extract_cached(url, self.page_cache)
+
         if not html:
-            html = await self._fetch_html(url)
+            document = await self._fetch_document(url)
+            if document.kind == "skipped":
+                return f"Skipped non-text content ({document.content_type or 'unknown type'})."
+            if document.kind != "html":
+                return document.text
+            html = document.text
 
         if not html:
             return "Failed to retrieve HTML."
 
         return await self._clean_html(html)
 
-    @with_retry(max_attempts=2)
-    async def _fetch_html(self, url: str) -> str:
-        """Fetch raw HTML using httpx."""
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return str(response.text)
+    async def _extract_cached(self, url: str, cache: PageCache) -> str:
+        """Fetch through the page cache, reusing cleaned text when the content is unchanged."""
+        page = await self._fetch_page(url, cache)
+        if isinstance(page, FetchedDocument):  # Not HTML, so there is nothing to clean or cache.
+            if page.kind == "skipped":
+                return f"Skipped non-text content ({page.content_type or 'unknown type'})."
+            return page.text
+        if not page.html:
+            return "Failed to retrieve HTML."
+
+        text = cache.get_text(page.content_hash, _CLEANER)
+        current_span().set_attribute("cache_hit", text is not None)
+        if text is None:
+            text = await self._clean_html(page.html)
+            if not text.startswith("Error:"):
+                cache.set_text(page.content_hash, _CLEANER, text)
+        return text
+
+    @with_retry(max_attempts=2, budget="http")
+    async def _fetch_page(self, url: str, cache: PageCache) -> CachedPage | FetchedDocument:
+        """Fetch a page with conditional revalidation against the cache."""
+        return await fetch_page(url, cache, self.http_pool)
+
+    @with_retry(max_attempts=2, budget="http")
+    @with_hedging()
+    async def _fetch_document(self, url: str) -> FetchedDocument:
+        """Stream the page through the shared HTTP client pool, size-capped and content-type checked."""
+        return await fetch_document(url, self.http_pool)
 
     async def _scrape_with_playwright(self, url: str) -> str:
-        """Scrape URL using Playwright (Lazy Import)."""
+        """Scrape URL using the warm Playwright browser pool (Lazy Import)."""
         try:
-            from playwright.async_api import async_playwright
-
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                content = await page.content()
-                await browser.close()
-                return str(content)
+            return await self.browser_pool.fetch(url)
         except ImportError:
             logger.warning("Playwright not installed, skipping.")
             return ""
@@ -59,30 +263,13 @@ class ExtractionService:
             return ""
 
     async def _clean_html(self, html: str) -> str:
-        """Clean HTML using Readability and BS4 (Lazy Imports)."""
+        """Extract the page text with a single lxml parse in the cleaning process pool."""
         try:
-            from bs4 import BeautifulSoup
-            from readability import Document
-
-            doc = Document(html)
-            summary_html = doc.summary()
-
-            soup = BeautifulSoup(summary_html, "html.parser")
-            text = soup.get_text()
-
-            # Fallback to full BS4 if readability result is too sparse
-            if len(text.strip()) < 500:
-                full_soup = BeautifulSoup(html, "html.parser")
-                for s in full_soup(["script", "style"]):
-                    s.decompose()
-                text = full_soup.get_text()
-
-            lines = (line.strip() for line in text.splitlines())
-            return "\n".join(chunk for chunk in lines if chunk)
+            return await self.cleaning_pool.run(extract_text, html)
 
         except ImportError as e:
             logger.error(f"Cleaning libraries not installed: {e}")
-            return "Error: Missing cleaning dependencies (readability-lxml, beautifulsoup4)."
+            return "Error: Missing cleaning dependency (lxml)."
         except Exception as e:
             logger.error(f"HTML cleaning failed: {e}")
             return "Error: Failed to clean HTML."
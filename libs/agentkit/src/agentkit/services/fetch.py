@@ -0,0 +1,181 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Literal
+from urllib.parse import urlsplit
+
+from agentkit.infra.config import get_settings
+from agentkit.infra.metrics import get_metrics
+from agentkit.infra.tracing import current_span, traced
+from agentkit.services.http import HttpClientPool, get_http_pool
+
+logger = logging.getLogger("agentkit.services.fetch")
+
+DocumentKind = Literal["html", "text", "pdf", "skipped"]
+
+# How much of the body is inspected to decide what a response really is.
+_SNIFF_BYTES = 512
+_HTML_TYPES = {"text/html", "application/xhtml+xml"}
+_TEXT_TYPES = {"application/json", "application/xml", "application/javascript", "application/x-ndjson"}
+_UNTYPED = {"", "application/octet-stream", "binary/octet-stream", "application/unknown"}
+_HTML_PREFIXES = (b"<!doctype html", b"<html", b"<head", b"<body", b"<!--")
+
+
+@dataclass
+class FetchedDocument:
+    """
+    A fetched response body as text, with what it turned out to be and how many bytes were read.
+
+    A 304 answer to a conditional request comes back with `status_code` 304, kind "skipped" and
+    no text. `etag` and `last_modified` are the response's validators.
+    """
+
+    url: str
+    kind: DocumentKind
+    text: str
+    content_type: str
+    bytes_read: int
+    truncated: bool = False
+    status_code: int = 200
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _looks_like_html(head: bytes) -> bool:
+    start = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    return start.startswith(_HTML_PREFIXES) or b"<html" in start
+
+
+def sniff_kind(content_type: str, head: bytes) -> DocumentKind:
+    """
+    Classify a response from its Content-Type header and the first bytes of its body.
+
+    The magic bytes win over the header for PDFs, and untyped or generic responses are only kept
+    when their first bytes look like text. Everything else (images, archives, media) is skipped.
+    """
+    mime = content_type.split(";")[0].strip().lower()
+    if head.startswith(b"%PDF-") or mime == "application/pdf":
+        return "pdf"
+    if mime in _HTML_TYPES:
+        return "html"
+    if b"\x00" in head:
+        return "skipped"
+    if mime.startswith("text/") or mime in _TEXT_TYPES or mime.endswith(("+json", "+xml")):
+        return "html" if _looks_like_html(head) else "text"
+    if mime in _UNTYPED:
+        if _looks_like_html(head):
+            return "html"
+        try:
+            # A multi-byte character may be cut off at the end of the sniffed bytes.
+            head[:-4].decode("utf-8")
+        except UnicodeDecodeError:
+            return "skipped"
+        return "text"
+    return "skipped"
+
+
+def pdf_to_text(data: bytes) -> str:
+    """Extract the text of a PDF with PyMuPDF (Lazy Import)."""
+    import pymupdf
+
+    with pymupdf.open(stream=data, filetype="pdf") as document:
+        text = "\n".join(page.get_text() for page in document)
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+@traced("http.fetch_document")
+async def fetch_document(
+    url: str,
+    http_pool: HttpClientPool | None = None,
+    max_bytes: int | None = None,
+    headers: dict[str, str] | None = None,
+) -> FetchedDocument:
+    """
+    Stream `url` and return its body as text without ever buffering more than `max_bytes`.
+
+    The response is classified from its headers and first chunk: HTML and text are decoded (cut
+    off at the cap), PDFs are read in full and converted to text off the event loop, and anything
+    else is abandoned after the first chunk. Bytes read are counted per host in the metrics
+    registry (`fetch_bytes_total`); the per-URL size is on the document and the span.
+    """
+    pool = http_pool or get_http_pool()
+    cap = max_bytes if max_bytes is not None else get_settings().fetch_max_bytes
+
+    chunks: list[bytes] = []
+    size = 0
+    kind: DocumentKind | None = None
+    truncated = False
+    async with pool.stream("GET", url, headers=headers) as response:
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if response.status_code == 304:
+            current_span().set_attributes(url=url, status_code=304)
+            return FetchedDocument(
+                url=url,
+                kind="skipped",
+                text="",
+                content_type="",
+                bytes_read=0,
+                status_code=304,
+                etag=etag,
+                last_modified=last_modified,
+            )
+        response.raise_for_status()
+        status_code = response.status_code
+        content_type = response.headers.get("Content-Type", "")
+        encoding = response.charset_encoding or "utf-8"
+        declared_size = response.headers.get("Content-Length", "")
+        if declared_size.isdigit() and int(declared_size) > cap and sniff_kind(content_type, b"") == "pdf":
+            # A PDF cut off at the cap cannot be parsed, so don't download any of it.
+            kind, truncated = "pdf", True
+        else:
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if kind is None and size >= _SNIFF_BYTES:
+                    kind = sniff_kind(content_type, b"".join(chunks)[:_SNIFF_BYTES])
+                    if kind == "skipped":
+                        break
+                if size > cap:
+                    truncated = True
+                    break
+
+    data = b"".join(chunks)[:cap]
+    if kind is None:
+        kind = sniff_kind(content_type, data[:_SNIFF_BYTES])
+
+    text = ""
+    if kind == "pdf" and truncated:
+        kind = "skipped"
+    elif kind == "pdf":
+        try:
+            text = await asyncio.to_thread(pdf_to_text, data)
+        except ImportError:
+            logger.warning("PyMuPDF not installed, skipping PDF.")
+            kind = "skipped"
+        except Exception as e:
+            logger.warning(f"PDF text extraction failed for {url}: {e}")
+            kind = "skipped"
+    elif kind != "skipped":
+        try:
+            text = data.decode(encoding, errors="replace")
+        except LookupError:
+            text = data.decode("utf-8", errors="replace")
+
+    metrics = get_metrics()
+    metrics.inc("fetch_bytes_total", urlsplit(url).hostname or "", size, label_name="host")
+    metrics.inc("fetch_documents_total", kind, label_name="kind")
+    current_span().set_attributes(url=url, kind=kind, content_type=content_type, bytes_read=size, truncated=truncated)
+    if kind == "skipped":
+        logger.info(f"Skipped non-text content ({content_type or 'unknown type'}): {url}")
+    return FetchedDocument(
+        url=url,
+        kind=kind,
+        text=text,
+        content_type=content_type,
+        bytes_read=size,
+        truncated=truncated,
+        status_code=status_code,
+        etag=etag,
+        last_modified=last_modified,
+    )
@@ -0,0 +1,132 @@
+import asyncio
+import importlib.util
+import logging
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from agentkit.infra.config import get_settings
+
+logger = logging.getLogger("agentkit.services.http")
+
+
+@dataclass
+class _LoopState:
+    """The client and per-host limits owned by a single event loop."""
+
+    client: httpx.AsyncClient
+    host_limits: dict[str, asyncio.Semaphore] = field(default_factory=dict)
+
+
+class HttpClientPool:
+    """
+    Process-wide pool of keep-alive httpx clients.
+
+    httpx clients are tied to the event loop they first run on, so the pool keeps one client
+    per running loop. Every request made on that loop reuses its connections, and
+    `max_connections_per_host` caps how many requests hit a single host at once.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 15.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_connections_per_host: int = 6,
+        http2: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2
+        self.headers = headers or {}
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1.")
+            http2 = False
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            http2=http2,
+            follow_redirects=True,
+            headers=self.headers,
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None or state.client.is_closed:
+            state = _LoopState(client=self._build_client())
+            self._states[loop] = state
+        return state
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client for the running event loop."""
+        return self._state().client
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        state = self._state()
+        host = urlsplit(url).netloc.lower()
+        limit = state.host_limits.get(host)
+        if limit is None:
+            limit = state.host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+        async with limit:
+            yield state.client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the shared client, respecting the per-host limit."""
+        async with self._host_slot(url) as client:
+            return await client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request through the shared client."""
+        return await self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """Stream a response through the shared client, holding the per-host slot until it is closed."""
+        async with self._host_slot(url) as client, client.stream(method, url, **kwargs) as response:
+            yield response
+
+    async def aclose(self) -> None:
+        """Close the client bound to the running event loop, if any."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.aclose()
+
+
+@lru_cache
+def get_http_pool() -> HttpClientPool:
+    """Get the process-wide HTTP client pool configured from settings."""
+    settings = get_settings()
+    return HttpClientPool(
+        timeout=settings.http_timeout,
+        connect_timeout=settings.http_connect_timeout,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        max_connections_per_host=settings.http_max_connections_per_host,
+        http2=settings.http2_enabled,
+    )
@@ -1,26 +1,138 @@
 from typing import Any
+from uuid import UUID
 
+import openai
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatResult, LLMResult
 from langchain_openai import ChatOpenAI
 
 from agentkit.infra.config import get_settings
+from agentkit.infra.decorators import with_circuit_breaker, with_rate_limit
+from agentkit.infra.tracing import Span, start_span
+from agentkit.services.llm_cache import get_llm_cache, get_semantic_llm_cache
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Records every chat model call as an `llm` span under the active span.
+
+    Spans carry the caller namespace, model, token usage and whether the answer came from a cache.
+    """
+
+    run_inline = True
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self._spans: dict[UUID, Span] = {}
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name")
+        # Until the model actually makes a request (see GuardedChatOpenAI) the answer is a cache hit.
+        self._spans[run_id] = start_span("llm", namespace=self.namespace, model=model, cache_hit=True)
+
+    def mark_request(self, run_id: UUID) -> None:
+        if (span := self._spans.get(run_id)) is not None:
+            span.set_attribute("cache_hit", False)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        span.set_attributes(
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            total_tokens=usage.get("total_tokens"),
+        )
+        span.end()
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.end(error=error)
+
+
+def _mark_request(run_manager: Any) -> None:
+    for handler in getattr(run_manager, "handlers", []):
+        if isinstance(handler, TracingCallbackHandler):
+            handler.mark_request(run_manager.run_id)
+
+
+# Errors caused by the request itself rather than an OpenAI outage.
+_CALLER_ERRORS = (
+    openai.BadRequestError,
+    openai.AuthenticationError,
+    openai.PermissionDeniedError,
+    openai.NotFoundError,
+    openai.UnprocessableEntityError,
+)
+_openai_circuit = with_circuit_breaker("openai", ignore=_CALLER_ERRORS)
+_openai_rate_limit = with_rate_limit("openai")
+
+
+class GuardedChatOpenAI(ChatOpenAI):
+    """
+    ChatOpenAI whose requests go through the shared "openai" circuit breaker and rate limiter.
+
+    Only cache misses reach `_generate`, so cached answers keep flowing while the circuit is open;
+    everything else fails fast with CircuitOpenError. `create_llm` turns off the client's own
+    retries, so every failed request counts towards the breaker as soon as it happens.
+    Each request holds a slot of the adaptive limiter (OPENAI_MAX_CONCURRENCY), and a 429 halves
+    the limit and pauses every caller for the server's Retry-After before the request is queued
+    again.
+    """
+
+    def _generate(self, *args: Any, **kwargs: Any) -> ChatResult:
+        _mark_request(kwargs.get("run_manager"))
+        return _openai_circuit(_openai_rate_limit(super()._generate))(*args, **kwargs)
+
+    async def _agenerate(self, *args: Any, **kwargs: Any) -> ChatResult:
+        _mark_request(kwargs.get("run_manager"))
+        return await _openai_circuit(_openai_rate_limit(super()._agenerate))(*args, **kwargs)
 
 
 def create_llm(
     model: str | None = None,
     temperature: float = 0,
     openai_api_key: str | None = None,
+    cache: bool | None = None,
+    semantic_cache: bool = False,
+    cache_namespace: str = "default",
     **kwargs: Any,
 ) -> BaseChatModel:
     """
     Factory to create an LLM instance based on model name.
+
+    With `cache=True`, or by default for temperature-0 calls when LLM_CACHE_PATH is set, identical
+    requests are answered from the persistent response cache. A chain whose final human message is
+    free-form input can opt in with `semantic_cache=True` to answer from the embedding similarity
+    cache instead (when LLM_SEMANTIC_CACHE_DIR is set), which also catches near-identical inputs.
+    `cache_namespace` names the caller so cache hits can be counted per caller. Requests share the
+    process-wide "openai" rate limiter and circuit breaker, and are traced as `llm` spans when
+    TRACE_PATH is set. The OpenAI client's own retries are off (`max_retries=0` unless passed), so
+    429s and their Retry-After reach the shared limiter instead of being retried inside one slot.
     """
     settings = get_settings()
     model_name = model or settings.model_name
     api_key = openai_api_key or settings.openai_api_key
 
+    if cache is None:
+        cache = bool(settings.llm_cache_path) and temperature == 0
+
+    if semantic_cache and settings.llm_semantic_cache_dir:
+        kwargs["cache"] = get_semantic_llm_cache(cache_namespace)
+    elif cache:
+        kwargs["cache"] = get_llm_cache(cache_namespace)
+
+    kwargs.setdefault("max_retries", 0)
+
+    if settings.trace_path:
+        kwargs["callbacks"] = [*(kwargs.get("callbacks") or []), TracingCallbackHandler(cache_namespace)]
+
     if model_name.startswith("gpt-") or "o1-" in model_name:
-        return ChatOpenAI(
+        return GuardedChatOpenAI(
             model=model_name,
             temperature=temperature,
             openai_api_key=api_key,
@@ -28,7 +140,7 @@ def create_llm(
         )
 
     # Default to OpenAI for now
-    return ChatOpenAI(
+    return GuardedChatOpenAI(
         model=model_name,
         temperature=temperature,
         openai_api_key=api_key,
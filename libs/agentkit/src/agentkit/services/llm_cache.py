@@ -0,0 +1,197 @@
+import hashlib
+import json
+import threading
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from agentkit.infra.cache import CacheStats, SQLiteCache
+from agentkit.infra.config import get_settings
+from agentkit.services.semantic_cache import SemanticCache
+
+_caches: dict[str, "LLMResponseCache"] = {}
+_semantic_caches: dict[str, "SemanticLLMCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def _dump_generations(generations: Sequence[Generation]) -> list[dict[str, Any]]:
+    dumped: list[dict[str, Any]] = []
+    for gen in generations:
+        if isinstance(gen, ChatGeneration):
+            dumped.append({"message": message_to_dict(gen.message), "generation_info": gen.generation_info})
+        else:
+            dumped.append({"text": gen.text, "generation_info": gen.generation_info})
+    return dumped
+
+
+def _load_generations(dumped: list[dict[str, Any]]) -> list[Generation]:
+    generations: list[Generation] = []
+    for item in dumped:
+        if "message" in item:
+            message = messages_from_dict([item["message"]])[0]
+            generations.append(ChatGeneration(message=message, generation_info=item["generation_info"]))
+        else:
+            generations.append(Generation(text=item["text"], generation_info=item["generation_info"]))
+    return generations
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Exact-match LangChain cache that persists chat completions in a SQLiteCache.
+
+    LangChain hands the cache the serialized messages and an `llm_string` that captures the model,
+    temperature and bound tools (which is how structured-output schemas reach the model), so a hit
+    means the exact same request was answered before. Hits and misses are counted per namespace.
+    """
+
+    def __init__(self, store: SQLiteCache, namespace: str = "default") -> None:
+        self.store = store
+        self.namespace = namespace
+        self.stats = CacheStats()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        digest = hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+        return f"llm:{digest}"
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        cached = self.store.get(self._key(prompt, llm_string))
+        if cached is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return _load_generations(cached)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.store.set(self._key(prompt, llm_string), _dump_generations(return_val))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+def _message_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(part if isinstance(part, str) else str(part.get("text", "")) for part in content)
+    return ""
+
+
+def _split_prompt(prompt: str) -> tuple[str, str]:
+    """
+    Split LangChain's serialized chat prompt into its fixed part and the final human message.
+
+    The fixed part (system instructions, earlier turns) must match exactly for a cache hit; only
+    the final human message is compared by similarity, so a long shared template cannot make two
+    different inputs look alike.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return "", prompt
+    if not isinstance(messages, list) or not messages:
+        return "", prompt
+
+    roles: list[str] = []
+    texts: list[str] = []
+    for message in messages:
+        fields = message.get("kwargs", {}) if isinstance(message, dict) else {}
+        roles.append(str(fields.get("type", "")))
+        texts.append(_message_text(fields.get("content")))
+
+    last = max((i for i, role in enumerate(roles) if role == "human"), default=len(texts) - 1)
+    fixed = json.dumps([[role, text] for i, (role, text) in enumerate(zip(roles, texts, strict=True)) if i != last])
+    return fixed, texts[last]
+
+
+class SemanticLLMCache(BaseCache):
+    """
+    LangChain cache that answers from a SemanticCache when a similar prompt was seen before.
+
+    Only the final human message is embedded. The `llm_string` and every other message (system
+    template, earlier turns) form the partition, so a hit needs the same model configuration,
+    output schema and instructions, and a near-identical input.
+    """
+
+    def __init__(self, index: SemanticCache, namespace: str = "default") -> None:
+        self.index = index
+        self.namespace = namespace
+        self.stats = CacheStats()
+
+    @staticmethod
+    def _partition(fixed: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{fixed}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        fixed, text = _split_prompt(prompt)
+        cached = self.index.lookup(text, partition=self._partition(fixed, llm_string))
+        if cached is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return _load_generations(cached)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        fixed, text = _split_prompt(prompt)
+        self.index.update(text, _dump_generations(return_val), partition=self._partition(fixed, llm_string))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.index.clear()
+
+
+@lru_cache
+def _get_store(path: str, ttl: float, max_bytes: int) -> SQLiteCache:
+    return SQLiteCache(path, ttl=ttl, max_bytes=max_bytes)
+
+
+def get_llm_cache(namespace: str = "default") -> LLMResponseCache:
+    """Get the response cache for a caller, sharing one persistent store across callers."""
+    settings = get_settings()
+    if not settings.llm_cache_path:
+        raise ValueError("LLM_CACHE_PATH must be set to enable the LLM response cache.")
+
+    store = _get_store(settings.llm_cache_path, settings.llm_cache_ttl, settings.llm_cache_max_bytes)
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None or cache.store is not store:
+            cache = _caches[namespace] = LLMResponseCache(store, namespace)
+        return cache
+
+
+@lru_cache
+def _get_semantic_index(persist_dir: str, threshold: float, max_entries: int) -> SemanticCache:
+    return SemanticCache(threshold=threshold, max_entries=max_entries, persist_dir=persist_dir)
+
+
+def get_semantic_llm_cache(namespace: str = "default") -> SemanticLLMCache:
+    """Get the semantic response cache for a caller, sharing one index across callers."""
+    settings = get_settings()
+    if not settings.llm_semantic_cache_dir:
+        raise ValueError("LLM_SEMANTIC_CACHE_DIR must be set to enable the semantic LLM cache.")
+
+    index = _get_semantic_index(
+        settings.llm_semantic_cache_dir,
+        settings.llm_semantic_cache_threshold,
+        settings.llm_semantic_cache_max_entries,
+    )
+    with _caches_lock:
+        cache = _semantic_caches.get(namespace)
+        if cache is None or cache.index is not index:
+            cache = _semantic_caches[namespace] = SemanticLLMCache(index, namespace)
+        return cache
+
+
+def llm_cache_stats() -> dict[str, CacheStats]:
+    """Hit/miss counters for every caller that has used the exact-match LLM response cache."""
+    with _caches_lock:
+        return {namespace: cache.stats for namespace, cache in _caches.items()}
+
+
+def semantic_cache_stats() -> dict[str, CacheStats]:
+    """Hit/miss counters for every caller that has used the semantic LLM cache."""
+    with _caches_lock:
+        return {namespace: cache.stats for namespace, cache in _semantic_caches.items()}
@@ -0,0 +1,215 @@
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from agentkit.infra.cache import CacheStats, connect_sqlite
+from agentkit.infra.config import get_settings
+from agentkit.services.fetch import FetchedDocument, fetch_document
+from agentkit.services.http import HttpClientPool
+
+logger = logging.getLogger("agentkit.services.page_cache")
+
+_TRACKING_PARAMS = {"gclid", "fbclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalise a URL so trivially different spellings share a cache entry.
+
+    Lower-cases the scheme and host, drops default ports, fragments and tracking parameters
+    (utm_*, gclid, ...), and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+@dataclass
+class CachedPage:
+    """A cached page: its raw HTML plus the validators needed to revalidate it."""
+
+    url: str
+    content_hash: str
+    html: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+
+class PageCache:
+    """
+    Content-addressed cache of fetched pages and their cleaned text.
+
+    Pages are keyed by canonical URL and point at an HTML blob keyed by its SHA-256, so mirrors
+    and redirects that serve identical bytes are stored once. Cleaned text is stored per blob and
+    per cleaner, so an unchanged page is never cleaned twice by the same code path.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 500_000_000) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT PRIMARY KEY,
+                html TEXT NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS texts (
+                content_hash TEXT NOT NULL,
+                cleaner TEXT NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (content_hash, cleaner)
+            );
+            CREATE INDEX IF NOT EXISTS pages_fetched ON pages (fetched_at);
+            """
+        )
+
+    def get(self, url: str) -> CachedPage | None:
+        """Return the cached page for `url`, if any."""
+        key = canonical_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT p.content_hash, b.html, p.etag, p.last_modified, p.fetched_at "
+                "FROM pages p JOIN blobs b ON b.content_hash = p.content_hash WHERE p.url = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(key, row[0], row[1], row[2], row[3], row[4])
+
+    def put(self, url: str, html: str, etag: str | None = None, last_modified: str | None = None) -> CachedPage:
+        """Store a freshly downloaded page, reusing the blob if the content is already known."""
+        key = canonical_url(url)
+        content_hash = hashlib.sha256(html.encode()).hexdigest()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO blobs (content_hash, html, size) VALUES (?, ?, ?)",
+                (content_hash, html, len(html)),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, content_hash, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content_hash, etag, last_modified, now),
+            )
+            self._evict()
+        return CachedPage(key, content_hash, html, etag, last_modified, now)
+
+    def touch(self, page: CachedPage, etag: str | None = None, last_modified: str | None = None) -> CachedPage:
+        """Record a successful revalidation (HTTP 304) of a cached page."""
+        page.etag = etag or page.etag
+        page.last_modified = last_modified or page.last_modified
+        page.fetched_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET etag = ?, last_modified = ?, fetched_at = ? WHERE url = ?",
+                (page.etag, page.last_modified, page.fetched_at, page.url),
+            )
+        return page
+
+    def get_text(self, content_hash: str, cleaner: str) -> str | None:
+        """Return text previously produced by `cleaner` for this content."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM texts WHERE content_hash = ? AND cleaner = ?", (content_hash, cleaner)
+            ).fetchone()
+        return None if row is None else str(row[0])
+
+    def set_text(self, content_hash: str, cleaner: str, text: str) -> None:
+        """Store the text `cleaner` produced for this content."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO texts (content_hash, cleaner, text) VALUES (?, ?, ?)",
+                (content_hash, cleaner, text),
+            )
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop the least recently fetched pages until the blobs they orphan bring us under the cap.
+        refs = dict(self._conn.execute("SELECT content_hash, COUNT(*) FROM pages GROUP BY content_hash").fetchall())
+        sizes = dict(self._conn.execute("SELECT content_hash, size FROM blobs").fetchall())
+        victims = []
+        for url, content_hash in self._conn.execute("SELECT url, content_hash FROM pages ORDER BY fetched_at ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            refs[content_hash] -= 1
+            if refs[content_hash] == 0:
+                total -= sizes.get(content_hash, 0)
+
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+        self._conn.execute("DELETE FROM blobs WHERE content_hash NOT IN (SELECT content_hash FROM pages)")
+        self._conn.execute("DELETE FROM texts WHERE content_hash NOT IN (SELECT content_hash FROM blobs)")
+        self.stats.evictions += len(victims)
+        logger.debug("Evicted %d cached pages from %s", len(victims), self.path)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+async def fetch_page(url: str, cache: PageCache, http_pool: HttpClientPool) -> CachedPage | FetchedDocument:
+    """
+    Fetch `url`, revalidating any cached copy with a conditional GET.
+
+    An unchanged page costs a single 304 response and is served from the cache. The body is
+    streamed by `fetch_document`, so it is capped at FETCH_MAX_BYTES and classified from its first
+    bytes: HTML is cached, while PDFs (as text), other text and skipped content are returned as
+    the FetchedDocument without being cached.
+    """
+    cached = cache.get(url)
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    document = await fetch_document(url, http_pool, headers=headers)
+    if cached is not None and document.status_code == 304:
+        cache.stats.hits += 1
+        return cache.touch(cached, document.etag, document.last_modified)
+
+    cache.stats.misses += 1
+    if document.kind != "html":
+        return document
+    return cache.put(url, document.text, etag=document.etag, last_modified=document.last_modified)
+
+
+@lru_cache
+def get_page_cache() -> PageCache | None:
+    """Get the process-wide page cache, or None when PAGE_CACHE_PATH is not configured."""
+    settings = get_settings()
+    if not settings.page_cache_path:
+        return None
+    return PageCache(settings.page_cache_path, max_bytes=settings.page_cache_max_bytes)
@@ -1,29 +1,129 @@
+import asyncio
+import weakref
 from typing import Any, cast
 
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient, BadRequestError, InvalidAPIKeyError, TavilyClient
 
+from agentkit.infra.cache import SQLiteCache
 from agentkit.infra.config import get_settings
+from agentkit.infra.decorators import singleflight, with_circuit_breaker, with_hedging, with_rate_limit, with_timeout
+from agentkit.infra.tracing import span
+
+SEARCH_TIMEOUT_SECONDS = 60.0
+# Errors caused by the request itself rather than a Tavily outage.
+_CALLER_ERRORS = (ValueError, BadRequestError, InvalidAPIKeyError)
+
+
+def _cache_key(query: str, search_depth: str) -> str:
+    normalized = " ".join(query.lower().split())
+    return f"tavily:{search_depth}:{normalized}"
+
+
+def _flight_key(service: "TavilySearchService", query: str, search_depth: str = "advanced") -> str:
+    """Concurrent searches for the same normalised query share one request, across service instances."""
+    return _cache_key(query, search_depth)
 
 
 class TavilySearchService:
     """Service for performing web searches using Tavily."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        max_concurrency: int | None = None,
+        cache: SQLiteCache | None = None,
+    ):
         settings = get_settings()
         self.api_key = api_key or settings.tavily_api_key
+        self.max_concurrency = max_concurrency or settings.tavily_max_concurrency
+        if cache is None and settings.search_cache_path:
+            cache = SQLiteCache(
+                settings.search_cache_path,
+                ttl=settings.search_cache_ttl,
+                max_bytes=settings.search_cache_max_bytes,
+            )
+        self.cache = cache
+        self._client: TavilyClient | None = None
+        # The async client and semaphore are bound to the event loop that created them.
+        self._async_state: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[AsyncTavilyClient, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
 
-    def search(self, query: str, search_depth: str = "advanced") -> list[dict[str, Any]]:
-        """Perform a synchronous search."""
+    def _require_key(self) -> str:
         if not self.api_key:
             raise ValueError("TAVILY_API_KEY must be set.")
+        return self.api_key
+
+    def _get_client(self) -> TavilyClient:
+        if self._client is None:
+            self._client = TavilyClient(api_key=self._require_key())
+        return self._client
 
-        client = TavilyClient(api_key=self.api_key)
-        response = client.search(query=query, search_depth=search_depth)
-        return cast(list[dict[str, Any]], response.get("results", []))
+    def _get_async_state(self) -> tuple[AsyncTavilyClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            state = (AsyncTavilyClient(api_key=self._require_key()), asyncio.Semaphore(self.max_concurrency))
+            self._async_state[loop] = state
+        return state
 
+    @with_timeout(seconds=SEARCH_TIMEOUT_SECONDS)
+    @singleflight(key=_flight_key)
+    def search(self, query: str, search_depth: str = "advanced") -> list[dict[str, Any]]:
+        """Perform a synchronous search, served from the cache when possible."""
+        with span("search.tavily", query=query, search_depth=search_depth) as trace:
+            key = _cache_key(query, search_depth)
+            cached = self.cache.get(key) if self.cache is not None else None
+            trace.set_attribute("cache_hit", cached is not None)
+            if cached is not None:
+                return cast(list[dict[str, Any]], cached)
+
+            response = self._search(query, search_depth)
+            results = cast(list[dict[str, Any]], response.get("results", []))
+            trace.set_attribute("results", len(results))
+            if self.cache is not None:
+                self.cache.set(key, results)
+            return results
+
+    @with_circuit_breaker("tavily", ignore=_CALLER_ERRORS)
+    @with_rate_limit("tavily")
+    def _search(self, query: str, search_depth: str) -> dict[str, Any]:
+        return cast(dict[str, Any], self._get_client().search(query=query, search_depth=search_depth))
+
+    # Hedging sits outside the rate limiter so a duplicate request takes its own token and slot.
+    @with_circuit_breaker("tavily", ignore=_CALLER_ERRORS)
+    @with_hedging(max_delay=SEARCH_TIMEOUT_SECONDS / 4)
+    @with_rate_limit("tavily")
+    async def _asearch(self, query: str, search_depth: str) -> dict[str, Any]:
+        client, semaphore = self._get_async_state()
+        async with semaphore:
+            return cast(dict[str, Any], await client.search(query=query, search_depth=search_depth))
+
+    @singleflight(key=_flight_key)
     async def asearch(self, query: str, search_depth: str = "advanced") -> list[dict[str, Any]]:
-        """Perform an asynchronous search. Currently wraps sync search."""
-        # In a real production scenario, we'd use an async client
-        import asyncio
+        """Perform an asynchronous search, bounded by the service's concurrency limit."""
+        with span("search.tavily", query=query, search_depth=search_depth) as trace:
+            key = _cache_key(query, search_depth)
+            cached = self.cache.get(key) if self.cache is not None else None
+            trace.set_attribute("cache_hit", cached is not None)
+            if cached is not None:
+                return cast(list[dict[str, Any]], cached)
+
+            response = await self._asearch(query, search_depth)
+            results = cast(list[dict[str, Any]], response.get("results", []))
+            trace.set_attribute("results", len(results))
+            if self.cache is not None:
+                self.cache.set(key, results)
+            return results
+
+    async def search_many(self, queries: list[str], search_depth: str = "advanced") -> list[list[dict[str, Any]]]:
+        """Run several searches concurrently and return their results in query order."""
+        return list(await asyncio.gather(*(self.asearch(query, search_depth) for query in queries)))
 
-        return await asyncio.to_thread(self.search, query, search_depth)
+    async def aclose(self) -> None:
+        """Release the async client bound to the running event loop."""
+        state = self._async_state.pop(asyncio.get_running_loop(), None)
+        # tavily-python < 0.7.21 opens a client per request and has nothing to close.
+        close = getattr(state[0], "close", None) if state is not None else None
+        if close is not None:
+            await close()
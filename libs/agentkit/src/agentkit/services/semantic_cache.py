@@ -0,0 +1,240 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from agentkit.infra.cache import CacheStats
+
+logger = logging.getLogger("agentkit.services.semantic_cache")
+
+EmbeddingFn = Callable[[list[str]], Any]
+
+_TOKEN_RE = re.compile(r"[a-z0-9$%]+(?:\.\d+)*")
+
+
+class HashingEmbedder:
+    """
+    Local, dependency-light text embedding based on signed feature hashing (Lazy Import: numpy).
+
+    Words and word bigrams are hashed into `dim` buckets and the result is L2-normalised. It needs
+    no model download, and paraphrases that share most of their wording land close together.
+    """
+
+    def __init__(self, dim: int = 1024) -> None:
+        self.dim = dim
+
+    def __call__(self, texts: list[str]) -> Any:
+        import numpy as np
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:], strict=False)]
+            for feature in features:
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                matrix[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache (Lazy Import: numpy).
+
+    Entries are grouped into partitions (e.g. one per model configuration) so a hit never crosses
+    partitions. Lookups embed the query and run one vectorised cosine over every cached vector; the
+    best match at or above `threshold` is returned. Past `max_entries` the least recently used
+    entries are evicted. With `persist_dir` the index is saved every `save_every` writes and on
+    `close()`, which also runs at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbeddingFn | None = None,
+        threshold: float = 0.95,
+        max_entries: int = 10_000,
+        persist_dir: str | Path | None = None,
+        save_every: int = 20,
+    ) -> None:
+        import numpy as np
+
+        self.embed_fn = embed_fn or HashingEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self.save_every = save_every
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+        # Row buffers grow by doubling; only the first len(self._values) rows are live.
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._partitions = np.zeros(0, dtype=np.int64)
+        self._last_used = np.zeros(0, dtype=np.float64)
+        self._values: list[Any] = []
+        self._partition_ids: dict[str, int] = {}
+
+        if self.persist_dir:
+            if (self.persist_dir / "entries.json").exists():
+                self._load()
+            atexit.register(self.close)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _embed(self, text: str) -> Any:
+        import numpy as np
+
+        vector = np.asarray(self.embed_fn([text]), dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, text: str, partition: str = "") -> Any | None:
+        """Return the value cached for the most similar text in `partition`, if similar enough."""
+        import numpy as np
+
+        query = self._embed(text)
+        with self._lock:
+            pid = self._partition_ids.get(partition)
+            if pid is None or not self._values or self._vectors.shape[1] != query.shape[0]:
+                self.stats.misses += 1
+                return None
+
+            n = len(self._values)
+            scores = np.where(self._partitions[:n] == pid, self._vectors[:n] @ query, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.stats.misses += 1
+                return None
+
+            self._last_used[best] = time.time()
+            self.stats.hits += 1
+            return self._values[best]
+
+    def update(self, text: str, value: Any, partition: str = "") -> None:
+        """Cache `value` for `text` in `partition`."""
+        import numpy as np
+
+        vector = self._embed(text)
+        with self._lock:
+            pid = self._partition_ids.setdefault(partition, len(self._partition_ids))
+            n = len(self._values)
+            if not n and self._vectors.shape[1] != vector.shape[0]:
+                self._vectors = np.zeros((0, vector.shape[0]), dtype=np.float32)
+            if n == len(self._vectors):
+                self._grow(max(16, 2 * n))
+            self._vectors[n] = vector
+            self._partitions[n] = pid
+            self._last_used[n] = time.time()
+            self._values.append(value)
+
+            if len(self._values) > self.max_entries:
+                self._evict(len(self._values) - self.max_entries)
+
+            self._unsaved += 1
+            if self.persist_dir and self._unsaved >= self.save_every:
+                self._save()
+
+    def _grow(self, capacity: int) -> None:
+        import numpy as np
+
+        n = len(self._values)
+        vectors = np.zeros((capacity, self._vectors.shape[1]), dtype=np.float32)
+        vectors[:n] = self._vectors[:n]
+        partitions = np.zeros(capacity, dtype=np.int64)
+        partitions[:n] = self._partitions[:n]
+        last_used = np.zeros(capacity, dtype=np.float64)
+        last_used[:n] = self._last_used[:n]
+        self._vectors, self._partitions, self._last_used = vectors, partitions, last_used
+
+    def _evict(self, count: int) -> None:
+        import numpy as np
+
+        n = len(self._values)
+        victims = np.argpartition(self._last_used[:n], count - 1)[:count]
+        keep = np.ones(n, dtype=bool)
+        keep[victims] = False
+        kept = int(keep.sum())
+        self._vectors[:kept] = self._vectors[:n][keep]
+        self._partitions[:kept] = self._partitions[:n][keep]
+        self._last_used[:kept] = self._last_used[:n][keep]
+        self._values = [v for v, k in zip(self._values, keep, strict=True) if k]
+        self.stats.evictions += count
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk."""
+        import numpy as np
+
+        with self._lock:
+            self._vectors = np.zeros((0, 0), dtype=np.float32)
+            self._partitions = np.zeros(0, dtype=np.int64)
+            self._last_used = np.zeros(0, dtype=np.float64)
+            self._values = []
+            self._partition_ids = {}
+            self._unsaved = 0
+            if self.persist_dir:
+                for name in ("vectors.npy", "entries.json"):
+                    (self.persist_dir / name).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Save any unsaved entries."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def save(self) -> None:
+        """Persist the index to `persist_dir`."""
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        import numpy as np
+
+        if not self.persist_dir:
+            return
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        vectors_tmp = self.persist_dir / "vectors.tmp.npy"
+        n = len(self._values)
+        np.save(vectors_tmp, self._vectors[:n])
+        entries_tmp = self.persist_dir / "entries.tmp.json"
+        entries_tmp.write_text(
+            json.dumps(
+                {
+                    "partitions": self._partition_ids,
+                    "entries": [
+                        {"partition": int(p), "last_used": float(t), "value": v}
+                        for p, t, v in zip(self._partitions[:n], self._last_used[:n], self._values, strict=True)
+                    ],
+                }
+            )
+        )
+        os.replace(vectors_tmp, self.persist_dir / "vectors.npy")
+        os.replace(entries_tmp, self.persist_dir / "entries.json")
+        self._unsaved = 0
+
+    def _load(self) -> None:
+        import numpy as np
+
+        assert self.persist_dir is not None
+        try:
+            data = json.loads((self.persist_dir / "entries.json").read_text())
+            vectors = np.load(self.persist_dir / "vectors.npy")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load semantic cache from {self.persist_dir}: {e}")
+            return
+        if len(vectors) != len(data["entries"]):
+            logger.warning(f"Semantic cache index at {self.persist_dir} is inconsistent, starting empty.")
+            return
+
+        self._vectors = vectors.astype(np.float32)
+        self._partition_ids = {k: int(v) for k, v in data["partitions"].items()}
+        self._partitions = np.array([e["partition"] for e in data["entries"]], dtype=np.int64)
+        self._last_used = np.array([e["last_used"] for e in data["entries"]], dtype=np.float64)
+        self._values = [e["value"] for e in data["entries"]]
@@ -1,9 +1,31 @@
 import hashlib
 import logging
+import threading
+from collections.abc import Callable, Iterator
 from typing import Any, Protocol, cast
 
+from agentkit.infra.tracing import current_span, traced
+from agentkit.services.bm25 import BM25Index
+
 logger = logging.getLogger("agentkit.services.vector_store")
 
+EmbeddingFn = Callable[[list[str]], Any]
+
+# Upsert batch size used until the Chroma client reports its own limit.
+_DEFAULT_MAX_BATCH_SIZE = 5000
+
+# Write counter per (persist directory, collection), shared by every ChromaVectorStore in the process
+# so a cached count is dropped when any of them writes.
+_write_generations: dict[tuple[str, str], int] = {}
+_write_generations_lock = threading.Lock()
+
+
+def _write_generation(key: tuple[str, str], bump: bool = False) -> int:
+    with _write_generations_lock:
+        if bump:
+            _write_generations[key] = _write_generations.get(key, 0) + 1
+        return _write_generations.get(key, 0)
+
 
 class VectorStore(Protocol):
     """Protocol for vector store implementations."""
@@ -12,38 +34,124 @@ class VectorStore(Protocol):
         self, texts: list[str], metadatas: list[dict[str, Any]] | None = None, ids: list[str] | None = None
     ) -> bool: ...
     def query(self, query: str, k: int = 3) -> list[dict[str, Any]]: ...
+    def query_many(self, queries: list[str], k: int = 3) -> list[list[dict[str, Any]]]: ...
 
 
 class InMemoryVectorStore:
-    """Simple in-memory vector store for testing (no real embeddings, just keyword match)."""
+    """
+    Dependency-free store for tests, fallbacks and short-lived runs.
 
-    def __init__(self) -> None:
-        self.data: list[dict[str, Any]] = []
+    Without an `embedding_function` it does BM25 keyword search over an inverted index, so queries
+    only score documents that share a term with the query. With one (any callable mapping a list of
+    texts to vectors, e.g. a Chroma embedding function) it keeps normalised vectors in one growable
+    NumPy matrix (Lazy Import), optionally as float16 to halve memory, and answers a batch of
+    queries with a single matrix product plus `argpartition` top-k. Adding an existing id replaces
+    that document.
+    """
+
+    # Rows of float16 storage upcast to float32 per block while scoring (NumPy has no fast float16 matmul).
+    _SCORE_BLOCK_ROWS = 32_768
+
+    def __init__(self, embedding_function: EmbeddingFn | None = None, dtype: str = "float32") -> None:
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        self.embedding_function = embedding_function
+        self.dtype = dtype
+        self._items: dict[str, dict[str, Any]] = {}
+        self._index = BM25Index()
+        # Dense mode: row i of the matrix holds the vector of self._row_ids[i].
+        self._matrix: Any = None
+        self._rows: dict[str, int] = {}
+        self._row_ids: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def data(self) -> list[dict[str, Any]]:
+        return list(self._items.values())
 
     def add_texts(
         self, texts: list[str], metadatas: list[dict[str, Any]] | None = None, ids: list[str] | None = None
     ) -> bool:
+        item_ids = ids or [hashlib.md5(text.encode()).hexdigest() for text in texts]
         for i, text in enumerate(texts):
             meta = metadatas[i] if metadatas else {}
-            item_id = ids[i] if ids else hashlib.md5(text.encode()).hexdigest()
-            self.data.append({"id": item_id, "content": text, "metadata": meta})
+            self._items[item_ids[i]] = {"id": item_ids[i], "content": text, "metadata": meta}
+            if self.embedding_function is None:
+                self._index.add(item_ids[i], text)
+        if self.embedding_function is not None and texts:
+            self._add_vectors(item_ids, _embed(self.embedding_function, texts))
         return True
 
     def query(self, query: str, k: int = 3) -> list[dict[str, Any]]:
-        # Extremely simple keyword search for testing
-        query_words = set(query.lower().split())
-        scored = []
-        for item in self.data:
-            content_words = set(item["content"].lower().split())
-            score = len(query_words.intersection(content_words))
-            scored.append((score, item))
+        return self.query_many([query], k)[0]
+
+    def query_many(self, queries: list[str], k: int = 3) -> list[list[dict[str, Any]]]:
+        """The top `k` documents for each query, embedding and scoring all queries in one batch."""
+        if self.embedding_function is None:
+            return [[self._items[item_id] for item_id, _ in self._index.search(q, k)] for q in queries]
+        if not queries or not self._row_ids or k <= 0:
+            return [[] for _ in queries]
+        top_rows = self._top_rows(_embed(self.embedding_function, queries), k)
+        return [[self._items[self._row_ids[row]] for row in rows] for rows in top_rows]
+
+    def _add_vectors(self, item_ids: list[str], vectors: Any) -> None:
+        import numpy as np
+
+        rows = []
+        for item_id in item_ids:
+            row = self._rows.get(item_id)
+            if row is None:
+                row = self._rows[item_id] = len(self._row_ids)
+                self._row_ids.append(item_id)
+            rows.append(row)
+
+        if self._matrix is None:
+            self._matrix = np.zeros((max(64, len(self._row_ids)), vectors.shape[1]), dtype=self.dtype)
+        elif len(self._row_ids) > len(self._matrix):
+            # Grow geometrically so appends stay amortised O(1).
+            capacity = max(2 * len(self._matrix), len(self._row_ids))
+            grown = np.zeros((capacity, self._matrix.shape[1]), dtype=self.dtype)
+            grown[: len(self._matrix)] = self._matrix
+            self._matrix = grown
+        self._matrix[rows] = vectors
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [item for score, item in scored[:k] if score > 0]
+    def _top_rows(self, queries: Any, k: int) -> Any:
+        import numpy as np
+
+        n = len(self._row_ids)
+        if self.dtype == "float32":
+            scores = queries @ self._matrix[:n].T
+        else:
+            scores = np.empty((len(queries), n), dtype=np.float32)
+            for start in range(0, n, self._SCORE_BLOCK_ROWS):
+                block = self._matrix[start : min(n, start + self._SCORE_BLOCK_ROWS)].astype(np.float32)
+                scores[:, start : start + len(block)] = queries @ block.T
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (len(queries), 1))
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1)
+
+
+def _embed(embedding_function: EmbeddingFn, texts: list[str]) -> Any:
+    """Embed `texts` as L2-normalised float32 rows."""
+    import numpy as np
+
+    vectors = np.asarray(embedding_function(texts), dtype=np.float32).reshape(len(texts), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
 
 
 class ChromaVectorStore:
-    """Vector store implementation using ChromaDB (Lazy Import)."""
+    """
+    Vector store implementation using ChromaDB (Lazy Import).
+
+    Writes are split at the client's maximum batch size, several queries can be answered in one
+    Chroma call, and `where` metadata filters are applied by Chroma itself. The document count is
+    cached until any store in this process writes to the same collection.
+    """
 
     def __init__(
         self,
@@ -55,6 +163,8 @@ class ChromaVectorStore:
         self.collection_name = collection_name
         self.embedding_function = embedding_function
         self._collection: Any = None
+        self._max_batch_size = _DEFAULT_MAX_BATCH_SIZE
+        self._count: tuple[int, int] | None = None  # (write generation, count)
 
     def _get_collection(self) -> Any:
         if self._collection is None:
@@ -64,36 +174,95 @@ class ChromaVectorStore:
             self._collection = client.get_or_create_collection(
                 name=self.collection_name, embedding_function=self.embedding_function
             )
+            try:
+                self._max_batch_size = client.get_max_batch_size()
+            except Exception:
+                logger.debug("Chroma client does not report a max batch size; using %d", self._max_batch_size)
         return self._collection
 
+    @property
+    def _key(self) -> tuple[str, str]:
+        return (self.persist_directory, self.collection_name)
+
+    def count(self) -> int:
+        """Number of documents in the collection (cached until the next write to it)."""
+        generation = _write_generation(self._key)
+        if self._count is None or self._count[0] != generation:
+            self._count = (generation, int(self._get_collection().count()))
+        return self._count[1]
+
+    @traced("vector_store.add")
     def add_texts(
         self, texts: list[str], metadatas: list[dict[str, Any]] | None = None, ids: list[str] | None = None
     ) -> bool:
+        current_span().set_attributes(collection=self.collection_name, count=len(texts))
         try:
             collection = self._get_collection()
             if ids is None:
                 ids = [hashlib.md5(t.encode()).hexdigest() for t in texts]
-            collection.upsert(documents=texts, metadatas=cast(Any, metadatas), ids=ids)
+            step = self._max_batch_size
+            for start in range(0, len(texts), step):
+                try:
+                    collection.upsert(
+                        documents=texts[start : start + step],
+                        metadatas=cast(Any, metadatas[start : start + step] if metadatas else None),
+                        ids=ids[start : start + step],
+                    )
+                finally:
+                    # After the write, so a count read while it was in flight is not kept.
+                    _write_generation(self._key, bump=True)
             return True
         except Exception as e:
             logger.error(f"Chroma add_texts failed: {e}")
             return False
 
-    def query(self, query: str, k: int = 3) -> list[dict[str, Any]]:
+    def iter_documents(self, batch_size: int | None = None) -> Iterator[list[dict[str, Any]]]:
+        """Every stored document (id, content, metadata), in pages of `batch_size` (default: max batch size)."""
+        collection = self._get_collection()
+        step = batch_size or self._max_batch_size
+        offset = 0
+        while True:
+            page = collection.get(limit=step, offset=offset, include=["documents", "metadatas"])
+            ids = page["ids"]
+            if not ids:
+                return
+            docs = page["documents"] or [""] * len(ids)
+            metas = page["metadatas"] or [{}] * len(ids)
+            yield [{"id": ids[i], "content": docs[i], "metadata": metas[i] or {}} for i in range(len(ids))]
+            offset += len(ids)
+
+    def get_embeddings(self, ids: list[str]) -> dict[str, Any]:
+        """The stored vectors of the given ids; ids that are not stored are left out."""
+        if not ids:
+            return {}
+        page = self._get_collection().get(ids=ids, include=["embeddings"])
+        embeddings = page["embeddings"]
+        if embeddings is None:
+            return {}
+        return dict(zip(page["ids"], embeddings, strict=True))
+
+    def query(self, query: str, k: int = 3, where: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        return self.query_many([query], k=k, where=where)[0]
+
+    @traced("vector_store.query")
+    def query_many(
+        self, queries: list[str], k: int = 3, where: dict[str, Any] | None = None
+    ) -> list[list[dict[str, Any]]]:
+        """The top `k` documents for each query (matching the `where` metadata filter), in one Chroma call."""
+        current_span().set_attributes(collection=self.collection_name, k=k, queries=len(queries))
         try:
-            collection = self._get_collection()
-            if collection.count() == 0:
-                return []
-
-            results = collection.query(query_texts=[query], n_results=k)
-            output = []
-            if results["documents"]:
-                docs = results["documents"][0]
-                metas = results["metadatas"][0] if results["metadatas"] else [{}] * len(docs)
-                ids = results["ids"][0]
-                for i in range(len(docs)):
-                    output.append({"id": ids[i], "content": docs[i], "metadata": metas[i]})
+            if not queries or self.count() == 0:
+                return [[] for _ in queries]
+
+            results = self._get_collection().query(query_texts=queries, n_results=k, where=where)
+            output: list[list[dict[str, Any]]] = []
+            for i in range(len(queries)):
+                docs = results["documents"][i] if results["documents"] else []
+                metas = results["metadatas"][i] if results["metadatas"] else [{}] * len(docs)
+                ids = results["ids"][i]
+                output.append([{"id": ids[j], "content": docs[j], "metadata": metas[j]} for j in range(len(docs))])
+            current_span().set_attribute("results", sum(len(hits) for hits in output))
             return output
         except Exception as e:
             logger.error(f"Chroma query failed: {e}")
-            return []
+            return [[] for _ in queries]
@@ -12,6 +12,11 @@ def mock_settings() -> MagicMock:
     settings.openai_api_key = "sk-dummy"
     settings.tavily_api_key = "tv-dummy"
     settings.model_name = "gpt-mock"
+    settings.search_cache_path = None
+    settings.page_cache_path = None
+    settings.llm_cache_path = None
+    settings.llm_semantic_cache_dir = None
+    settings.trace_path = None
     return settings
 
 
@@ -0,0 +1,45 @@
+import time
+from pathlib import Path
+
+from agentkit.infra.cache import SQLiteCache
+
+
+def test_cache_roundtrip(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    assert cache.get("missing") is None
+
+    cache.set("key", [{"content": "value"}])
+    assert cache.get("key") == [{"content": "value"}]
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    SQLiteCache(tmp_path / "cache.sqlite").set("key", {"a": 1})
+    assert SQLiteCache(tmp_path / "cache.sqlite").get("key") == {"a": 1}
+
+
+def test_cache_ttl_expiry(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite", ttl=0.01)
+    cache.set("key", "value")
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_cache_lru_eviction(tmp_path: Path) -> None:
+    # Each entry is ~12 bytes of JSON, so only two fit.
+    cache = SQLiteCache(tmp_path / "cache.sqlite", max_bytes=25)
+    cache.set("a", "x" * 10)
+    time.sleep(0.001)
+    cache.set("b", "y" * 10)
+    time.sleep(0.001)
+    cache.get("a")  # "a" is now more recently used than "b"
+    time.sleep(0.001)
+    cache.set("c", "z" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 10
+    assert cache.get("c") == "z" * 10
+    assert cache.stats.evictions == 1
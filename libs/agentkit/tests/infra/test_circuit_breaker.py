@@ -0,0 +1,104 @@
+import time
+
+import pytest
+from agentkit.infra.circuit_breaker import CircuitBreaker, CircuitOpenError, RetryBudget
+from agentkit.infra.decorators import with_circuit_breaker, with_fallback, with_retry
+
+
+def test_breaker_opens_and_recovers_through_half_open() -> None:
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # The probe.
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # Only one probe at a time.
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens() -> None:
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_retry_budget_drains_and_refills() -> None:
+    budget = RetryBudget(max_tokens=2, ratio=0.5)
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_success()
+    budget.record_success()
+    assert budget.try_spend()
+
+
+def test_open_circuit_skips_retries_and_falls_back() -> None:
+    calls = 0
+
+    @with_fallback(fallback="fallback")
+    @with_retry(max_attempts=3, wait_min=0, wait_max=0)
+    @with_circuit_breaker("test-outage", failure_threshold=1, reset_timeout=60)
+    def outage() -> str:
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("down")
+
+    assert outage() == "fallback"
+    # The first failure opens the circuit; the retries then fail fast without calling through.
+    assert calls == 1
+    start = time.perf_counter()
+    assert outage() == "fallback"
+    assert calls == 1
+    assert time.perf_counter() - start < 0.1
+
+
+def test_ignored_errors_do_not_open_circuit() -> None:
+    @with_circuit_breaker("test-ignore", failure_threshold=1, ignore=(ValueError,))
+    def bad_request() -> None:
+        raise ValueError("bad input")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            bad_request()
+
+
+@pytest.mark.asyncio
+async def test_async_circuit_breaker() -> None:
+    @with_circuit_breaker("test-async-outage", failure_threshold=1, reset_timeout=60)
+    async def outage() -> None:
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        await outage()
+    with pytest.raises(CircuitOpenError):
+        await outage()
+
+
+def test_retry_budget_exhaustion_stops_retrying() -> None:
+    calls = 0
+
+    @with_retry(max_attempts=5, wait_min=0, wait_max=0, budget="test-budget")
+    def flaky() -> None:
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        flaky()
+    assert calls == 5
+    calls = 0
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            flaky()
+    # The default budget holds 10 retries: 4 went to the first call, leaving 6 for the next three.
+    assert calls == 3 + 6
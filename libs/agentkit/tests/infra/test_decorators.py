@@ -1,7 +1,10 @@
 import asyncio
+import threading
+import time
 
 import pytest
-from agentkit.infra.decorators import logged, with_fallback, with_retry, with_timeout
+from agentkit.infra.decorators import logged, singleflight, with_fallback, with_hedging, with_retry, with_timeout
+from agentkit.infra.metrics import get_metrics
 
 
 @logged()
@@ -72,3 +75,112 @@ async def async_slow() -> str:
 async def test_with_timeout_async() -> None:
     with pytest.raises(asyncio.TimeoutError):
         await async_slow()
+
+
+@with_timeout(seconds=0.1)
+def sync_slow(delay: float) -> str:
+    time.sleep(delay)
+    return "done"
+
+
+def test_with_timeout_sync() -> None:
+    before = get_metrics().counter("timeouts_total", f"{__name__}.sync_slow")
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        sync_slow(1.0)
+    assert time.perf_counter() - start < 0.5
+    assert get_metrics().counter("timeouts_total", f"{__name__}.sync_slow") == before + 1
+
+
+def test_with_timeout_sync_returns_and_propagates() -> None:
+    @with_timeout(seconds=1)
+    def boom() -> None:
+        raise ValueError("boom")
+
+    assert sync_slow(0) == "done"
+    with pytest.raises(ValueError, match="boom"):
+        boom()
+
+
+@pytest.mark.asyncio
+async def test_with_hedging_duplicates_slow_call() -> None:
+    calls = 0
+    cancelled = 0
+
+    @with_hedging(percentile=50, min_samples=3)
+    async def fetch(delay: float) -> str:
+        nonlocal calls, cancelled
+        calls += 1
+        try:
+            # Only the first attempt of the slow call hangs; its hedge returns at once.
+            await asyncio.sleep(delay if calls != 5 else 0)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return "done"
+
+    for _ in range(3):
+        assert await fetch(0.01) == "done"
+    start = time.perf_counter()
+    assert await fetch(1.0) == "done"
+    assert time.perf_counter() - start < 0.5
+    assert calls == 5
+    await asyncio.sleep(0)
+    assert cancelled == 1
+    assert get_metrics().counter("hedge_wins_total", f"{__name__}.{fetch.__qualname__}") == 1
+
+
+def test_with_hedging_rejects_sync_functions() -> None:
+    with pytest.raises(TypeError):
+        with_hedging()(lambda: None)
+
+
+@pytest.mark.asyncio
+async def test_singleflight_coalesces_async_calls() -> None:
+    calls = 0
+
+    @singleflight(key=lambda url: url.lower())
+    async def scrape(url: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return f"content of {url}"
+
+    results = await asyncio.gather(scrape("https://a.com"), scrape("https://A.com"), scrape("https://b.com"))
+    assert list(results) == ["content of https://a.com", "content of https://a.com", "content of https://b.com"]
+    assert calls == 2
+
+    # Finished calls are not cached.
+    await scrape("https://a.com")
+    assert calls == 3
+
+
+def test_singleflight_coalesces_threads_and_shares_errors() -> None:
+    calls = 0
+    release = threading.Event()
+
+    @singleflight()
+    def search(query: str) -> str:
+        nonlocal calls
+        calls += 1
+        release.wait(1)
+        raise ValueError(query)
+
+    errors: list[str] = []
+
+    def worker() -> None:
+        try:
+            search("q")
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == 1
+    assert errors == ["q"] * 4
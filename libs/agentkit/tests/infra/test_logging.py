@@ -1,6 +1,10 @@
+import json
 import logging
+import logging.handlers
+from pathlib import Path
 
-from agentkit.infra.logging import setup_logging
+import pytest
+from agentkit.infra.logging import DebugSampler, JsonFormatter, setup_logging, shutdown_logging
 
 
 def test_setup_logging() -> None:
@@ -8,3 +12,72 @@ def test_setup_logging() -> None:
     assert logger.level == logging.DEBUG
     assert logger.name == "test-logger"
     assert len(logger.handlers) > 0
+
+
+def test_setup_logging_is_idempotent() -> None:
+    logger = setup_logging(name="test-idempotent")
+    assert setup_logging(name="test-idempotent").handlers == logger.handlers
+    assert len(logger.handlers) == 1
+    shutdown_logging("test-idempotent")
+
+
+def test_setup_logging_does_not_propagate_by_default(caplog: pytest.LogCaptureFixture) -> None:
+    logger = setup_logging(name="test-no-propagate", console=False)
+    try:
+        assert not logger.propagate
+        with caplog.at_level(logging.INFO, logger="test-no-propagate"):
+            logger.info("stays on the queue")
+        assert "stays on the queue" not in caplog.text
+    finally:
+        shutdown_logging("test-no-propagate")
+
+
+def test_setup_logging_can_opt_into_propagation(caplog: pytest.LogCaptureFixture) -> None:
+    logger = setup_logging(name="test-propagate", console=False, propagate=True)
+    try:
+        with caplog.at_level(logging.INFO, logger="test-propagate"):
+            logger.info("reaches root handlers")
+        assert "reaches root handlers" in caplog.text
+    finally:
+        shutdown_logging("test-propagate")
+
+
+def test_json_formatter_escapes_and_includes_extras() -> None:
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, 'said "hi"\nthen %s', ("left",), None)
+    record.run_id = "abc"
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == 'said "hi"\nthen left'
+    assert payload["level"] == "INFO"
+    assert payload["run_id"] == "abc"
+
+
+def test_debug_sampler_keeps_fraction_of_debug() -> None:
+    sampler = DebugSampler(rate=0.25)
+
+    def record(level: int) -> logging.LogRecord:
+        return logging.LogRecord("x", level, __file__, 1, "m", None, None)
+
+    assert sum(sampler.filter(record(logging.DEBUG)) for _ in range(100)) == 25
+    assert all(sampler.filter(record(logging.INFO)) for _ in range(10))
+
+
+def test_queue_logging_writes_rotated_json_file(tmp_path: Path) -> None:
+    log_file = tmp_path / "logs" / "app.log"
+    logger = setup_logging(
+        level="DEBUG", name="test-queue", json_format=True, log_file=log_file, max_bytes=2_000, console=False
+    )
+    for i in range(50):
+        logger.info('message %d with "quotes"', i)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    shutdown_logging("test-queue")
+
+    assert not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers)
+    assert (tmp_path / "logs" / "app.log.1").exists()
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert lines[-1]["message"] == "failed"
+    assert "ValueError: boom" in lines[-1]["exc_info"]
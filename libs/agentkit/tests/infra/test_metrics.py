@@ -0,0 +1,54 @@
+import pytest
+from agentkit.infra.decorators import logged
+from agentkit.infra.metrics import Histogram, MetricsRegistry, get_metrics
+
+
+def test_histogram_quantiles() -> None:
+    histogram = Histogram(buckets=(0.1, 0.2, 1.0, float("inf")))
+    for _ in range(90):
+        histogram.observe(0.05)
+    for _ in range(10):
+        histogram.observe(0.5)
+
+    assert histogram.count == 100
+    assert 0 < histogram.quantile(0.5) <= 0.1
+    assert 0.2 < histogram.quantile(0.99) <= 1.0
+
+
+def test_prometheus_export() -> None:
+    registry = MetricsRegistry()
+    registry.inc("rate_limited_total", "tavily", label_name="provider")
+    registry.observe("call_duration_seconds", 'pkg.fn"x', 0.003)
+
+    text = registry.to_prometheus()
+
+    assert "# TYPE agentkit_rate_limited_total counter" in text
+    assert 'agentkit_rate_limited_total{provider="tavily"} 1' in text
+    assert "# TYPE agentkit_call_duration_seconds histogram" in text
+    assert 'agentkit_call_duration_seconds_bucket{function="pkg.fn\\"x",le="0.001"} 0' in text
+    assert 'agentkit_call_duration_seconds_bucket{function="pkg.fn\\"x",le="0.005"} 1' in text
+    assert 'agentkit_call_duration_seconds_bucket{function="pkg.fn\\"x",le="+Inf"} 1' in text
+    assert 'agentkit_call_duration_seconds_count{function="pkg.fn\\"x"} 1' in text
+
+
+@logged()
+def _work(fail: bool) -> None:
+    if fail:
+        raise ValueError("boom")
+
+
+def test_logged_records_calls_errors_and_latency() -> None:
+    name = f"{__name__}._work"
+    metrics = get_metrics()
+    calls = metrics.counter("calls_total", name)
+    errors = metrics.counter("errors_total", name)
+
+    _work(False)
+    with pytest.raises(ValueError):
+        _work(True)
+
+    assert metrics.counter("calls_total", name) == calls + 2
+    assert metrics.counter("errors_total", name) == errors + 1
+    summary = metrics.percentiles("call_duration_seconds", name)
+    assert summary["count"] >= 2
+    assert summary["p50"] <= summary["p95"] <= summary["p99"]
@@ -0,0 +1,90 @@
+import time
+
+import httpx
+import pytest
+from agentkit.infra.decorators import with_rate_limit
+from agentkit.infra.rate_limit import AdaptiveRateLimiter, get_rate_limiter, is_rate_limited, retry_after_seconds
+
+
+def _http_429(headers: dict[str, str]) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.example.com")
+    response = httpx.Response(429, headers=headers, request=request)
+    return httpx.HTTPStatusError("Too Many Requests", request=request, response=response)
+
+
+def test_token_bucket_spaces_out_calls() -> None:
+    limiter = AdaptiveRateLimiter(rate=20, burst=1)
+    start = time.perf_counter()
+    for _ in range(3):
+        limiter.acquire(slot=False)
+    assert time.perf_counter() - start >= 0.09
+
+
+def test_concurrency_limit_and_nonblocking_acquire() -> None:
+    limiter = AdaptiveRateLimiter(rate=100, burst=10, max_concurrency=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(blocking=False)
+    limiter.release()
+    assert limiter.acquire(blocking=False)
+
+
+def test_throttle_halves_concurrency_and_pauses() -> None:
+    limiter = AdaptiveRateLimiter(rate=100, burst=10, max_concurrency=8)
+    limiter.acquire()
+    limiter.throttle(retry_after=0.2)
+    assert limiter.concurrency == 4
+    assert not limiter.acquire(blocking=False)
+
+    start = time.perf_counter()
+    limiter.acquire()
+    assert time.perf_counter() - start >= 0.15
+    limiter.release()
+    assert limiter.concurrency > 4
+
+
+def test_retry_after_parsing() -> None:
+    assert retry_after_seconds(_http_429({"Retry-After": "3"})) == 3
+    assert retry_after_seconds(_http_429({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(_http_429({})) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+    assert is_rate_limited(_http_429({}))
+    assert not is_rate_limited(ValueError("boom"))
+
+
+def test_with_rate_limit_requeues_on_429() -> None:
+    calls = 0
+
+    @with_rate_limit("test-requeue")
+    def flaky() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise _http_429({"Retry-After": "0.05"})
+        return "ok"
+
+    assert flaky() == "ok"
+    assert calls == 2
+    assert get_rate_limiter("test-requeue").throttled_count == 1
+
+
+def test_with_rate_limit_gives_up_after_max_retries() -> None:
+    @with_rate_limit("test-give-up", max_retries=1)
+    def always_limited() -> None:
+        raise _http_429({"Retry-After": "0"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        always_limited()
+
+
+@pytest.mark.asyncio
+async def test_with_rate_limit_async_releases_on_error() -> None:
+    @with_rate_limit("test-async")
+    async def boom() -> None:
+        raise ValueError("boom")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            await boom()
+    limiter = get_rate_limiter("test-async")
+    assert limiter.acquire(blocking=False)
+    limiter.release()
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from agentkit.infra import tracing
+from agentkit.infra.tracing import JsonlSpanExporter, current_span, span, start_span, traced
+
+
+@pytest.fixture
+def trace_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonlSpanExporter(path)
+    monkeypatch.setattr(tracing, "get_span_exporter", lambda: exporter)
+    return path
+
+
+def read_spans(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_nested_spans_share_trace_and_link_parents(trace_file: Path) -> None:
+    with span("outer", run_id="r1") as outer:
+        with span("inner") as inner:
+            inner.set_attribute("results", 3)
+            assert current_span() is inner
+        assert current_span() is outer
+
+    inner_record, outer_record = read_spans(trace_file)
+    assert inner_record["name"] == "inner"
+    assert inner_record["parent_id"] == outer_record["span_id"]
+    assert inner_record["trace_id"] == outer_record["trace_id"]
+    assert outer_record["parent_id"] is None
+    assert outer_record["attributes"] == {"run_id": "r1"}
+    assert inner_record["attributes"] == {"results": 3}
+    assert outer_record["duration_ms"] >= inner_record["duration_ms"]
+
+
+def test_span_records_errors(trace_file: Path) -> None:
+    with pytest.raises(ValueError), span("failing"):
+        raise ValueError("boom")
+
+    (record,) = read_spans(trace_file)
+    assert record["status"] == "error"
+    assert record["error"] == "ValueError: boom"
+
+
+async def test_traced_async_function_parents_child_spans(trace_file: Path) -> None:
+    @traced("work", kind="test")
+    async def work() -> str:
+        with span("step"):
+            pass
+        return "done"
+
+    assert await work() == "done"
+
+    step, parent = read_spans(trace_file)
+    assert parent["name"] == "work"
+    assert parent["attributes"] == {"kind": "test"}
+    assert step["parent_id"] == parent["span_id"]
+
+
+def test_start_span_accepts_an_explicit_parent(trace_file: Path) -> None:
+    root = start_span("root")
+    child = start_span("child", parent=root)
+    child.end()
+    root.end()
+
+    child_record, root_record = read_spans(trace_file)
+    assert child_record["parent_id"] == root_record["span_id"]
+
+
+def test_tracing_is_a_no_op_without_a_trace_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tracing, "get_span_exporter", lambda: None)
+
+    @traced()
+    def work() -> int:
+        current_span().set_attribute("ignored", True)
+        return 1
+
+    with span("outer") as outer:
+        assert work() == 1
+    assert outer.attributes == {}
+    assert current_span() is outer
@@ -0,0 +1,40 @@
+from agentkit.services.bm25 import BM25Index, tokenize
+
+
+def test_tokenize_drops_punctuation() -> None:
+    assert tokenize("Toast's churn: 4.5%") == ["toast", "s", "churn", "4", "5"]
+
+
+def test_rare_terms_outweigh_common_ones() -> None:
+    index = BM25Index()
+    index.add("a", "restaurant software market")
+    index.add("b", "restaurant software churn")
+    index.add("c", "restaurant payments")
+
+    ranked = [doc_id for doc_id, _ in index.search("restaurant churn")]
+    assert ranked[0] == "b"
+    assert set(ranked) == {"a", "b", "c"}
+
+
+def test_readding_a_doc_replaces_its_postings() -> None:
+    index = BM25Index()
+    index.add("a", "old text about pizza")
+    index.add("a", "new text about tacos")
+
+    assert len(index) == 1
+    assert index.search("pizza") == []
+    assert [doc_id for doc_id, _ in index.search("tacos")] == ["a"]
+
+    index.remove("a")
+    assert "a" not in index
+    assert index.search("tacos") == []
+
+
+def test_search_returns_top_k_in_score_order() -> None:
+    index = BM25Index()
+    for i in range(1, 6):
+        index.add(str(i), " ".join(["signal"] * i + ["noise"] * (10 - i)))
+
+    results = index.search("signal", k=2)
+    assert [doc_id for doc_id, _ in results] == ["5", "4"]
+    assert results[0][1] > results[1][1]
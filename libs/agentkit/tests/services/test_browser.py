@@ -0,0 +1,144 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from agentkit.services.browser import BrowserPool, _block_heavy_resources
+
+
+class FakePage:
+    def __init__(self, tracker: dict[str, Any]) -> None:
+        self.tracker = tracker
+        self.url = ""
+
+    async def goto(self, url: str, wait_until: str, timeout: float) -> None:
+        self.tracker["in_flight"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["in_flight"])
+        self.tracker["wait_until"] = wait_until
+        await asyncio.sleep(0.01)
+        self.tracker["in_flight"] -= 1
+        if "fail" in url:
+            raise RuntimeError("navigation failed")
+        self.url = url
+
+    async def content(self) -> str:
+        return f"<html><body>{self.url}</body></html>"
+
+
+class FakeContext:
+    def __init__(self, tracker: dict[str, Any]) -> None:
+        self.tracker = tracker
+        self.route = AsyncMock()
+        self.close = AsyncMock()
+
+    async def new_page(self) -> FakePage:
+        return FakePage(self.tracker)
+
+
+def fake_playwright(tracker: dict[str, Any]) -> MagicMock:
+    async def new_context() -> FakeContext:
+        tracker["contexts"] += 1
+        return FakeContext(tracker)
+
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.new_context = new_context
+    browser.close = AsyncMock()
+
+    async def launch(headless: bool) -> MagicMock:
+        tracker["launches"] += 1
+        return browser
+
+    playwright = MagicMock()
+    playwright.chromium.launch = launch
+    playwright.stop = AsyncMock()
+
+    module = MagicMock()
+    module.async_playwright.return_value.start = AsyncMock(return_value=playwright)
+    return module
+
+
+@pytest.fixture
+def tracker() -> Any:
+    counts = {"launches": 0, "contexts": 0, "in_flight": 0, "peak": 0}
+    with patch.dict(sys.modules, {"playwright.async_api": fake_playwright(counts)}):
+        yield counts
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_launches_once_and_bounds_contexts(tracker: dict[str, Any]) -> None:
+    pool = BrowserPool(max_contexts=2)
+    pages = await asyncio.gather(*(pool.fetch(f"https://example.com/{i}") for i in range(6)))
+    await pool.aclose()
+
+    assert pages[3] == "<html><body>https://example.com/3</body></html>"
+    assert tracker["launches"] == 1
+    assert tracker["contexts"] == 2
+    assert tracker["peak"] == 2
+    assert tracker["wait_until"] == "domcontentloaded"
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_discards_failed_context(tracker: dict[str, Any]) -> None:
+    pool = BrowserPool(max_contexts=1)
+    with pytest.raises(RuntimeError):
+        await pool.fetch("https://example.com/fail")
+    await pool.fetch("https://example.com/ok")
+    await pool.aclose()
+
+    assert tracker["contexts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_stops_playwright_before_relaunching(tracker: dict[str, Any]) -> None:
+    pool = BrowserPool(max_contexts=1)
+    await pool.fetch("https://example.com/1")
+    first = await pool._state()
+    first.browser.is_connected.return_value = False
+    first.playwright.stop.side_effect = RuntimeError("driver already gone")
+
+    await pool.fetch("https://example.com/2")
+
+    assert tracker["launches"] == 2
+    first.playwright.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_closes_context_on_cancellation(tracker: dict[str, Any]) -> None:
+    pool = BrowserPool(max_contexts=1)
+    contexts: list[FakeContext] = []
+    original = pool._new_slot
+
+    async def new_slot(browser: Any) -> Any:
+        slot = await original(browser)
+        contexts.append(slot[0])
+        return slot
+
+    with patch.object(pool, "_new_slot", new_slot):
+        task = asyncio.create_task(pool.fetch("https://example.com/slow"))
+        await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await pool.fetch("https://example.com/ok")
+    await pool.aclose()
+
+    contexts[0].close.assert_awaited_once()
+    assert tracker["contexts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_block_heavy_resources() -> None:
+    image = SimpleNamespace(request=SimpleNamespace(resource_type="image"), abort=AsyncMock(), continue_=AsyncMock())
+    document = SimpleNamespace(
+        request=SimpleNamespace(resource_type="document"), abort=AsyncMock(), continue_=AsyncMock()
+    )
+
+    await _block_heavy_resources(image)
+    await _block_heavy_resources(document)
+
+    image.abort.assert_awaited_once()
+    document.continue_.assert_awaited_once()
+    document.abort.assert_not_awaited()
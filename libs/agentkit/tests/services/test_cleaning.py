@@ -0,0 +1,48 @@
+import pytest
+from agentkit.infra.metrics import get_metrics
+from agentkit.services.cleaning import CleaningPool, clean_html
+
+ARTICLE = (
+    "<html><head><script>var tracking = 1;</script></head><body><nav>Home | About</nav>"
+    "<article><h1>Pricing</h1>"
+    + "<p>The starter plan costs ten dollars per month for small teams.</p>" * 20
+    + "</article></body></html>"
+)
+LABEL = "agentkit.services.cleaning.clean_html"
+
+
+def test_clean_html_keeps_the_article_text() -> None:
+    text = clean_html(ARTICLE)
+
+    assert "The starter plan costs ten dollars" in text
+    assert "tracking" not in text
+
+
+@pytest.mark.asyncio
+async def test_pool_cleans_in_a_worker_process_and_records_timings() -> None:
+    pool = CleaningPool(max_workers=1)
+    before = get_metrics().percentiles("cleaning_parse_seconds", LABEL)["count"]
+    try:
+        text = await pool.run(clean_html, ARTICLE)
+    finally:
+        pool.shutdown()
+
+    assert text == clean_html(ARTICLE)
+    assert get_metrics().percentiles("cleaning_parse_seconds", LABEL)["count"] == before + 1
+    assert get_metrics().percentiles("cleaning_queue_wait_seconds", LABEL)["count"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_pool_caps_input_size() -> None:
+    seen: list[str] = []
+
+    def cleaner(html: str) -> str:
+        seen.append(html)
+        return html
+
+    pool = CleaningPool(max_workers=0, max_input_chars=10)
+    label = f"{__name__}.{cleaner.__qualname__}"
+
+    assert await pool.run(cleaner, "x" * 50) == "x" * 10
+    assert await pool.run(cleaner, "short") == "short"
+    assert get_metrics().counter("cleaning_truncated_total", label) == 1
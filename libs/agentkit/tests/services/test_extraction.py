@@ -1,20 +1,20 @@
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
-from agentkit.services.extraction import ExtractionService
+import respx
+from agentkit.services.extraction import ExtractionService, extract_content, extract_text
+from agentkit.services.http import HttpClientPool
 
 
 @pytest.mark.asyncio
-@patch("agentkit.services.extraction.httpx.AsyncClient")
-async def test_extraction_service_http_fallback(mock_client: AsyncMock) -> None:
+@respx.mock
+async def test_extraction_service_http_fallback() -> None:
     # Mock HTTP response
-    mock_response = AsyncMock()
-    mock_response.text = "<html><body><h1>Title</h1><p>Main content here...</p></body></html>"
-    mock_response.raise_for_status = AsyncMock()
+    html = "<html><body><h1>Title</h1><p>Main content here...</p></body></html>"
+    respx.get("http://example.com").mock(return_value=httpx.Response(200, text=html))
 
-    mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
-
-    service = ExtractionService()
+    service = ExtractionService(http_pool=HttpClientPool())
     result = await service.extract("http://example.com", use_playwright=False)
 
     assert "Title" in result
@@ -31,3 +31,48 @@ async def test_extraction_service_playwright(mock_playwright: AsyncMock) -> None
 
     assert "Dynamic Content" in result
     mock_playwright.assert_called_once()
+
+
+PARAGRAPH = "<p>The starter plan costs ten dollars per month, billed annually, for up to five people.</p>"
+ARTICLE_PAGE = "".join(
+    [
+        "<html><head><title> Pricing | Acme </title><style>p { color: red }</style></head><body>",
+        "<nav class='menu'><a href='/'>Home</a> <a href='/about'>About</a></nav>",
+        "<div id='sidebar'><p>Subscribe to our newsletter for weekly updates, deals and news.</p></div>",
+        "<div class='post-content'><h1>Acme pricing</h1>",
+        PARAGRAPH * 8,
+        "<p>Contact <b>sales</b> for enterprise.</p></div>",
+        "<footer>Copyright 2026</footer></body></html>",
+    ]
+)
+
+
+def test_extract_content_separates_main_content_from_page_chrome() -> None:
+    result = extract_content(ARTICLE_PAGE)
+
+    assert result.title == "Pricing | Acme"
+    assert result.summary.startswith("Acme pricing\nThe starter plan")
+    assert result.summary.endswith("Contact sales for enterprise.")
+    assert "newsletter" not in result.summary and "Copyright" not in result.summary
+    assert "Home About" in result.full_text and "Copyright 2026" in result.full_text
+    assert "color: red" not in result.full_text
+    assert result.text() == result.summary
+
+
+def test_extract_text_falls_back_to_full_text_for_sparse_pages() -> None:
+    html = "<html><body><script>alert(1)</script><h1>Title</h1><p>Main content paragraph.</p></body></html>"
+
+    assert extract_text(html) == "Title\nMain content paragraph."
+    assert extract_text("") == ""
+    assert extract_text('<?xml version="1.0" encoding="utf-8"?><html><body>Café</body></html>') == "Café"
+
+
+@pytest.mark.parametrize(
+    "attrs", ["class='shareholder-letter'", "id='downloads'", "class='leads'", "id='canvas'", "class='theme-navy'"]
+)
+def test_boilerplate_names_only_match_whole_tokens(attrs: str) -> None:
+    html = f"<html><body><div {attrs}>{PARAGRAPH * 4}</div><div class='share-buttons'>Tweet this</div></body></html>"
+
+    summary = extract_content(html).summary
+    assert summary.startswith("The starter plan")
+    assert "Tweet this" not in summary
@@ -0,0 +1,108 @@
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+import respx
+from agentkit.infra.metrics import get_metrics
+from agentkit.services import fetch
+from agentkit.services.fetch import fetch_document, sniff_kind
+from agentkit.services.http import HttpClientPool
+
+
+class ChunkedBody:
+    """Async response body that records how many chunks were pulled from it."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.read = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+@pytest.mark.parametrize(
+    ("content_type", "head", "kind"),
+    [
+        ("text/html; charset=utf-8", b"<html><body>", "html"),
+        ("text/plain", b"<!DOCTYPE html><html>", "html"),
+        ("text/plain", b"Plain words", "text"),
+        ("application/json", b'{"a": 1}', "text"),
+        ("application/pdf", b"", "pdf"),
+        ("application/octet-stream", b"%PDF-1.7\n", "pdf"),
+        ("", b"  <html lang='en'>", "html"),
+        ("application/octet-stream", b"\x89PNG\r\n\x1a\n\x00\x00", "skipped"),
+        ("", b"\xff\xd8\xff\xe0" * 10, "skipped"),
+        ("image/png", b"\x89PNG", "skipped"),
+        ("application/zip", b"PK\x03\x04", "skipped"),
+    ],
+)
+def test_sniff_kind(content_type: str, head: bytes, kind: str) -> None:
+    assert sniff_kind(content_type, head) == kind
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_stops_reading_at_the_byte_cap() -> None:
+    body = ChunkedBody([b"<html><body>" + b"a" * 988] + [b"a" * 1000] * 99)
+    respx.get("https://example.com/huge").mock(
+        return_value=httpx.Response(200, headers={"Content-Type": "text/html"}, content=body)
+    )
+
+    document = await fetch_document("https://example.com/huge", HttpClientPool(), max_bytes=2500)
+
+    assert document.kind == "html"
+    assert document.truncated
+    assert len(document.text) == 2500
+    assert document.bytes_read == 3000
+    assert body.read == 3
+    assert get_metrics().counter("fetch_bytes_total", "example.com") >= 3000
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_skips_binary_after_the_first_chunk() -> None:
+    body = ChunkedBody([b"\x89PNG\r\n\x1a\n" + b"\x00" * 1000] * 50)
+    respx.get("https://example.com/logo").mock(
+        return_value=httpx.Response(200, headers={"Content-Type": "image/png"}, content=body)
+    )
+
+    document = await fetch_document("https://example.com/logo", HttpClientPool(), max_bytes=10_000_000)
+
+    assert document.kind == "skipped"
+    assert document.text == ""
+    assert body.read == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_routes_pdfs_to_the_text_extractor(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(fetch, "pdf_to_text", lambda data: f"{len(data)} bytes of PDF text")
+    respx.get("https://example.com/report").mock(
+        return_value=httpx.Response(
+            200, headers={"Content-Type": "application/octet-stream"}, content=b"%PDF-1.7" * 100
+        )
+    )
+
+    document = await fetch_document("https://example.com/report", HttpClientPool())
+
+    assert document.kind == "pdf"
+    assert document.text == "800 bytes of PDF text"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_skips_oversized_pdfs_without_reading_them() -> None:
+    body = ChunkedBody([b"%PDF-1.7" + b"x" * 1000] * 10)
+    respx.get("https://example.com/big.pdf").mock(
+        return_value=httpx.Response(
+            200, headers={"Content-Type": "application/pdf", "Content-Length": "10080"}, content=body
+        )
+    )
+
+    document = await fetch_document("https://example.com/big.pdf", HttpClientPool(), max_bytes=5000)
+
+    assert document.kind == "skipped"
+    assert document.truncated
+    assert body.read == 0
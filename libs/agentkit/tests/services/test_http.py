@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from agentkit.services.http import HttpClientPool, get_http_pool
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_client_within_loop() -> None:
+    pool = HttpClientPool()
+    try:
+        assert pool.client is pool.client
+    finally:
+        await pool.aclose()
+
+
+def test_pool_creates_client_per_loop() -> None:
+    pool = HttpClientPool()
+
+    async def grab() -> httpx.AsyncClient:
+        client = pool.client
+        await pool.aclose()
+        return client
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+    assert first is not second
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_pool_get() -> None:
+    respx.get("https://example.com/page").mock(return_value=httpx.Response(200, text="ok"))
+    pool = HttpClientPool()
+    try:
+        response = await pool.get("https://example.com/page")
+        assert response.text == "ok"
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_pool_per_host_limit() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def slow_response(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, text="ok")
+
+    respx.get(url__startswith="https://sec.gov/").mock(side_effect=slow_response)
+    pool = HttpClientPool(max_connections_per_host=2)
+    try:
+        await asyncio.gather(*(pool.get(f"https://sec.gov/{i}") for i in range(6)))
+    finally:
+        await pool.aclose()
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_http2_without_h2_falls_back() -> None:
+    pool = HttpClientPool(http2=True)
+    try:
+        assert isinstance(pool.client, httpx.AsyncClient)
+    finally:
+        await pool.aclose()
+
+
+def test_get_http_pool_singleton() -> None:
+    assert get_http_pool() is get_http_pool()
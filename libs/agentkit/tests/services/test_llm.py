@@ -1,7 +1,24 @@
+import json
 import os
+from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
-from agentkit.services.llm import create_llm
+import httpx
+import httpx2
+import openai
+import pytest
+from agentkit.infra import circuit_breaker, rate_limit, tracing
+from agentkit.infra.cache import SQLiteCache
+from agentkit.infra.circuit_breaker import CircuitBreaker, CircuitOpenError
+from agentkit.infra.config import get_settings
+from agentkit.infra.rate_limit import AdaptiveRateLimiter
+from agentkit.infra.tracing import JsonlSpanExporter, span
+from agentkit.services.llm import TracingCallbackHandler, create_llm
+from agentkit.services.llm_cache import LLMResponseCache, SemanticLLMCache, llm_cache_stats
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
 from langchain_openai import ChatOpenAI
 from pydantic import SecretStr
 
@@ -19,3 +36,171 @@ def test_create_llm_default() -> None:
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
         llm = create_llm()
         assert isinstance(llm, ChatOpenAI)
+
+
+def test_open_openai_circuit_fails_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    breaker = CircuitBreaker("openai", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    monkeypatch.setitem(circuit_breaker._breakers, "openai", breaker)
+
+    llm = create_llm(model="gpt-4o", openai_api_key="test-key", cache=False, semantic_cache=False)
+    with pytest.raises(CircuitOpenError):
+        llm.invoke("hello")
+
+
+def test_openai_429_throttles_the_shared_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = AdaptiveRateLimiter(rate=1000, burst=100, max_concurrency=8)
+    monkeypatch.setitem(rate_limit._limiters, "openai", limiter)
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after-ms": "10"}, request=request)
+    rate_limited = openai.RateLimitError("slow down", response=response, body=None)  # type: ignore[arg-type]
+    in_flight: list[int] = []
+
+    def generate(self: ChatOpenAI, messages: Any, *args: Any, **kwargs: Any) -> ChatResult:
+        in_flight.append(limiter._in_flight)
+        if len(in_flight) == 1:
+            raise rate_limited
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", generate)
+    llm = create_llm(model="gpt-4o", openai_api_key="test-key", cache=False)
+
+    assert llm.invoke("hello").content == "ok"
+    assert in_flight == [1, 1]
+    assert limiter.throttled_count == 1
+    assert limiter.concurrency < 8
+    assert limiter._in_flight == 0
+
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+}
+
+
+def test_openai_429_reaches_the_shared_limiter_not_the_client_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = AdaptiveRateLimiter(rate=1000, burst=100, max_concurrency=8)
+    monkeypatch.setitem(rate_limit._limiters, "openai", limiter)
+    throttles: list[float | None] = []
+    throttle = limiter.throttle
+
+    def record_throttle(retry_after: float | None = None, slot: bool = True) -> None:
+        throttles.append(retry_after)
+        throttle(retry_after, slot)
+
+    monkeypatch.setattr(limiter, "throttle", record_throttle)
+    responses = [httpx2.Response(429, headers={"retry-after-ms": "10"}, json={}), httpx2.Response(200, json=COMPLETION)]
+    requests: list[httpx2.Request] = []
+
+    def handler(request: httpx2.Request) -> httpx2.Response:
+        requests.append(request)
+        return responses[len(requests) - 1]
+
+    # The OpenAI SDK talks to the API through its own httpx fork, so respx cannot intercept it.
+    http_client = openai.DefaultHttpxClient(transport=httpx2.MockTransport(handler))
+    llm = create_llm(model="gpt-4o", openai_api_key="test-key", cache=False, http_client=http_client)
+
+    assert llm.invoke("hello").content == "ok"
+    assert throttles == [0.01]
+    assert len(requests) == 2
+
+
+def test_openai_outage_trips_the_breaker_after_one_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    breaker = CircuitBreaker("openai", failure_threshold=1, reset_timeout=60)
+    monkeypatch.setitem(circuit_breaker._breakers, "openai", breaker)
+    requests: list[httpx2.Request] = []
+
+    def handler(request: httpx2.Request) -> httpx2.Response:
+        requests.append(request)
+        return httpx2.Response(503, json={"error": {"message": "overloaded"}})
+
+    http_client = openai.DefaultHttpxClient(transport=httpx2.MockTransport(handler))
+    llm = create_llm(model="gpt-4o", openai_api_key="test-key", cache=False, http_client=http_client)
+
+    with pytest.raises(openai.InternalServerError):
+        llm.invoke("hello")
+    with pytest.raises(CircuitOpenError):
+        llm.invoke("hello")
+    assert len(requests) == 1
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def _fake_chat(responses: list[str]) -> GenericFakeChatModel:
+    return GenericFakeChatModel(messages=iter(AIMessage(content=r) for r in responses))
+
+
+def test_llm_response_cache_roundtrip(tmp_path: Path) -> None:
+    cache = LLMResponseCache(SQLiteCache(tmp_path / "llm.sqlite"), namespace="planner")
+    llm = _fake_chat(["first answer", "second answer"])
+    llm.cache = cache
+
+    assert llm.invoke("What is Toast's churn?").content == "first answer"
+    assert llm.invoke("What is Toast's churn?").content == "first answer"
+    assert llm.invoke("A different prompt").content == "second answer"
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_tracing_handler_records_llm_spans(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    exporter = JsonlSpanExporter(tmp_path / "traces.jsonl")
+    monkeypatch.setattr(tracing, "get_span_exporter", lambda: exporter)
+    llm = _fake_chat(["answer"])
+    llm.callbacks = [TracingCallbackHandler("planner")]
+
+    with span("node.planner"):
+        llm.invoke("hello")
+
+    llm_span, node_span = (json.loads(line) for line in exporter.path.read_text().splitlines())
+    assert llm_span["name"] == "llm"
+    assert llm_span["parent_id"] == node_span["span_id"]
+    assert llm_span["attributes"]["namespace"] == "planner"
+
+
+def test_llm_response_cache_persists_tool_calls(tmp_path: Path) -> None:
+    store = SQLiteCache(tmp_path / "llm.sqlite")
+    message = AIMessage(content="", tool_calls=[{"name": "Plan", "args": {"action": "research"}, "id": "call_1"}])
+    LLMResponseCache(store).update("prompt", "llm", [ChatGeneration(message=message)])
+
+    cached = LLMResponseCache(store).lookup("prompt", "llm")
+    assert cached is not None
+    generation = cached[0]
+    assert isinstance(generation, ChatGeneration)
+    assert isinstance(generation.message, AIMessage)
+    assert generation.message.tool_calls[0]["args"] == {"action": "research"}
+
+
+def test_create_llm_cache_opt_in(tmp_path: Path) -> None:
+    with patch.dict(os.environ, {"LLM_CACHE_PATH": str(tmp_path / "llm.sqlite")}):
+        get_settings.cache_clear()
+        try:
+            deterministic = create_llm(model="gpt-4o", openai_api_key="test-key", cache_namespace="writer")
+            creative = create_llm(model="gpt-4o", openai_api_key="test-key", temperature=0.7)
+        finally:
+            get_settings.cache_clear()
+
+    assert isinstance(deterministic.cache, LLMResponseCache)
+    assert deterministic.cache.namespace == "writer"
+    assert "writer" in llm_cache_stats()
+    assert creative.cache is None
+
+
+def test_create_llm_semantic_cache_is_opt_in(tmp_path: Path) -> None:
+    with patch.dict(os.environ, {"LLM_SEMANTIC_CACHE_DIR": str(tmp_path / "semantic")}):
+        get_settings.cache_clear()
+        try:
+            default = create_llm(model="gpt-4o", openai_api_key="test-key", cache=False)
+            opted_in = create_llm(model="gpt-4o", openai_api_key="test-key", semantic_cache=True)
+        finally:
+            get_settings.cache_clear()
+
+    assert default.cache is None
+    assert isinstance(opted_in.cache, SemanticLLMCache)
+
+
+def test_create_llm_cache_requires_path() -> None:
+    with pytest.raises(ValueError, match="LLM_CACHE_PATH"):
+        create_llm(model="gpt-4o", openai_api_key="test-key", cache=True)
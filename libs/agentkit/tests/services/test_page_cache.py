@@ -0,0 +1,108 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import respx
+from agentkit.services.extraction import ExtractionService
+from agentkit.services.fetch import FetchedDocument
+from agentkit.services.http import HttpClientPool
+from agentkit.services.page_cache import CachedPage, PageCache, canonical_url, fetch_page
+
+HTML = "<html><body><h1>Pricing</h1><p>Starter plan is $69 per month.</p></body></html>"
+
+
+def test_canonical_url() -> None:
+    assert (
+        canonical_url("HTTPS://Example.com:443/pricing?b=2&utm_source=x&a=1#plans")
+        == "https://example.com/pricing?a=1&b=2"
+    )
+    assert canonical_url("http://example.com") == "http://example.com/"
+    assert canonical_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+def test_page_cache_dedupes_by_content(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path / "pages.sqlite")
+    first = cache.put("https://a.com/page", HTML, etag='"v1"')
+    second = cache.put("https://mirror.com/page", HTML)
+
+    assert first.content_hash == second.content_hash
+    assert cache._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 1
+
+    cached = cache.get("https://a.com/page?utm_campaign=spring")
+    assert cached is not None
+    assert cached.etag == '"v1"'
+    assert cached.html == HTML
+
+
+def test_page_cache_eviction(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path / "pages.sqlite", max_bytes=len(HTML) + 10)
+    cache.put("https://a.com/old", HTML)
+    cache.set_text(cache.get("https://a.com/old").content_hash, "test", "text")  # type: ignore[union-attr]
+    cache.put("https://a.com/new", HTML.replace("$69", "$99"))
+
+    assert cache.get("https://a.com/old") is None
+    assert cache.get("https://a.com/new") is not None
+    assert cache._conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0] == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_page_revalidates_with_304(tmp_path: Path) -> None:
+    url = "https://vendor.com/pricing"
+    route = respx.get(url)
+    route.side_effect = [
+        httpx.Response(200, text=HTML, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        httpx.Response(304),
+    ]
+    cache = PageCache(tmp_path / "pages.sqlite")
+    pool = HttpClientPool()
+    try:
+        first = await fetch_page(url, cache, pool)
+        second = await fetch_page(url, cache, pool)
+    finally:
+        await pool.aclose()
+
+    assert isinstance(first, CachedPage) and isinstance(second, CachedPage)
+    assert second.html == first.html == HTML
+    revalidation = route.calls[1].request
+    assert revalidation.headers["If-None-Match"] == '"v1"'
+    assert revalidation.headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_page_does_not_cache_non_html(tmp_path: Path) -> None:
+    url = "https://vendor.com/logo.png"
+    respx.get(url).mock(
+        return_value=httpx.Response(200, headers={"Content-Type": "image/png"}, content=b"\x89PNG" + b"\x00" * 5000)
+    )
+    cache = PageCache(tmp_path / "pages.sqlite")
+    pool = HttpClientPool()
+    try:
+        result = await fetch_page(url, cache, pool)
+    finally:
+        await pool.aclose()
+
+    assert isinstance(result, FetchedDocument)
+    assert result.kind == "skipped"
+    assert cache.get(url) is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_extraction_service_reuses_cleaned_text(tmp_path: Path) -> None:
+    url = "https://vendor.com/pricing"
+    respx.get(url).side_effect = [
+        httpx.Response(200, text=HTML, headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+    ]
+    service = ExtractionService(http_pool=HttpClientPool(), page_cache=PageCache(tmp_path / "pages.sqlite"))
+
+    with patch.object(service, "_clean_html", AsyncMock(return_value="Pricing\nStarter plan")) as clean:
+        assert await service.extract(url) == "Pricing\nStarter plan"
+        assert await service.extract(url) == "Pricing\nStarter plan"
+
+    clean.assert_awaited_once()
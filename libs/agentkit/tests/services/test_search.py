@@ -1,9 +1,20 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from agentkit.infra import rate_limit
+from agentkit.infra.cache import SQLiteCache
+from agentkit.infra.rate_limit import AdaptiveRateLimiter
 from agentkit.services.search import TavilySearchService
 
 
+@pytest.fixture(autouse=True)
+def unthrottled_tavily(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(rate_limit._limiters, "tavily", AdaptiveRateLimiter(rate=1000, burst=100, max_concurrency=100))
+
+
 @patch("agentkit.services.search.TavilyClient")
 def test_search_service(mock_tavily: MagicMock) -> None:
     mock_instance = mock_tavily.return_value
@@ -19,7 +30,118 @@ def test_search_service(mock_tavily: MagicMock) -> None:
 
 @patch("agentkit.services.search.get_settings")
 def test_search_service_no_key(mock_get_settings: MagicMock) -> None:
-    mock_get_settings.return_value = MagicMock(tavily_api_key=None)
+    mock_get_settings.return_value = MagicMock(tavily_api_key=None, search_cache_path=None)
     with pytest.raises(ValueError, match="TAVILY_API_KEY"):
         service = TavilySearchService(api_key=None)
         service.search("query")
+
+
+@patch("agentkit.services.search.TavilyClient")
+def test_search_service_reuses_client(mock_tavily: MagicMock) -> None:
+    mock_tavily.return_value.search.return_value = {"results": []}
+
+    service = TavilySearchService(api_key="test-key")
+    service.search("first")
+    service.search("second")
+
+    mock_tavily.assert_called_once_with(api_key="test-key")
+
+
+@pytest.mark.asyncio
+@patch("agentkit.services.search.AsyncTavilyClient")
+async def test_asearch_uses_async_client(mock_tavily: MagicMock) -> None:
+    mock_tavily.return_value.search = AsyncMock(return_value={"results": [{"content": "async"}]})
+
+    service = TavilySearchService(api_key="test-key")
+    results = await service.asearch("query")
+    await service.asearch("again")
+
+    assert results == [{"content": "async"}]
+    mock_tavily.assert_called_once_with(api_key="test-key")
+    mock_tavily.return_value.search.assert_awaited_with(query="again", search_depth="advanced")
+
+
+@pytest.mark.asyncio
+@patch("agentkit.services.search.AsyncTavilyClient")
+async def test_hedged_search_takes_a_limiter_token_per_request(
+    mock_tavily: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    limiter = rate_limit._limiters["tavily"]
+    acquisitions: list[bool] = []
+    aacquire = limiter.aacquire
+
+    async def counting_aacquire(slot: bool = True, blocking: bool = True) -> bool:
+        acquisitions.append(slot)
+        return await aacquire(slot, blocking)
+
+    monkeypatch.setattr(limiter, "aacquire", counting_aacquire)
+    stalled = asyncio.Event()
+
+    async def search(query: str, search_depth: str) -> dict[str, Any]:
+        if query == "slow" and not stalled.is_set():
+            stalled.set()
+            await asyncio.sleep(10)
+        return {"results": [{"content": query}]}
+
+    mock_tavily.return_value.search = search
+    service = TavilySearchService(api_key="test-key", max_concurrency=5)
+    for i in range(20):  # Enough latency samples for hedging to kick in.
+        await service.asearch(f"warm-up {i}")
+    acquisitions.clear()
+
+    assert await service.asearch("slow") == [{"content": "slow"}]
+    assert acquisitions == [True, True]
+
+
+@pytest.mark.asyncio
+@patch("agentkit.services.search.AsyncTavilyClient")
+async def test_search_many_bounded_and_ordered(mock_tavily: MagicMock) -> None:
+    in_flight = 0
+    peak = 0
+
+    async def fake_search(query: str, search_depth: str) -> dict[str, Any]:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            # Later queries finish first to prove ordering does not follow completion.
+            await asyncio.sleep(0.01 * (5 - int(query)))
+        finally:  # A losing hedge attempt is cancelled.
+            in_flight -= 1
+        return {"results": [{"content": query}]}
+
+    mock_tavily.return_value.search = fake_search
+
+    service = TavilySearchService(api_key="test-key", max_concurrency=2)
+    results = await service.search_many([str(i) for i in range(5)])
+
+    assert [r[0]["content"] for r in results] == ["0", "1", "2", "3", "4"]
+    assert peak == 2
+
+
+@patch("agentkit.services.search.TavilyClient")
+def test_search_service_cache_hit(mock_tavily: MagicMock, tmp_path: Path) -> None:
+    mock_tavily.return_value.search.return_value = {"results": [{"content": "cached"}]}
+    cache = SQLiteCache(tmp_path / "search.sqlite")
+
+    service = TavilySearchService(api_key="test-key", cache=cache)
+    first = service.search("Toast POS  churn rate")
+    second = service.search("  toast pos churn RATE")
+    service.search("toast pos churn rate", search_depth="basic")
+
+    assert first == second == [{"content": "cached"}]
+    assert mock_tavily.return_value.search.call_count == 2
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+@patch("agentkit.services.search.AsyncTavilyClient")
+async def test_asearch_cache_hit(mock_tavily: MagicMock, tmp_path: Path) -> None:
+    mock_tavily.return_value.search = AsyncMock(return_value={"results": [{"content": "async"}]})
+    service = TavilySearchService(api_key="test-key", cache=SQLiteCache(tmp_path / "search.sqlite"))
+
+    await service.asearch("query")
+    assert await service.asearch("query") == [{"content": "async"}]
+
+    mock_tavily.return_value.search.assert_awaited_once()
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import numpy as np
+from agentkit.services.llm_cache import SemanticLLMCache
+from agentkit.services.semantic_cache import HashingEmbedder, SemanticCache
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+
+def test_hashing_embedder_normalised() -> None:
+    vectors = HashingEmbedder(dim=64)(["Toast POS churn rate", ""])
+    assert vectors.shape == (2, 64)
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+    assert not vectors[1].any()
+
+
+def test_semantic_cache_hits_paraphrase() -> None:
+    cache = SemanticCache(threshold=0.8)
+    cache.update("What is the annual churn rate of Toast POS restaurants?", "about 20%")
+
+    assert cache.lookup("what is the annual churn rate of toast pos restaurants") == "about 20%"
+    assert cache.lookup("Market size of pet insurance in Europe") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_semantic_cache_respects_partitions() -> None:
+    cache = SemanticCache(threshold=0.9)
+    cache.update("Summarise the market", "gpt-4o answer", partition="gpt-4o")
+
+    assert cache.lookup("Summarise the market", partition="gpt-4o-mini") is None
+    assert cache.lookup("Summarise the market", partition="gpt-4o") == "gpt-4o answer"
+
+
+def test_semantic_cache_lru_eviction() -> None:
+    cache = SemanticCache(threshold=0.99, max_entries=2)
+    cache.update("alpha beta", 1)
+    cache.update("gamma delta", 2)
+    cache.lookup("alpha beta")
+    cache.update("epsilon zeta", 3)
+
+    assert len(cache) == 2
+    assert cache.lookup("gamma delta") is None
+    assert cache.lookup("alpha beta") == 1
+    assert cache.stats.evictions == 1
+
+
+def test_semantic_cache_persistence(tmp_path: Path) -> None:
+    cache = SemanticCache(persist_dir=tmp_path, save_every=1)
+    cache.update("Toast POS pricing", {"answer": "$69/month"})
+
+    reloaded = SemanticCache(persist_dir=tmp_path)
+    assert len(reloaded) == 1
+    assert reloaded.lookup("Toast POS pricing") == {"answer": "$69/month"}
+
+
+def test_semantic_llm_cache_with_chat_model() -> None:
+    cache = SemanticLLMCache(SemanticCache(threshold=0.9), namespace="critic")
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="cached verdict"), AIMessage(content="fresh")]))
+    llm.cache = cache
+
+    assert llm.invoke("Critique this memo about Toast POS.").content == "cached verdict"
+    assert llm.invoke("Critique this memo about Toast POS").content == "cached verdict"
+    assert cache.stats.hits == 1
+
+
+def test_semantic_cache_close_saves_pending_entries_and_clear_deletes_them(tmp_path: Path) -> None:
+    cache = SemanticCache(persist_dir=tmp_path)
+    for i in range(40):
+        cache.update(f"question number {i} about restaurant software", i)
+    cache.close()
+
+    reloaded = SemanticCache(persist_dir=tmp_path)
+    assert len(reloaded) == 40
+    assert reloaded.lookup("question number 37 about restaurant software") == 37
+
+    reloaded.clear()
+    assert len(reloaded) == 0
+    assert reloaded.lookup("question number 37 about restaurant software") is None
+    assert not (tmp_path / "entries.json").exists()
+
+
+def test_semantic_llm_cache_ignores_shared_template() -> None:
+    template = "You are a venture analyst. Score the idea on market, team, moat and timing. " * 30
+    cache = SemanticLLMCache(SemanticCache(threshold=0.9))
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="pos verdict"), AIMessage(content="drone verdict")]))
+    llm.cache = cache
+
+    first = llm.invoke([SystemMessage(template), HumanMessage("Restaurant POS software for small diners")])
+    second = llm.invoke([SystemMessage(template), HumanMessage("Drone delivery for rural pharmacies")])
+    third = llm.invoke([SystemMessage(template), HumanMessage("Restaurant POS software for small diners.")])
+
+    assert (first.content, second.content, third.content) == ("pos verdict", "drone verdict", "pos verdict")
+    assert cache.stats.hits == 1
+
+    llm.cache.clear()
+    assert len(cache.index) == 0
@@ -1,4 +1,12 @@
-from agentkit.services.vector_store import InMemoryVectorStore
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from agentkit.services.semantic_cache import HashingEmbedder
+from agentkit.services.vector_store import ChromaVectorStore, InMemoryVectorStore
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
 
 
 def test_in_memory_vector_store() -> None:
@@ -19,3 +27,141 @@ def test_in_memory_vector_store_empty() -> None:
     store = InMemoryVectorStore()
     results = store.query("Anything", k=1)
     assert results == []
+
+
+def test_in_memory_vector_store_upserts_repeated_ids() -> None:
+    store = InMemoryVectorStore()
+    store.add_texts(["Toast churn is 5%"], metadatas=[{"v": 1}], ids=["toast"])
+    store.add_texts(["Toast churn is 3%"], metadatas=[{"v": 2}], ids=["toast"])
+
+    assert len(store) == 1
+    (result,) = store.query("toast churn", k=3)
+    assert result["content"] == "Toast churn is 3%"
+    assert result["metadata"] == {"v": 2}
+
+
+def test_in_memory_vector_store_scales_to_many_chunks() -> None:
+    store = InMemoryVectorStore()
+    store.add_texts([f"chunk {i} about topic{i % 100}" for i in range(20_000)])
+    store.add_texts(["the only chunk mentioning zymurgy"], ids=["needle"])
+
+    assert store.query("zymurgy", k=3)[0]["id"] == "needle"
+    assert len(store.query("topic7", k=5)) == 5
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_dense_vector_store_ranks_by_cosine(dtype: str) -> None:
+    store = InMemoryVectorStore(embedding_function=HashingEmbedder(dim=256), dtype=dtype)
+    store.add_texts(
+        ["Toast POS churn rate is 5%", "Square payments volume grew", "Restaurant software market size"],
+        ids=["toast", "square", "market"],
+    )
+
+    assert store.query("Toast churn rate", k=1)[0]["id"] == "toast"
+    assert [r["id"] for r in store.query("restaurant market size", k=3)][0] == "market"
+    assert store._matrix.dtype == np.dtype(dtype)
+
+
+def test_dense_vector_store_grows_and_upserts() -> None:
+    store = InMemoryVectorStore(embedding_function=HashingEmbedder(dim=64))
+    store.add_texts([f"document number {i}" for i in range(200)], ids=[str(i) for i in range(200)])
+    store.add_texts(["replacement text about zebras"], ids=["7"])
+
+    assert len(store) == 200
+    assert store._matrix.shape[0] >= 200
+    assert store.query("zebras", k=1)[0]["content"] == "replacement text about zebras"
+
+
+def test_dense_vector_store_batches_queries() -> None:
+    calls: list[list[str]] = []
+    embedder = HashingEmbedder(dim=128)
+
+    def embed(texts: list[str]) -> Any:
+        calls.append(texts)
+        return embedder(texts)
+
+    store = InMemoryVectorStore(embedding_function=embed)
+    store.add_texts(["alpha beta", "gamma delta", "epsilon zeta"], ids=["a", "g", "e"])
+    results = store.query_many(["gamma delta", "alpha beta"], k=2)
+
+    assert calls[-1] == ["gamma delta", "alpha beta"]
+    assert [r[0]["id"] for r in results] == ["g", "a"]
+    assert all(len(r) == 2 for r in results)
+    assert InMemoryVectorStore(embedding_function=embed).query_many(["anything"]) == [[]]
+
+
+class _HashingEmbeddingFunction(EmbeddingFunction[Documents]):  # type: ignore[misc]
+    def __init__(self) -> None:
+        self._embedder = HashingEmbedder(dim=64)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return list(self._embedder(list(input)))
+
+
+@pytest.fixture
+def chroma_store(tmp_path: Path) -> ChromaVectorStore:
+    return ChromaVectorStore(str(tmp_path / "chroma"), embedding_function=_HashingEmbeddingFunction())
+
+
+def test_chroma_upserts_are_split_at_max_batch_size(chroma_store: ChromaVectorStore) -> None:
+    collection = chroma_store._get_collection()
+    chroma_store._max_batch_size = 4
+    upserts: list[int] = []
+    original = collection.upsert
+
+    def counting_upsert(**kwargs: Any) -> None:
+        upserts.append(len(kwargs["ids"]))
+        original(**kwargs)
+
+    collection.upsert = counting_upsert
+    assert chroma_store.add_texts([f"doc {i}" for i in range(10)], metadatas=[{"i": i} for i in range(10)])
+
+    assert upserts == [4, 4, 2]
+    assert chroma_store.count() == 10
+
+
+def test_chroma_count_is_cached_until_the_next_write(chroma_store: ChromaVectorStore) -> None:
+    chroma_store.add_texts(["first"], ids=["1"])
+    collection = chroma_store._get_collection()
+    with patch.object(collection, "count", wraps=collection.count) as count:
+        assert chroma_store.count() == 1
+        assert chroma_store.count() == 1
+        chroma_store.add_texts(["second"], ids=["2"])
+        assert chroma_store.count() == 2
+    assert count.call_count == 2
+
+
+def test_chroma_count_sees_writes_from_other_stores(chroma_store: ChromaVectorStore) -> None:
+    other = ChromaVectorStore(chroma_store.persist_directory, embedding_function=_HashingEmbeddingFunction())
+    assert chroma_store.count() == 0
+
+    other.add_texts(["written elsewhere"], ids=["1"])
+
+    assert chroma_store.count() == 1
+    assert chroma_store.query("written elsewhere", k=1)[0]["id"] == "1"
+
+
+def test_chroma_query_many_with_where_filter(chroma_store: ChromaVectorStore) -> None:
+    chroma_store.add_texts(
+        ["Toast churn rate", "Toast revenue growth", "Square churn rate"],
+        metadatas=[{"company": "toast"}, {"company": "toast"}, {"company": "square"}],
+        ids=["t1", "t2", "s1"],
+    )
+    collection = chroma_store._get_collection()
+    with patch.object(collection, "query", wraps=collection.query) as query:
+        results = chroma_store.query_many(["churn rate", "revenue growth"], k=2, where={"company": "toast"})
+
+    assert query.call_count == 1
+    assert [hit["id"] for hit in results[0]] == ["t1", "t2"]
+    assert results[1][0]["id"] == "t2"
+    assert all(hit["metadata"]["company"] == "toast" for hits in results for hit in hits)
+    assert chroma_store.query("churn", k=1, where={"company": "square"})[0]["id"] == "s1"
+
+
+def test_chroma_iter_documents_pages_through_the_collection(chroma_store: ChromaVectorStore) -> None:
+    chroma_store.add_texts([f"doc {i}" for i in range(5)], metadatas=[{"i": i} for i in range(5)])
+
+    pages = list(chroma_store.iter_documents(batch_size=2))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(item["metadata"]["i"] for page in pages for item in page) == [0, 1, 2, 3, 4]
@@ -1,6 +1,9 @@
+import subprocess
 import sys
 from unittest.mock import patch
 
+import pytest
+
 
 def test_lazy_import_no_playwright() -> None:
     # Simulate playwright not being installed
@@ -20,3 +23,34 @@ def test_lazy_import_no_chromadb() -> None:
         store = ChromaVectorStore(persist_directory=".tmp")
         # Should not raise ImportError on instantiation
         assert store is not None
+
+
+# Third-party modules that only the services layer needs.
+HEAVY_MODULES = ("httpx", "langchain_core", "langchain_openai", "openai", "tavily", "chromadb", "bs4", "playwright")
+
+
+def test_importing_infra_skips_heavy_dependencies() -> None:
+    # A fresh interpreter, since this one has already imported everything.
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import agentkit.infra.cache, agentkit.infra.circuit_breaker, agentkit.infra.config\n"
+        "import agentkit.infra.decorators, agentkit.infra.logging, agentkit.infra.metrics\n"
+        "import agentkit.infra.rate_limit, agentkit.infra.tracing\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)\n"
+        "print(f'{elapsed:.3f}', *loaded)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    elapsed, *loaded = output.split()
+    assert loaded == [], f"importing agentkit.infra loaded {loaded} ({elapsed}s)"
+
+
+def test_top_level_exports_resolve_lazily() -> None:
+    import agentkit
+    from agentkit.services.search import TavilySearchService
+
+    assert agentkit.TavilySearchService is TavilySearchService
+    assert set(agentkit.__all__) <= set(dir(agentkit))
+    with pytest.raises(AttributeError):
+        _ = agentkit.not_exported  # type: ignore[attr-defined]
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: single-parse lxml extraction vs the Readability + BS4 cleaning path.
+
+The corpus is either a directory of saved pages (*.html) or a page cache database
+(PAGE_CACHE_PATH), whose stored HTML blobs are reused as is. Without one, the small sample in
+scripts/fixtures/pages is used; it is only a smoke test, so measure on a real page cache before
+drawing conclusions:
+
+    uv run python scripts/bench_extraction.py
+    uv run python scripts/bench_extraction.py .cache/pages.sqlite
+    uv run python scripts/bench_extraction.py path/to/saved/pages --repeat 5
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from agentkit.services.cleaning import clean_html
+from agentkit.services.extraction import extract_text
+
+FIXTURE_PAGES = Path(__file__).parent / "fixtures" / "pages"
+
+
+def load_corpus(source: Path) -> list[str]:
+    if source.is_dir():
+        return [path.read_text(encoding="utf-8", errors="replace") for path in sorted(source.glob("*.html"))]
+    with sqlite3.connect(f"file:{source}?mode=ro", uri=True) as conn:
+        return [row[0] for row in conn.execute("SELECT html FROM blobs")]
+
+
+def time_pages(extract: Callable[[str], str], pages: list[str], repeat: int) -> tuple[list[float], list[str]]:
+    """Best-of-`repeat` seconds per page, plus the extracted texts."""
+    timings: list[float] = []
+    texts: list[str] = []
+    for html in pages:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            text = extract(html)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best)
+        texts.append(text)
+    return timings, texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "corpus",
+        type=Path,
+        nargs="?",
+        default=FIXTURE_PAGES,
+        help="Directory of *.html files or a page cache .sqlite file (default: the sample pages)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per page; the fastest is kept")
+    args = parser.parse_args()
+
+    pages = [html for html in load_corpus(args.corpus) if html.strip()]
+    if not pages:
+        sys.exit(f"No pages found in {args.corpus}")
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1e6:.1f} MB of HTML, best of {args.repeat}\n")
+
+    results = {}
+    for name, extract in (("readability+bs4", clean_html), ("lxml single-parse", extract_text)):
+        timings, texts = time_pages(extract, pages, args.repeat)
+        results[name] = timings
+        print(
+            f"{name:<18} total {sum(timings):7.3f}s  "
+            f"median {statistics.median(timings) * 1e3:7.2f}ms  "
+            f"max {max(timings) * 1e3:8.2f}ms  "
+            f"avg text {statistics.mean(map(len, texts)):8.0f} chars"
+        )
+
+    baseline, candidate = results.values()
+    speedups = [old / new for old, new in zip(baseline, candidate, strict=True) if new > 0]
+    print(f"\nspeedup: total {sum(baseline) / sum(candidate):.1f}x, median per page {statistics.median(speedups):.1f}x")
+
+
+if __name__ == "__main__":
+    main()